@@ -0,0 +1,200 @@
+# Copyright (c) 2025, Red Hat
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""
+Scale benchmark for the migration and rollback playbooks.
+
+For every node count, starts the fake API server (server.py) seeded with that
+many nodes, runs playbooks/playbook-migration.yml and then
+playbooks/playbook-rollback.yml against it with the fake oc (bin/oc) first in
+PATH and the migration_timing callback enabled, and reports for each run:
+
+* the wall-clock time of the run and of each play;
+* the API requests the server answered, per method and resource, and the API
+  requests and oc commands the modules reported to the timing callback;
+* the peak resident memory of the controller process tree (ansible-playbook,
+  its workers and the modules they ran).
+
+Each node count gets its own temporary directory for the kubeconfig, the
+collection link, the module caches, the checkpoint journal and the logs, so
+runs never resume from each other.  The timings of the simulated operators
+are passed through to the server, for example:
+
+    python3 hack/fake_openshift/benchmark.py --nodes 10,100 --server-arg=--mco-node-seconds=1 --output results.json
+"""
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+REPO = os.path.dirname(os.path.dirname(HERE))
+COLLECTION = ("network", "offline_migration_sdn_to_ovnk")
+PLAYBOOKS = {"migration": "playbooks/playbook-migration.yml", "rollback": "playbooks/playbook-rollback.yml"}
+KUBECONFIG = """apiVersion: v1
+kind: Config
+clusters:
+- name: fake
+  cluster:
+    server: {url}
+users:
+- name: admin
+  user:
+    token: fake-token
+contexts:
+- name: admin
+  context:
+    cluster: fake
+    user: admin
+current-context: admin
+"""
+
+
+def start_server(nodes, server_args, log_path):
+    """Start the fake API server on a free port; return ``(process, url)``."""
+    log = open(log_path, "w", encoding="utf-8")  # pylint: disable=consider-using-with
+    process = subprocess.Popen(  # pylint: disable=consider-using-with
+        [sys.executable, "-u", os.path.join(HERE, "server.py"), "--port", "0", "--nodes", str(nodes)] + server_args,
+        stdout=subprocess.PIPE, stderr=log, text=True,
+    )
+    url = process.stdout.readline().strip()
+    if not url.startswith("http"):
+        process.kill()
+        raise RuntimeError(f"the fake API server did not start, see {log_path}")
+    return process, url
+
+
+def server_stats(url, reset=False):
+    request = urllib.request.Request(url + ("/fake/stats/reset" if reset else "/fake/stats"), data=b"{}" if reset else None)
+    with urllib.request.urlopen(request, timeout=30) as response:
+        return json.load(response)
+
+
+def prepare(workdir, url):
+    """Write the kubeconfig and the collection link; return the environment for ansible-playbook."""
+    with open(os.path.join(workdir, "kubeconfig"), "w", encoding="utf-8") as handle:
+        handle.write(KUBECONFIG.format(url=url))
+    namespace_dir = os.path.join(workdir, "collections", "ansible_collections", COLLECTION[0])
+    os.makedirs(namespace_dir)
+    os.symlink(REPO, os.path.join(namespace_dir, COLLECTION[1]))
+    os.makedirs(os.path.join(workdir, "tmp"))
+    env = dict(os.environ)
+    env.update(
+        PATH=os.path.join(HERE, "bin") + os.pathsep + env.get("PATH", ""),
+        KUBECONFIG=os.path.join(workdir, "kubeconfig"),
+        FAKE_OPENSHIFT_URL=url,
+        ANSIBLE_COLLECTIONS_PATH=os.path.join(workdir, "collections"),
+        ANSIBLE_CALLBACKS_ENABLED="network.offline_migration_sdn_to_ovnk.migration_timing",
+        ANSIBLE_LOCAL_TEMP=os.path.join(workdir, "tmp"),
+        TMPDIR=os.path.join(workdir, "tmp"),
+    )
+    return env
+
+
+def run_playbook(name, env, workdir, playbook_args):
+    """Run one playbook; return its rc, wall time and peak controller memory."""
+    report = os.path.join(workdir, f"{name}-timing.json")
+    env = dict(env, NETWORK_MIGRATION_TIMING_REPORT=report, NETWORK_MIGRATION_TIMING_PROMETHEUS=os.path.join(workdir, f"{name}.prom"))
+    log_path = os.path.join(workdir, f"{name}.log")
+    with open(log_path, "w", encoding="utf-8") as log:
+        start = time.monotonic()
+        # The journal lives in the home directory by default; keep it with the rest of this run.
+        journal = ["-e", f"checkpoint_journal_file={os.path.join(workdir, 'checkpoints.jsonl')}"]
+        process = subprocess.Popen(  # pylint: disable=consider-using-with
+            ["ansible-playbook", os.path.join(REPO, PLAYBOOKS[name])] + journal + playbook_args, stdout=log, stderr=subprocess.STDOUT, env=env, cwd=REPO,
+        )
+        # wait4 reports the peak RSS of the process and of every descendant it waited for (its workers and modules).
+        _pid, status, usage = os.wait4(process.pid, 0)
+        wall = time.monotonic() - start
+    process.returncode = os.waitstatus_to_exitcode(status)
+    result = {"rc": process.returncode, "wall_seconds": round(wall, 1), "peak_rss_mb": round(usage.ru_maxrss / 1024, 1), "log": log_path}
+    try:
+        with open(report, encoding="utf-8") as handle:
+            timing = json.load(handle)
+    except (OSError, ValueError):
+        return result
+    calls = {"api": 0, "oc": 0, "retries": 0}
+    for module in timing["modules"].values():
+        calls["api"] += module["calls"]["api"]["count"]
+        calls["oc"] += module["calls"]["oc"]["count"]
+        calls["retries"] += module["retries"]
+    result.update(client_calls=calls, plays={play["name"]: play["duration"] for play in timing["plays"]}, timing_report=report)
+    return result
+
+
+def benchmark(nodes, args):
+    workdir = tempfile.mkdtemp(prefix=f"fake-openshift-{nodes}-")
+    process, url = start_server(nodes, args.server_arg, os.path.join(workdir, "server.log"))
+    results = []
+    try:
+        env = prepare(workdir, url)
+        for name in args.playbooks:
+            server_stats(url, reset=True)
+            result = run_playbook(name, env, workdir, args.playbook_arg)
+            stats = server_stats(url)
+            result.update(nodes=nodes, playbook=name, api_requests=stats["total"], api_requests_by_resource=stats["requests"])
+            results.append(result)
+            print(f"{nodes:>6} nodes  {name:<9}  rc={result['rc']}  {result['wall_seconds']:>8.1f}s  "
+                  f"{result['api_requests']:>7} API requests  {result['peak_rss_mb']:>7.1f} MB  ({result['log']})", flush=True)
+            if result["rc"] != 0 and not args.keep_going:
+                break
+    finally:
+        process.terminate()
+        process.wait()
+    if args.cleanup and all(result["rc"] == 0 for result in results):
+        shutil.rmtree(workdir, ignore_errors=True)
+    return results
+
+
+def print_table(results):
+    header = ("nodes", "playbook", "rc", "wall s", "API requests", "client API calls", "oc commands", "peak RSS MB")
+    rows = [header] + [
+        (str(result["nodes"]), result["playbook"], str(result["rc"]), f"{result['wall_seconds']:.1f}", str(result["api_requests"]),
+         str(result.get("client_calls", {}).get("api", "-")), str(result.get("client_calls", {}).get("oc", "-")), f"{result['peak_rss_mb']:.1f}")
+        for result in results
+    ]
+    widths = [max(len(row[column]) for row in rows) for column in range(len(header))]
+    for row in rows:
+        print("  ".join(value.rjust(width) for value, width in zip(row, widths)))
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n", 1)[0])
+    parser.add_argument("--nodes", default="10,100,1000,5000", help="comma-separated node counts (default: %(default)s)")
+    parser.add_argument("--playbooks", default="migration,rollback", help="comma-separated playbooks to run in order (default: %(default)s)")
+    parser.add_argument("--server-arg", action="append", default=[], help="extra argument for server.py, e.g. --server-arg=--reboot-seconds=5")
+    parser.add_argument("--playbook-arg", action="append", default=[], help="extra argument for ansible-playbook, e.g. --playbook-arg=-v")
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    parser.add_argument("--keep-going", action="store_true", help="run the next playbook even if one fails")
+    parser.add_argument("--cleanup", action="store_true", help="remove the working directory of node counts whose runs all succeeded")
+    args = parser.parse_args(argv)
+    args.nodes = [int(count) for count in args.nodes.split(",")]
+    args.playbooks = args.playbooks.split(",")
+    unknown = set(args.playbooks) - set(PLAYBOOKS)
+    if unknown:
+        parser.error(f"unknown playbooks: {', '.join(sorted(unknown))}; choose from {', '.join(PLAYBOOKS)}")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    results = []
+    for nodes in args.nodes:
+        results.extend(benchmark(nodes, args))
+    print()
+    print_table(results)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            json.dump(results, handle, indent=2, sort_keys=True)
+            handle.write("\n")
+    return 0 if all(result["rc"] == 0 for result in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
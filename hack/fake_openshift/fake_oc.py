@@ -0,0 +1,143 @@
+# Copyright (c) 2025, Red Hat
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""
+Stand-in for the oc commands the collection runs, backed by the fake API server.
+
+Run through bin/oc: put that directory first in PATH and point FAKE_OPENSHIFT_URL at the server.
+Supported: ``oc version --client``, ``oc whoami``, ``oc get co``, ``oc get nodes -o json``,
+``oc get pods --all-namespaces [-o wide]``, ``oc rollout status ds/<name> -n <ns>``
+and ``oc rsh -n <ns> <pod> chroot /rootfs shutdown -r <+minutes|now>``.
+"""
+
+import json
+import os
+import sys
+import time
+import urllib.error
+import urllib.request
+
+URL = os.environ.get("FAKE_OPENSHIFT_URL", "http://127.0.0.1:18443").rstrip("/")
+
+
+def request(path, body=None):
+    data = json.dumps(body).encode() if body is not None else None
+    req = urllib.request.Request(URL + path, data=data, method="POST" if data else "GET", headers={"Content-Type": "application/json"})
+    with urllib.request.urlopen(req, timeout=30) as response:
+        return json.load(response)
+
+
+def option(args, *names):
+    for index, arg in enumerate(args):
+        if arg in names and index + 1 < len(args):
+            return args[index + 1]
+        for name in names:
+            if name.startswith("--") and arg.startswith(name + "="):
+                return arg.split("=", 1)[1]
+    return None
+
+
+def table(rows):
+    widths = [max(len(str(row[column])) for row in rows) for column in range(len(rows[0]))]
+    return "\n".join("   ".join(str(value).ljust(width) for value, width in zip(row, widths)).rstrip() for row in rows)
+
+
+def condition(obj, kind):
+    for item in obj.get("status", {}).get("conditions", []):
+        if item.get("type") == kind:
+            return item.get("status", "")
+    return ""
+
+
+def get(args):
+    if args[0] in ("co", "clusteroperator", "clusteroperators"):
+        items = request("/apis/config.openshift.io/v1/clusteroperators")["items"]
+        rows = [("NAME", "VERSION", "AVAILABLE", "PROGRESSING", "DEGRADED")]
+        rows += [(co["metadata"]["name"], "", condition(co, "Available"), condition(co, "Progressing"), condition(co, "Degraded")) for co in items]
+        print(table(rows))
+        return 0
+    if args[0] in ("node", "nodes") and option(args, "-o", "--output") == "json":
+        print(json.dumps(request("/api/v1/nodes"), indent=4))
+        return 0
+    if args[0] in ("pod", "pods"):
+        namespace = option(args, "-n", "--namespace")
+        path = "/api/v1/pods" if "-A" in args or "--all-namespaces" in args or not namespace else f"/api/v1/namespaces/{namespace}/pods"
+        wide = "wide" in (option(args, "-o", "--output") or "")
+        rows = [("NAMESPACE", "NAME", "READY", "STATUS", "RESTARTS") + (("IP", "NODE") if wide else ())]
+        for pod in request(path)["items"]:
+            statuses = pod["status"].get("containerStatuses", [])
+            ready = f"{sum(1 for status in statuses if status.get('ready'))}/{len(statuses)}"
+            restarts = sum(status.get("restartCount", 0) for status in statuses)
+            row = (pod["metadata"]["namespace"], pod["metadata"]["name"], ready, pod["status"].get("phase", ""), restarts)
+            rows.append(row + ((pod["status"].get("podIP", ""), pod["spec"].get("nodeName", "")) if wide else ()))
+        print(table(rows))
+        return 0
+    print(f"error: the fake oc does not support 'oc get {' '.join(args)}'", file=sys.stderr)
+    return 1
+
+
+def rollout_status(args):
+    kind, _sep, name = args[1].partition("/")
+    namespace = option(args, "-n", "--namespace") or "default"
+    if kind not in ("ds", "daemonset", "daemonsets"):
+        print(f"error: the fake oc only supports daemon sets, not {kind}", file=sys.stderr)
+        return 1
+    deadline = time.monotonic() + 600
+    while time.monotonic() < deadline:
+        try:
+            daemonset = request(f"/apis/apps/v1/namespaces/{namespace}/daemonsets/{name}")
+        except urllib.error.HTTPError as exc:
+            print(f'Error from server ({exc.reason}): daemonsets.apps "{name}" not found', file=sys.stderr)
+            return 1
+        status = daemonset["status"]
+        desired = status.get("desiredNumberScheduled", 0)
+        if status.get("observedGeneration", 0) >= daemonset["metadata"].get("generation", 1) \
+                and status.get("updatedNumberScheduled") == desired and status.get("numberAvailable") == desired:
+            print(f'daemon set "{name}" successfully rolled out')
+            return 0
+        print(f'Waiting for daemon set "{name}" rollout to finish: {status.get("updatedNumberScheduled", 0)} out of {desired} new pods have been updated...')
+        time.sleep(1)
+    print("error: timed out waiting for the condition", file=sys.stderr)
+    return 1
+
+
+def rsh(args):
+    namespace = option(args, "-n", "--namespace")
+    rest = [arg for index, arg in enumerate(args) if arg not in ("-n", "--namespace") and (index == 0 or args[index - 1] not in ("-n", "--namespace"))]
+    pod, command = rest[0], rest[1:]
+    if "shutdown" not in command:
+        print(f"error: the fake oc only supports 'shutdown' through rsh, not {' '.join(command)}", file=sys.stderr)
+        return 1
+    when = command[-1]
+    delay = 0 if when == "now" else int(when.lstrip("+"))
+    try:
+        request("/fake/reboot", {"namespace": namespace, "pod": pod, "delay_minutes": delay})
+    except urllib.error.HTTPError as exc:
+        print(f'Error from server (NotFound): pods "{pod}" not found ({exc.code})', file=sys.stderr)
+        return 1
+    print(f"Shutdown scheduled for {when}, use 'shutdown -c' to cancel.")
+    return 0
+
+
+def main(args):
+    if not args:
+        print("usage: oc <command>", file=sys.stderr)
+        return 1
+    if args[0] == "version":
+        print("Client Version: 4.16.0-fake\nKustomize Version: v5.0.4-0.20230601165947-6ce0bf390ce3")
+        return 0
+    if args[0] == "whoami":
+        print(request("/apis/user.openshift.io/v1/users/~")["metadata"]["name"])
+        return 0
+    if args[0] == "get" and len(args) > 1:
+        return get(args[1:])
+    if args[0] == "rollout" and len(args) > 2 and args[1] == "status":
+        return rollout_status(args[1:])
+    if args[0] == "rsh" and len(args) > 1:
+        return rsh(args[1:])
+    print(f"error: the fake oc does not support 'oc {' '.join(args)}'", file=sys.stderr)
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,861 @@
+# Copyright (c) 2025, Red Hat
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""
+Fake OpenShift API server for running the playbooks without a cluster.
+
+Serves the objects the collection reads and writes (the cluster network
+config and operator, ClusterVersion, ClusterOperators, MachineConfigPools,
+MachineConfigs, Nodes, the machine config daemon and Multus pods, the CNI
+DaemonSets and Deployments, namespaces and NodeNetworkConfigurationPolicies)
+over plain HTTP, with list/watch semantics close enough to the real API server for the
+collection's client: resourceVersions, label and field selectors, paginated
+lists and chunked watch streams that end with a 410 ERROR event once the
+requested resourceVersion has been compacted.
+
+A controller thread stands in for the operators the playbooks wait on:
+
+* the cluster network operator copies ``spec.migration`` of the network
+  operator into ``status.migration`` of the cluster network config and, when
+  ``spec.networkType`` changes, reports Progressing, rolls out Multus and the
+  CNI DaemonSets and Deployments and then switches ``status.networkType``;
+* the machine config operator renders a new MachineConfig for every pool
+  whose rendered config runs ``configure-ovs.sh`` with another network type
+  and rolls it out to the unpaused pools, ``maxUnavailable`` nodes at a time,
+  each node taking ``--mco-node-seconds`` and coming back with a new boot ID;
+* ``oc rsh <mcd pod> chroot /rootfs shutdown -r`` (see ``bin/oc``) posts to
+  ``/fake/reboot``; the node goes NotReady after the requested delay (one
+  minute lasts ``--minute-seconds``) and is Ready again with a new boot ID
+  ``--reboot-seconds`` later;
+* with ``--app-pods-per-node``, every worker runs that many pods of a sample
+  application covered by a PodDisruptionBudget; the eviction API refuses
+  (429) to evict one while the budget allows no disruption, and an evicted
+  pod comes back on another schedulable worker ``--pod-start-seconds`` later.
+
+``GET /fake/stats`` returns the number of requests served per method and
+resource, ``POST /fake/stats/reset`` clears them.
+
+    python3 hack/fake_openshift/server.py --nodes 100 --port 18443
+"""
+
+import argparse
+import bisect
+import copy
+import json
+import math
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+CONFIG = "apis/config.openshift.io/v1/"
+OPERATOR = "apis/operator.openshift.io/v1/"
+MCO = "apis/machineconfiguration.openshift.io/v1/"
+NETWORK_CONFIG = CONFIG + "networks"
+NETWORK_OPERATOR = OPERATOR + "networks"
+CLUSTER_OPERATORS = CONFIG + "clusteroperators"
+POOLS = MCO + "machineconfigpools"
+MACHINE_CONFIGS = MCO + "machineconfigs"
+NODES = "api/v1/nodes"
+PODS = "api/v1/pods"
+NAMESPACES = "api/v1/namespaces"
+PDBS = "apis/policy/v1/poddisruptionbudgets"
+APP_LABELS = {"app": "sample"}
+DAEMONSETS = "apis/apps/v1/daemonsets"
+DEPLOYMENTS = "apis/apps/v1/deployments"
+MCO_ANNOTATION = "machineconfiguration.openshift.io/"
+NETWORK_TYPE_ANNOTATION = "fake.openshift.io/network-type"
+MULTUS = (DAEMONSETS, "openshift-multus", "multus")
+# Collection, namespace and name of the workloads that run the pod network of each network type.
+CNI_WORKLOADS = {
+    "OpenShiftSDN": ((DAEMONSETS, "openshift-sdn", "sdn"), (DAEMONSETS, "openshift-sdn", "sdn-controller")),
+    "OVNKubernetes": ((DAEMONSETS, "openshift-ovn-kubernetes", "ovnkube-node"), (DEPLOYMENTS, "openshift-ovn-kubernetes", "ovnkube-control-plane")),
+}
+# Workloads that only run on the control plane nodes.
+CONTROL_PLANE_WORKLOADS = ("sdn-controller", "ovnkube-control-plane")
+CLUSTER_OPERATOR_NAMES = ("network", "dns", "machine-config", "kube-apiserver", "ingress", "authentication")
+# Watch events kept per collection before the oldest are compacted.
+MAX_EVENTS = 20000
+TICK = 0.2
+
+
+def now_iso():
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+
+
+def condition(kind, status, reason="AsExpected", when="2025-01-01T00:00:00Z"):
+    return {"type": kind, "status": status, "reason": reason, "lastTransitionTime": when}
+
+
+def set_condition(obj, kind, status, reason="AsExpected"):
+    """Set a status condition; return True when its status changed."""
+    conditions = obj.setdefault("status", {}).setdefault("conditions", [])
+    for item in conditions:
+        if item.get("type") == kind:
+            if item.get("status") == status:
+                return False
+            item.update(status=status, reason=reason, lastTransitionTime=now_iso())
+            return True
+    conditions.append(condition(kind, status, reason, now_iso()))
+    return True
+
+
+def merge_patch(target, patch):
+    """Apply a JSON merge patch (RFC 7386) to ``target`` in place."""
+    for key, value in patch.items():
+        if value is None:
+            target.pop(key, None)
+        elif isinstance(value, dict) and isinstance(target.get(key), dict):
+            merge_patch(target[key], value)
+        else:
+            target[key] = copy.deepcopy(value)
+    return target
+
+
+def json_patch(target, operations):
+    """Apply the add, replace and remove operations of a JSON patch (RFC 6902) to ``target`` in place."""
+    for operation in operations:
+        keys = [key.replace("~1", "/").replace("~0", "~") for key in operation["path"].lstrip("/").split("/")]
+        parent = target
+        for key in keys[:-1]:
+            parent = parent[int(key)] if isinstance(parent, list) else parent.setdefault(key, {})
+        last = keys[-1]
+        if operation["op"] == "remove":
+            if isinstance(parent, list):
+                del parent[int(last)]
+            else:
+                parent.pop(last, None)
+        elif isinstance(parent, list):
+            if last == "-":
+                parent.append(operation["value"])
+            elif operation["op"] == "add":
+                parent.insert(int(last), operation["value"])
+            else:
+                parent[int(last)] = operation["value"]
+        else:
+            parent[last] = operation["value"]
+    return target
+
+
+def parse_path(path):
+    """Split an API path into ``(collection, namespace, name, subresource)``."""
+    parts = path.strip("/").split("/")
+    if parts[0] == "api":
+        prefix, rest = "/".join(parts[:2]), parts[2:]
+    else:
+        prefix, rest = "/".join(parts[:3]), parts[3:]
+    namespace = None
+    if rest and rest[0] == "namespaces" and len(rest) > 2:
+        namespace, rest = rest[1], rest[2:]
+    if not rest:
+        return None, None, None, None
+    return prefix + "/" + rest[0], namespace, rest[1] if len(rest) > 1 else None, rest[2] if len(rest) > 2 else None
+
+
+def match_labels(obj, selector):
+    if not selector:
+        return True
+    labels = obj.get("metadata", {}).get("labels") or {}
+    for term in selector.split(","):
+        if "!=" in term:
+            key, value = term.split("!=", 1)
+            if labels.get(key) == value:
+                return False
+        elif "=" in term:
+            key, value = term.split("=", 1)
+            if labels.get(key.rstrip("=")) != value:
+                return False
+        elif term.startswith("!"):
+            if term[1:] in labels:
+                return False
+        elif term not in labels:
+            return False
+    return True
+
+
+def match_fields(obj, selector):
+    if not selector:
+        return True
+    for term in selector.split(","):
+        key, value = term.split("=", 1)
+        field = obj
+        for part in key.split("."):
+            field = field.get(part) if isinstance(field, dict) else None
+        if str(field) != value:
+            return False
+    return True
+
+
+def status_body(code, reason, message):
+    return {"kind": "Status", "apiVersion": "v1", "status": "Failure", "reason": reason, "message": message, "code": code}
+
+
+class Store:
+    """Objects by collection plus the recent watch events of each collection."""
+
+    def __init__(self):
+        self.lock = threading.Condition()
+        self.objects = {}
+        self.events = {}
+        # Oldest resourceVersion a watch on each collection can still resume from.
+        self.compacted = {}
+        self.revision = 1000
+        self.requests = {}
+
+    def count(self, method, collection, watch=False):
+        key = f"{method} {collection}{' watch' if watch else ''}"
+        with self.lock:
+            self.requests[key] = self.requests.get(key, 0) + 1
+
+    def get(self, collection, name, namespace=None):
+        with self.lock:
+            obj = self.objects.get(collection, {}).get((namespace, name))
+            return copy.deepcopy(obj) if obj else None
+
+    def items(self, collection, namespace=None):
+        """Return the objects of ``collection``, which must not be modified, and the current revision."""
+        with self.lock:
+            objects = self.objects.get(collection, {})
+            items = [obj for (ns, _name), obj in sorted(objects.items(), key=lambda item: (item[0][0] or "", item[0][1]))
+                     if namespace is None or ns == namespace]
+            return items, self.revision
+
+    def put(self, collection, obj, event="MODIFIED", spec_changed=False):
+        with self.lock:
+            self.revision += 1
+            metadata = obj.setdefault("metadata", {})
+            metadata["resourceVersion"] = str(self.revision)
+            metadata.setdefault("uid", str(uuid.uuid4()))
+            metadata.setdefault("creationTimestamp", now_iso())
+            if event == "ADDED":
+                metadata.setdefault("generation", 1)
+            elif spec_changed:
+                metadata["generation"] = metadata.get("generation", 1) + 1
+            key = (metadata.get("namespace"), metadata["name"])
+            # Stored objects are never modified in place, so lists and watches can serve them without copying.
+            stored = copy.deepcopy(obj)
+            if event == "DELETED":
+                self.objects.get(collection, {}).pop(key, None)
+            else:
+                self.objects.setdefault(collection, {})[key] = stored
+            events = self.events.setdefault(collection, [])
+            events.append((self.revision, event, stored))
+            if len(events) > MAX_EVENTS:
+                dropped = events[:MAX_EVENTS // 2]
+                del events[:MAX_EVENTS // 2]
+                self.compacted[collection] = dropped[-1][0]
+            self.lock.notify_all()
+            return obj
+
+    def update(self, collection, name, mutate, namespace=None, spec_changed=False):
+        """Apply ``mutate(obj)`` to a copy of an object and store it if ``mutate`` returns True."""
+        obj = self.get(collection, name, namespace)
+        if obj is not None and mutate(obj):
+            self.put(collection, obj, spec_changed=spec_changed)
+        return obj
+
+    def events_after(self, collection, revision, timeout):
+        """Return ``(events, expired)`` newer than ``revision``, waiting up to ``timeout`` seconds for some."""
+        with self.lock:
+            if revision < self.compacted.get(collection, 0):
+                return [], True
+            deadline = time.monotonic() + timeout
+            while True:
+                events = self.events.get(collection, [])
+                events = events[bisect.bisect_right(events, revision, key=lambda event: event[0]):]
+                remaining = deadline - time.monotonic()
+                if events or remaining <= 0:
+                    return events, False
+                self.lock.wait(remaining)
+
+
+class Simulator:
+    """Stand-in for the network and machine config operators and for node reboots."""
+
+    def __init__(self, store, args):
+        self.store = store
+        self.args = args
+        self.network_rollout = None
+        self.node_updates = {}
+        self.workload_rollouts = {}
+        self.reboots = []
+        self.replacements = []
+        self.next_node = 0
+        self.lock = threading.Lock()
+
+    # ----------------------------------------------------------------- seeding
+    def seed(self):
+        args = self.args
+        put = self.store.put
+        network = {"clusterNetwork": [{"cidr": args.cluster_network, "hostPrefix": args.host_prefix}], "serviceNetwork": ["172.30.0.0/16"]}
+        for name in ("default", "openshift-multus", "openshift-machine-config-operator", "openshift-sdn", "openshift-ovn-kubernetes", "openshift-nmstate"):
+            put(NAMESPACES, {"kind": "Namespace", "metadata": {"name": name}, "status": {"phase": "Active"}}, "ADDED")
+        put(CONFIG + "clusterversions", {
+            "kind": "ClusterVersion", "metadata": {"name": "version"}, "spec": {"clusterID": str(uuid.uuid4())},
+            "status": {"desired": {"version": args.version}, "history": [{"version": args.version, "state": "Completed"}]},
+        }, "ADDED")
+        put(NETWORK_CONFIG, {
+            "kind": "Network", "metadata": {"name": "cluster"}, "spec": dict(copy.deepcopy(network), networkType="OpenShiftSDN"),
+            "status": dict(copy.deepcopy(network), networkType="OpenShiftSDN", clusterNetworkMTU=1450),
+        }, "ADDED")
+        put(NETWORK_OPERATOR, {
+            "kind": "Network", "metadata": {"name": "cluster"},
+            "spec": {"defaultNetwork": {"type": "OpenShiftSDN", "openshiftSDNConfig": {"mode": "NetworkPolicy"}}},
+        }, "ADDED")
+        for name in CLUSTER_OPERATOR_NAMES:
+            put(CLUSTER_OPERATORS, {
+                "kind": "ClusterOperator", "metadata": {"name": name},
+                "status": {"conditions": [condition("Available", "True"), condition("Progressing", "False"), condition("Degraded", "False")]},
+            }, "ADDED")
+
+        masters = min(args.masters, args.nodes)
+        infra = min(args.infra_nodes, args.nodes - masters)
+        workers = args.nodes - masters - infra
+        for index in range(args.nodes):
+            if index < masters:
+                pool, name = "master", f"master-{index}"
+            elif index < masters + workers:
+                pool, name = "worker", f"worker-{index - masters}"
+            else:
+                pool, name = "infra", f"infra-{index - masters - workers}"
+            rendered = f"rendered-{pool}-0"
+            labels = {f"node-role.kubernetes.io/{pool}": "", "kubernetes.io/hostname": name}
+            if pool == "infra":
+                labels["node-role.kubernetes.io/worker"] = ""
+            put(NODES, {
+                "kind": "Node",
+                "metadata": {
+                    "name": name,
+                    "labels": labels,
+                    "annotations": {MCO_ANNOTATION + "currentConfig": rendered, MCO_ANNOTATION + "desiredConfig": rendered, MCO_ANNOTATION + "state": "Done"},
+                },
+                "status": {"nodeInfo": {"bootID": str(uuid.uuid4())}, "conditions": [condition("Ready", "True", "KubeletReady")]},
+            }, "ADDED")
+            for namespace, prefix, labels in (
+                ("openshift-machine-config-operator", "machine-config-daemon", {"k8s-app": "machine-config-daemon"}),
+                ("openshift-multus", "multus", {"app": "multus"}),
+            ):
+                put(PODS, {
+                    "kind": "Pod",
+                    "metadata": {"name": f"{prefix}-{index:05d}", "namespace": namespace, "labels": labels,
+                                 "ownerReferences": [{"apiVersion": "apps/v1", "kind": "DaemonSet", "name": prefix, "controller": True}]},
+                    "spec": {"nodeName": name},
+                    "status": {"phase": "Running", "podIP": f"10.0.{index // 250}.{index % 250 + 1}", "startTime": now_iso(),
+                               "conditions": [condition("Ready", "True")], "containerStatuses": [{"name": prefix, "ready": True, "restartCount": 0}]},
+                }, "ADDED")
+            if pool != "master":
+                for replica in range(args.app_pods_per_node):
+                    self.put_app_pod(f"app-{index:05d}-{replica}", name)
+
+        if args.app_pods_per_node:
+            put(PDBS, {
+                "kind": "PodDisruptionBudget", "metadata": {"name": "sample", "namespace": "default"},
+                "spec": {"maxUnavailable": args.pdb_max_unavailable, "selector": {"matchLabels": APP_LABELS}},
+                "status": {"disruptionsAllowed": args.pdb_max_unavailable, "expectedPods": (args.nodes - masters) * args.app_pods_per_node},
+            }, "ADDED")
+
+        for pool, count in (("master", masters), ("worker", workers), ("infra", infra)):
+            if pool == "infra" and not count:
+                continue
+            self.render(pool, 0, "OpenShiftSDN")
+            put(POOLS, {
+                "kind": "MachineConfigPool",
+                "metadata": {"name": pool},
+                "spec": {
+                    "nodeSelector": {"matchLabels": {f"node-role.kubernetes.io/{pool}": ""}},
+                    "configuration": {"name": f"rendered-{pool}-0"},
+                    "paused": False,
+                    "maxUnavailable": args.max_unavailable if pool == "worker" else 1,
+                },
+                "status": {
+                    "configuration": {"name": f"rendered-{pool}-0"}, "machineCount": count, "updatedMachineCount": count,
+                    "readyMachineCount": count, "unavailableMachineCount": 0, "degradedMachineCount": 0,
+                    "conditions": [condition("Updated", "True"), condition("Updating", "False"), condition("Degraded", "False")],
+                },
+            }, "ADDED")
+
+        for workload in (MULTUS,) + CNI_WORKLOADS["OpenShiftSDN"]:
+            self.put_workload(*workload)
+
+        put("apis/apiextensions.k8s.io/v1/customresourcedefinitions", {
+            "kind": "CustomResourceDefinition", "metadata": {"name": "nodenetworkconfigurationpolicies.nmstate.io"},
+            "spec": {"group": "nmstate.io", "names": {"plural": "nodenetworkconfigurationpolicies"}},
+        }, "ADDED")
+        put("apis/nmstate.io/v1/nodenetworkconfigurationpolicies", {
+            "kind": "NodeNetworkConfigurationPolicy", "metadata": {"name": "br-ex-policy"},
+            "spec": {"desiredState": {"interfaces": [{"name": args.nncp_interface, "type": "ovs-bridge", "state": "up"}]}},
+        }, "ADDED")
+
+    def put_app_pod(self, name, node):
+        self.store.put(PODS, {
+            "kind": "Pod",
+            "metadata": {"name": name, "namespace": "default", "labels": dict(APP_LABELS),
+                         "ownerReferences": [{"apiVersion": "apps/v1", "kind": "ReplicaSet", "name": "sample-5d8f7", "controller": True}]},
+            "spec": {"nodeName": node},
+            "status": {"phase": "Running", "startTime": now_iso(), "conditions": [condition("Ready", "True")],
+                       "containerStatuses": [{"name": "sample", "ready": True, "restartCount": 0}]},
+        }, "ADDED")
+
+    def render(self, pool, serial, network_type):
+        """Create the rendered MachineConfig ``rendered-<pool>-<serial>`` for ``network_type``."""
+        name = f"rendered-{pool}-{serial}"
+        self.store.put(MACHINE_CONFIGS, {
+            "kind": "MachineConfig",
+            "metadata": {"name": name, "annotations": {NETWORK_TYPE_ANNOTATION: network_type}},
+            "spec": {"config": {"systemd": {"units": [{
+                "name": "ovs-configuration.service", "enabled": True,
+                "contents": f"[Service]\nType=oneshot\nExecStart=/usr/local/bin/configure-ovs.sh {network_type}\n",
+            }]}}},
+        }, "ADDED")
+        return name
+
+    def put_workload(self, collection, namespace, name):
+        """Create a DaemonSet or Deployment that has rolled out."""
+        replicas = min(self.args.masters, self.args.nodes) if name in CONTROL_PLANE_WORKLOADS else self.args.nodes
+        labels = {"app": name}
+        workload = {"metadata": {"name": name, "namespace": namespace, "labels": labels}, "spec": {"selector": {"matchLabels": labels}}}
+        if collection == DAEMONSETS:
+            workload.update(kind="DaemonSet")
+            workload["spec"]["updateStrategy"] = {"type": "RollingUpdate", "rollingUpdate": {"maxUnavailable": "10%"}}
+            workload["status"] = {"desiredNumberScheduled": replicas, "currentNumberScheduled": replicas}
+        else:
+            workload.update(kind="Deployment")
+            workload["spec"]["replicas"] = replicas
+            workload["status"] = {}
+        workload["status"].update(observedGeneration=1, **self.rollout_fields(collection, replicas, replicas))
+        self.store.put(collection, workload, "ADDED")
+
+    @staticmethod
+    def rollout_fields(collection, desired, updated):
+        """Status counts of a rollout that updated ``updated`` of ``desired`` pods, one tenth of them at a time."""
+        unavailable = 0 if updated == desired else max(1, math.ceil(desired / 10))
+        if collection == DAEMONSETS:
+            return dict(updatedNumberScheduled=updated, numberAvailable=desired - unavailable, numberReady=desired - unavailable, numberUnavailable=unavailable)
+        return dict(replicas=desired + (1 if unavailable else 0), updatedReplicas=updated, readyReplicas=desired - unavailable,
+                    availableReplicas=desired - unavailable)
+
+    # ------------------------------------------------------------------ reboots
+    def schedule_reboot(self, namespace, pod, delay_minutes):
+        pod_obj = self.store.get(PODS, pod, namespace)
+        if pod_obj is None:
+            return None
+        node = pod_obj["spec"]["nodeName"]
+        down_at = time.monotonic() + delay_minutes * self.args.minute_seconds
+        with self.lock:
+            self.reboots.append((down_at, node, "down"))
+            self.reboots.append((down_at + self.args.reboot_seconds, node, "up"))
+        return node
+
+    def set_node_ready(self, name, ready, new_boot=False):
+        def mutate(node):
+            changed = set_condition(node, "Ready", "True" if ready else "Unknown", "KubeletReady" if ready else "NodeStatusUnknown")
+            if new_boot:
+                node["status"].setdefault("nodeInfo", {})["bootID"] = str(uuid.uuid4())
+                changed = True
+            return changed
+        self.store.update(NODES, name, mutate)
+
+    def step_reboots(self, now):
+        with self.lock:
+            due = [reboot for reboot in self.reboots if reboot[0] <= now]
+            self.reboots = [reboot for reboot in self.reboots if reboot[0] > now]
+        for _at, node, action in sorted(due):
+            self.set_node_ready(node, action == "up", new_boot=action == "up")
+
+    # ---------------------------------------------------------------- evictions
+    def budgets(self, pod):
+        """Return the PodDisruptionBudgets whose selector matches ``pod``."""
+        labels = pod["metadata"].get("labels") or {}
+        budgets, _revision = self.store.items(PDBS, pod["metadata"].get("namespace"))
+        return [budget for budget in budgets
+                if all(labels.get(key) == value for key, value in budget["spec"]["selector"].get("matchLabels", {}).items())]
+
+    def adjust_budgets(self, pod, delta):
+        for budget in self.budgets(pod):
+            def mutate(obj):
+                obj["status"]["disruptionsAllowed"] = min(obj["spec"]["maxUnavailable"], obj["status"]["disruptionsAllowed"] + delta)
+                return True
+            self.store.update(PDBS, budget["metadata"]["name"], mutate, budget["metadata"]["namespace"])
+
+    def evict(self, namespace, name):
+        """Evict a pod unless a PodDisruptionBudget forbids it; return ``(code, body)``."""
+        with self.lock:
+            pod = self.store.get(PODS, name, namespace)
+            if pod is None:
+                return 404, status_body(404, "NotFound", f"pods \"{name}\" not found")
+            if any(budget["status"]["disruptionsAllowed"] < 1 for budget in self.budgets(pod)):
+                return 429, status_body(429, "TooManyRequests", "Cannot evict pod as it would violate the pod's disruption budget.")
+            self.adjust_budgets(pod, -1)
+            self.store.put(PODS, pod, "DELETED")
+            if any(owner.get("controller") for owner in pod["metadata"].get("ownerReferences") or []):
+                self.replacements.append((time.monotonic() + self.args.pod_start_seconds, pod))
+        return 201, {"kind": "Status", "apiVersion": "v1", "status": "Success"}
+
+    def schedulable_node(self):
+        """Return the next Ready, schedulable worker in round-robin order, or None."""
+        nodes, _revision = self.store.items(NODES)
+        candidates = [node["metadata"]["name"] for node in nodes
+                      if "node-role.kubernetes.io/master" not in node["metadata"].get("labels", {})
+                      and not node.get("spec", {}).get("unschedulable")
+                      and any(item["type"] == "Ready" and item["status"] == "True" for item in node["status"].get("conditions", []))]
+        if not candidates:
+            return None
+        self.next_node += 1
+        return candidates[self.next_node % len(candidates)]
+
+    def step_replacements(self, now):
+        with self.lock:
+            due = [item for item in self.replacements if item[0] <= now]
+            self.replacements = [item for item in self.replacements if item[0] > now]
+            for _at, pod in due:
+                node = self.schedulable_node()
+                if node is None:
+                    self.replacements.append((now + 1, pod))
+                    continue
+                self.put_app_pod(f"{pod['metadata']['name'].rsplit('-', 1)[0]}-{uuid.uuid4().hex[:5]}", node)
+                self.adjust_budgets(pod, 1)
+
+    # ---------------------------------------------------------- network operator
+    def wanted_network_type(self):
+        """Network type the MachineConfigs must configure: the migration target, else the running network type."""
+        operator = self.store.get(NETWORK_OPERATOR, "cluster")
+        migration = (operator or {}).get("spec", {}).get("migration") or {}
+        if migration.get("networkType"):
+            return migration["networkType"]
+        return self.store.get(NETWORK_CONFIG, "cluster")["status"]["networkType"]
+
+    def step_network(self, now):
+        operator = self.store.get(NETWORK_OPERATOR, "cluster")
+        migration = operator.get("spec", {}).get("migration")
+        wanted_migration = {"networkType": migration["networkType"]} if migration and migration.get("networkType") else None
+
+        def sync_migration(config):
+            if config["status"].get("migration") == wanted_migration:
+                return False
+            if wanted_migration:
+                config["status"]["migration"] = wanted_migration
+            else:
+                config["status"].pop("migration", None)
+            return True
+        config = self.store.update(NETWORK_CONFIG, "cluster", sync_migration)
+
+        spec_type, status_type = config["spec"].get("networkType"), config["status"].get("networkType")
+        if spec_type != status_type and self.network_rollout is None:
+            self.network_rollout = {"type": spec_type, "until": now + self.args.co_progress_seconds}
+            self.store.update(CLUSTER_OPERATORS, "network", lambda co: set_condition(co, "Progressing", "True", "Deploying"))
+            for collection, namespace, name in (MULTUS,) + CNI_WORKLOADS.get(spec_type, ()):
+                if self.store.get(collection, name, namespace) is None:
+                    self.put_workload(collection, namespace, name)
+                self.store.update(collection, name, lambda workload: True, namespace, spec_changed=True)
+        elif self.network_rollout and now >= self.network_rollout["until"] and not self.workload_rollouts:
+            network_type = self.network_rollout["type"]
+            self.network_rollout = None
+
+            def switch(config):
+                config["status"]["networkType"] = network_type
+                config["status"]["clusterNetwork"] = copy.deepcopy(config["spec"].get("clusterNetwork"))
+                return True
+            self.store.update(NETWORK_CONFIG, "cluster", switch)
+            self.store.update(CLUSTER_OPERATORS, "network", lambda co: set_condition(co, "Progressing", "False"))
+
+    def step_workloads(self, now):
+        for collection in (DAEMONSETS, DEPLOYMENTS):
+            workloads, _revision = self.store.items(collection)
+            for workload in [copy.deepcopy(item) for item in workloads]:
+                metadata, status = workload["metadata"], workload["status"]
+                key = (collection, metadata["namespace"], metadata["name"])
+                desired = status["desiredNumberScheduled"] if collection == DAEMONSETS else workload["spec"]["replicas"]
+                started = status.get("observedGeneration", 0) < metadata.get("generation", 1)
+                if started:
+                    self.workload_rollouts[key] = now
+                    status["observedGeneration"] = metadata["generation"]
+                elif key not in self.workload_rollouts:
+                    continue
+                updated = min(desired, int(desired * (now - self.workload_rollouts[key]) / max(self.args.daemonset_seconds, TICK)))
+                if updated == desired:
+                    del self.workload_rollouts[key]
+                fields = self.rollout_fields(collection, desired, updated)
+                if started or any(status.get(field) != value for field, value in fields.items()):
+                    status.update(fields)
+                    self.store.put(collection, workload)
+
+    # ------------------------------------------------------ machine config operator
+    def pool_nodes(self, pool):
+        """Return the nodes of ``pool``, which must not be modified; as with the MCO, infra nodes are not in the worker pool."""
+        nodes, _revision = self.store.items(NODES)
+        label = f"node-role.kubernetes.io/{pool}"
+        members = [node for node in nodes if label in node["metadata"].get("labels", {})]
+        if pool == "worker":
+            members = [node for node in members if "node-role.kubernetes.io/infra" not in node["metadata"]["labels"]]
+        return members
+
+    def max_unavailable(self, pool, count):
+        value = pool["spec"].get("maxUnavailable", 1)
+        if isinstance(value, str) and value.endswith("%"):
+            value = int(count * int(value[:-1]) / 100)
+        return max(1, int(value))
+
+    def step_pools(self, now):
+        network_type = self.wanted_network_type()
+        pools, _revision = self.store.items(POOLS)
+        for name in [pool["metadata"]["name"] for pool in pools]:
+            pool = self.store.get(POOLS, name)
+            target = pool["spec"]["configuration"]["name"]
+            rendered = self.store.get(MACHINE_CONFIGS, target)
+            if rendered["metadata"]["annotations"].get(NETWORK_TYPE_ANNOTATION) != network_type:
+                serial = int(target.rsplit("-", 1)[1]) + 1
+                target = self.render(name, serial, network_type)
+                pool["spec"]["configuration"]["name"] = target
+                self.store.put(POOLS, pool, spec_changed=True)
+            if pool["spec"].get("paused"):
+                continue
+            self.roll_out(pool, target, now)
+
+    def roll_out(self, pool, target, now):
+        members = self.pool_nodes(pool["metadata"]["name"])
+        updated, updating, pending = 0, 0, []
+        for member in members:
+            annotations = member["metadata"]["annotations"]
+            if annotations[MCO_ANNOTATION + "currentConfig"] == target and annotations[MCO_ANNOTATION + "state"] == "Done":
+                updated += 1
+                continue
+            node_name = member["metadata"]["name"]
+            started = self.node_updates.get(node_name)
+            if started is None:
+                pending.append(member)
+            elif now - started >= self.args.mco_node_seconds:
+                del self.node_updates[node_name]
+                node = copy.deepcopy(member)
+                node["metadata"]["annotations"].update({MCO_ANNOTATION + "currentConfig": target, MCO_ANNOTATION + "state": "Done"})
+                node["status"]["nodeInfo"]["bootID"] = str(uuid.uuid4())
+                self.store.put(NODES, node)
+                updated += 1
+            else:
+                updating += 1
+        for member in pending[:max(0, self.max_unavailable(pool, len(members)) - updating)]:
+            node = copy.deepcopy(member)
+            node["metadata"]["annotations"].update({MCO_ANNOTATION + "desiredConfig": target, MCO_ANNOTATION + "state": "Working"})
+            self.store.put(NODES, node)
+            self.node_updates[node["metadata"]["name"]] = now
+            updating += 1
+
+        status = pool["status"]
+        done = updated == len(members)
+        counts = {"machineCount": len(members), "updatedMachineCount": updated, "readyMachineCount": len(members) - updating,
+                  "unavailableMachineCount": updating}
+        changed = any(status.get(field) != value for field, value in counts.items())
+        status.update(counts)
+        changed |= set_condition(pool, "Updating", "False" if done else "True", "" if done else "Updating")
+        changed |= set_condition(pool, "Updated", "True" if done else "False")
+        if done and status["configuration"]["name"] != target:
+            status["configuration"]["name"] = target
+            changed = True
+        if changed:
+            self.store.put(POOLS, pool)
+
+    def run(self):
+        while True:
+            now = time.monotonic()
+            try:
+                self.step_reboots(now)
+                self.step_replacements(now)
+                self.step_network(now)
+                self.step_workloads(now)
+                self.step_pools(now)
+            except Exception as exc:  # keep the simulation going; the playbook run will time out and show the failure
+                print(f"simulator error: {exc!r}", flush=True)
+            time.sleep(TICK)
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    store = None
+    simulator = None
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        pass
+
+    def send(self, code, body):
+        data = json.dumps(body).encode()
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def read_body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length)) if length else None
+
+    def route(self, method):
+        url = urlsplit(self.path)
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        collection, namespace, name, subresource = parse_path(url.path)
+        if collection is None:
+            self.send(404, status_body(404, "NotFound", f"the server could not find the requested resource {url.path}"))
+            return None
+        self.store.count(method, collection.rsplit("/", 1)[1], watch=bool(query.get("watch")))
+        return query, collection, namespace, name, subresource
+
+    def do_GET(self):
+        if self.path.startswith("/fake/stats"):
+            with self.store.lock:
+                requests = dict(self.store.requests)
+            return self.send(200, {"total": sum(requests.values()), "requests": requests})
+        route = self.route("GET")
+        if route is None:
+            return None
+        query, collection, namespace, name, _subresource = route
+        if collection.endswith("/users") and name == "~":
+            return self.send(200, {"kind": "User", "metadata": {"name": "system:admin"}, "groups": ["system:masters"]})
+        if name:
+            obj = self.store.get(collection, name, namespace)
+            if obj is None:
+                return self.send(404, status_body(404, "NotFound", f"{collection.rsplit('/', 1)[1]} \"{name}\" not found"))
+            return self.send(200, obj)
+        if query.get("watch") in ("true", "1"):
+            return self.watch(collection, namespace, query)
+
+        items, revision = self.store.items(collection, namespace)
+        items = [item for item in items if match_labels(item, query.get("labelSelector")) and match_fields(item, query.get("fieldSelector"))]
+        metadata = {"resourceVersion": str(revision)}
+        limit, start = int(query.get("limit") or 0), int(query.get("continue") or 0)
+        if limit:
+            if start + limit < len(items):
+                metadata["continue"] = str(start + limit)
+                metadata["remainingItemCount"] = len(items) - start - limit
+            items = items[start:start + limit]
+        return self.send(200, {"kind": "List", "apiVersion": "v1", "metadata": metadata, "items": items})
+
+    def write_chunk(self, event):
+        line = json.dumps(event).encode() + b"\n"
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(line), line))
+        self.wfile.flush()
+
+    def watch(self, collection, namespace, query):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        revision = int(query.get("resourceVersion") or self.store.revision)
+        deadline = time.monotonic() + int(query.get("timeoutSeconds") or 300)
+        try:
+            while time.monotonic() < deadline:
+                events, expired = self.store.events_after(collection, revision, min(1.0, deadline - time.monotonic()))
+                if expired:
+                    self.write_chunk({"type": "ERROR", "object": status_body(410, "Expired", f"too old resource version: {revision}")})
+                    break
+                for event_revision, event_type, obj in events:
+                    revision = event_revision
+                    metadata = obj["metadata"]
+                    if namespace and metadata.get("namespace") != namespace:
+                        continue
+                    if match_labels(obj, query.get("labelSelector")) and match_fields(obj, query.get("fieldSelector")):
+                        self.write_chunk({"type": event_type, "object": obj})
+            self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def do_PATCH(self):
+        route = self.route("PATCH")
+        if route is None:
+            return None
+        _query, collection, namespace, name, _subresource = route
+        body = self.read_body()
+        obj = self.store.get(collection, name, namespace)
+        if obj is None:
+            return self.send(404, status_body(404, "NotFound", f"{collection.rsplit('/', 1)[1]} \"{name}\" not found"))
+        spec = copy.deepcopy(obj.get("spec"))
+        if "json-patch" in (self.headers.get("Content-Type") or ""):
+            json_patch(obj, body)
+        else:
+            merge_patch(obj, body)
+        self.store.put(collection, obj, spec_changed=obj.get("spec") != spec)
+        return self.send(200, obj)
+
+    def do_DELETE(self):
+        route = self.route("DELETE")
+        if route is None:
+            return None
+        _query, collection, namespace, name, _subresource = route
+        obj = self.store.get(collection, name, namespace)
+        if obj is None:
+            return self.send(404, status_body(404, "NotFound", f"{collection.rsplit('/', 1)[1]} \"{name}\" not found"))
+        self.store.put(collection, obj, "DELETED")
+        return self.send(200, {"kind": "Status", "apiVersion": "v1", "status": "Success", "details": {"name": name}})
+
+    def do_POST(self):
+        if self.path.startswith("/fake/stats/reset"):
+            with self.store.lock:
+                self.store.requests.clear()
+            return self.send(200, {"total": 0, "requests": {}})
+        if self.path.startswith("/fake/reboot"):
+            body = self.read_body() or {}
+            node = self.simulator.schedule_reboot(body.get("namespace"), body.get("pod"), float(body.get("delay_minutes") or 0))
+            if node is None:
+                return self.send(404, status_body(404, "NotFound", f"pods \"{body.get('pod')}\" not found"))
+            return self.send(200, {"node": node})
+        route = self.route("POST")
+        if route is None:
+            return None
+        _query, collection, namespace, name, subresource = route
+        body = self.read_body() or {}
+        if collection.endswith("/selfsubjectaccessreviews"):
+            body["status"] = {"allowed": True}
+            return self.send(201, body)
+        if subresource == "eviction":
+            return self.send(*self.simulator.evict(namespace, name))
+        metadata = body.setdefault("metadata", {})
+        if namespace:
+            metadata["namespace"] = namespace
+        if self.store.get(collection, metadata.get("name"), namespace) is not None:
+            return self.send(409, status_body(409, "AlreadyExists", f"\"{metadata.get('name')}\" already exists"))
+        return self.send(201, self.store.put(collection, body, "ADDED"))
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n", 1)[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=18443, help="port to listen on; 0 picks a free one")
+    parser.add_argument("--nodes", type=int, default=10, help="number of nodes, masters included")
+    parser.add_argument("--masters", type=int, default=3)
+    parser.add_argument("--infra-nodes", type=int, default=0, help="number of worker nodes in a custom 'infra' pool (maxUnavailable 1)")
+    parser.add_argument("--version", default="4.16.30", help="OpenShift version reported by the ClusterVersion")
+    parser.add_argument("--cluster-network", default="10.128.0.0/14")
+    parser.add_argument("--host-prefix", type=int, default=23)
+    parser.add_argument("--nncp-interface", default="br-ex")
+    parser.add_argument("--max-unavailable", default="10%", help="maxUnavailable of the worker pool, a number or a percentage")
+    parser.add_argument("--mco-node-seconds", type=float, default=2.0, help="time the MCO takes to update one node")
+    parser.add_argument("--co-progress-seconds", type=float, default=15.0, help="minimum time the network operator stays Progressing")
+    parser.add_argument("--daemonset-seconds", type=float, default=5.0, help="time a DaemonSet or Deployment rollout takes")
+    parser.add_argument("--minute-seconds", type=float, default=1.0, help="real seconds one minute of a 'shutdown -r +N' delay lasts")
+    parser.add_argument("--reboot-seconds", type=float, default=3.0, help="time a node stays NotReady while rebooting")
+    parser.add_argument("--app-pods-per-node", type=int, default=0, help="pods of a sample application, covered by a PodDisruptionBudget, per worker")
+    parser.add_argument("--pdb-max-unavailable", type=int, default=1, help="maxUnavailable of the sample application's PodDisruptionBudget")
+    parser.add_argument("--pod-start-seconds", type=float, default=2.0, help="time an evicted sample pod takes to run again on another worker")
+    args = parser.parse_args(argv)
+    if args.max_unavailable.isdigit():
+        args.max_unavailable = int(args.max_unavailable)
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    store = Store()
+    simulator = Simulator(store, args)
+    simulator.seed()
+    Handler.store, Handler.simulator = store, simulator
+    server = ThreadingHTTPServer((args.host, args.port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=simulator.run, daemon=True).start()
+    # The benchmark harness reads the URL from the first line of output.
+    print(f"http://{args.host}:{server.server_address[1]}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
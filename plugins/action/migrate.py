@@ -0,0 +1,301 @@
+# Copyright (c) 2025, Red Hat
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""
+Run the SDN to OVN-Kubernetes migration steps in the controller process.
+
+The steps are the same functions the individual modules wrap (see
+``module_utils/migration_steps.py``).  They are driven here as a state machine
+through ``StepModule``, a stand-in for ``AnsibleModule``, so the whole
+migration shares one Python process and one pool of API connections.
+"""
+
+import shlex
+import subprocess
+import time
+
+from ansible.module_utils.common.arg_spec import ArgumentSpecValidator
+from ansible.plugins.action import ActionBase
+from ansible.utils.display import Display
+from ansible_collections.network.offline_migration_sdn_to_ovnk.plugins.module_utils.journal import (
+    CheckpointJournal,
+    default_journal_path,
+    invalid_reason,
+    load_checkpoints,
+    record_checkpoint,
+    reset_checkpoints,
+)
+from ansible_collections.network.offline_migration_sdn_to_ovnk.plugins.module_utils.kube_client import get_client
+from ansible_collections.network.offline_migration_sdn_to_ovnk.plugins.module_utils.migration_steps import NETWORK_TYPES, STEP_SPECS, STEPS
+
+display = Display()
+
+ARGUMENT_SPEC = dict(
+    network_type=dict(type="str", choices=NETWORK_TYPES, required=True),
+    clean_migration_timeout=dict(type="int", default=120),
+    change_migration_timeout=dict(type="int", default=120),
+    interface_name=dict(type="str"),
+    disable_auto_migration=dict(type="bool", default=False),
+    egress_ip=dict(type="raw"),
+    egress_firewall=dict(type="raw"),
+    multicast=dict(type="raw"),
+    configure_network_type=dict(type="str", choices=["ovnKubernetes", "openshiftSDN"]),
+    mtu=dict(type="int"),
+    geneve_port=dict(type="int"),
+    ipv4_subnet=dict(type="str"),
+    routing_via_host=dict(type="bool"),
+    ip_forwarding=dict(type="str", choices=["Global", "Restricted"]),
+    mco_timeout=dict(type="int", default=300),
+    mcp_completion_timeout=dict(type="int", default=2700),
+    mco_status_file=dict(type="path"),
+    verify_machine_config_timeout=dict(type="int", default=300),
+    cidr=dict(type="str"),
+    prefix=dict(type="int"),
+    node_headroom=dict(type="int", default=0),
+    ovn_co_timeout=dict(type="int", default=60),
+    multus_timeout=dict(type="int", default=300),
+    stall_timeout=dict(type="int"),
+    checkpoint_run=dict(type="str"),
+    checkpoint_phase=dict(type="str", default="migration"),
+    journal_file=dict(type="path"),
+    checkpoint_max_age=dict(type="int", default=86400),
+)
+
+
+def _always(args, facts):
+    return True
+
+
+def _version_at_least(facts, major, minor):
+    try:
+        return tuple(int(part) for part in facts.get("ocp_version", "").split(".")[:2]) >= (major, minor)
+    except ValueError:
+        return False
+
+
+def _stall(args):
+    """Return the stall_timeout override for the waiting steps, if any; otherwise they keep their own defaults."""
+    return {} if args["stall_timeout"] is None else {"stall_timeout": args["stall_timeout"]}
+
+
+# Migration state machine: (state, condition to run it, step parameters, next state).  A step that fails or
+# whose condition is false moves to the "failed" or next state respectively; "done" ends the run.
+STATES = {
+    "plan_cluster_network": (
+        lambda a, f: bool(a["cidr"]),
+        lambda a: {key: a[key] for key in ("cidr", "prefix", "node_headroom")},
+        "clean_migration_field",
+    ),
+    "clean_migration_field": (_always, lambda a: {"timeout": a["clean_migration_timeout"]}, "delete_primary_nncp"),
+    "delete_primary_nncp": (lambda a, f: bool(a["interface_name"]), lambda a: {"interface_name": a["interface_name"]}, "change_network_type"),
+    "change_network_type": (
+        lambda a, f: not a["disable_auto_migration"],
+        lambda a: {"network_type": a["network_type"], "timeout": a["change_migration_timeout"]},
+        "get_ocp_version",
+    ),
+    "get_ocp_version": (_always, lambda a: {}, "disable_automatic_migration"),
+    "disable_automatic_migration": (
+        lambda a, f: a["disable_auto_migration"] and _version_at_least(f, 4, 12),
+        lambda a: {key: a[key] for key in ("network_type", "egress_ip", "egress_firewall", "multicast")},
+        "configure_network_settings",
+    ),
+    "configure_network_settings": (
+        lambda a, f: bool(a["configure_network_type"]),
+        lambda a: {
+            key: a[key] for key in ("configure_network_type", "mtu", "geneve_port", "ipv4_subnet", "routing_via_host", "ip_forwarding")
+        },
+        "wait_for_mco",
+    ),
+    "wait_for_mco": (_always, lambda a: {"timeout": a["mco_timeout"]}, "wait_for_mco_completion"),
+    "wait_for_mco_completion": (
+        _always,
+        lambda a: {"timeout": a["mcp_completion_timeout"], "status_file": a["mco_status_file"], **_stall(a)},
+        "verify_machine_config",
+    ),
+    "verify_machine_config": (
+        _always,
+        lambda a: {"network_type": a["network_type"], "timeout": a["verify_machine_config_timeout"]},
+        "trigger_network_type",
+    ),
+    "trigger_network_type": (
+        _always,
+        lambda a: {
+            "network_type": a["network_type"],
+            "timeout": a["ovn_co_timeout"],
+            "cidr": a["cidr"],
+            "prefix": a["prefix"],
+            "node_headroom": a["node_headroom"],
+        },
+        "wait_for_network_co",
+    ),
+    "wait_for_network_co": (_always, lambda a: {"timeout": a["ovn_co_timeout"], **_stall(a)}, "wait_multus_restart"),
+    "wait_multus_restart": (_always, lambda a: {"timeout": a["multus_timeout"], "network_type": a["network_type"], **_stall(a)}, "done"),
+}
+INITIAL_STATE = "plan_cluster_network"
+# Read-only steps that check the cluster or whose result later states depend on; they run again instead of being skipped on a rerun.
+ALWAYS_RUN = ("plan_cluster_network", "get_ocp_version")
+
+
+class StepExit(BaseException):
+    """Raised by ``StepModule.exit_json``/``fail_json``; like ``SystemExit`` it is not caught by ``except Exception``."""
+
+    def __init__(self, result):
+        super(StepExit, self).__init__(result.get("msg"))
+        self.result = result
+
+
+class StepModule(object):
+    """The subset of ``AnsibleModule`` the migration steps use, for running them in the controller."""
+
+    def __init__(self, name, params, check_mode=False, spec=None):
+        spec = dict(spec or STEP_SPECS[name])
+        self.name = name
+        self.warnings = []
+        self.check_mode = check_mode
+        argument_spec = spec.pop("argument_spec")
+        supports_check_mode = spec.pop("supports_check_mode", False)
+        validation = ArgumentSpecValidator(argument_spec, **spec).validate({k: v for k, v in params.items() if v is not None})
+        if validation.error_messages:
+            self.fail_json(msg=f"Invalid parameters for step {name}: {'; '.join(validation.error_messages)}")
+        self.params = validation.validated_parameters
+        if check_mode and not supports_check_mode:
+            self.exit_json(skipped=True, msg=f"Step {name} does not support check mode.")
+
+    def warn(self, warning):
+        self.warnings.append(warning)
+        display.vv(f"{self.name}: {warning}")
+
+    def log(self, msg):
+        display.vvvv(f"{self.name}: {msg}")
+
+    def run_command(self, args, check_rc=False, use_unsafe_shell=False):
+        if isinstance(args, str) and not use_unsafe_shell:
+            args = shlex.split(args)
+        try:
+            proc = subprocess.run(args, shell=use_unsafe_shell, capture_output=True, text=True, check=False)
+        except OSError as exc:
+            if check_rc:
+                self.fail_json(msg=str(exc), cmd=args)
+            return 127, "", str(exc)
+        if check_rc and proc.returncode != 0:
+            self.fail_json(msg=proc.stderr.strip(), rc=proc.returncode, stdout=proc.stdout, stderr=proc.stderr)
+        return proc.returncode, proc.stdout, proc.stderr
+
+    def exit_json(self, **kwargs):
+        kwargs.setdefault("changed", False)
+        raise StepExit(kwargs)
+
+    def fail_json(self, msg, **kwargs):
+        kwargs.update(failed=True, msg=msg)
+        raise StepExit(kwargs)
+
+
+def run_step(name, params, check_mode=False):
+    """Run one migration step in-process and return its result dict."""
+    start = time.monotonic()
+    module = None
+    try:
+        module = StepModule(name, params, check_mode)
+        STEPS[name](module)
+        result = {"failed": True, "msg": f"Step {name} ended without reporting a result."}
+    except StepExit as done:
+        result = done.result
+    except Exception as exc:  # pylint: disable=broad-exception-caught
+        result = {"failed": True, "msg": f"Unexpected error in step {name}: {exc}"}
+    result["step"] = name
+    result["duration"] = round(time.monotonic() - start, 1)
+    if module and module.warnings:
+        result["warnings"] = module.warnings
+    return result
+
+
+class ActionModule(ActionBase):
+
+    TRANSFERS_FILES = False
+    _requires_connection = False
+
+    def run(self, tmp=None, task_vars=None):
+        result = super(ActionModule, self).run(tmp, task_vars)
+        del tmp
+
+        _unused, args = self.validate_argument_spec(argument_spec=ARGUMENT_SPEC, required_together=[("cidr", "prefix")])
+
+        steps = []
+        warnings = []
+        facts = {}
+        journal = self._open_journal(args, warnings) if args["checkpoint_run"] else None
+        if journal and journal.get("error"):
+            result.update(failed=True, msg=journal["error"], steps=steps)
+            return result
+        state = INITIAL_STATE
+        resumed = []
+        while state not in ("done", "failed"):
+            condition, build_params, next_state = STATES[state]
+            if not condition(args, facts):
+                steps.append({"step": state, "skipped": True, "changed": False, "msg": "Condition not met."})
+                state = next_state
+                continue
+            if journal and state in journal["completed"] and state not in ALWAYS_RUN:
+                steps.append({"step": state, "skipped": True, "changed": False, "checkpoint": True, "msg": "Completed in an earlier run."})
+                resumed.append(state)
+                state = next_state
+                continue
+            display.v(f"migrate: running step {state}")
+            step = run_step(state, build_params(args), self._task.check_mode)
+            steps.append(step)
+            warnings.extend(f"{state}: {warning}" for warning in step.get("warnings", []))
+            if journal and not step.get("skipped") and state not in ALWAYS_RUN and not self._task.check_mode:
+                error = record_checkpoint(
+                    journal["client"], journal["journal"], journal["cluster_uid"], args["checkpoint_run"], args["checkpoint_phase"], state,
+                    failed=bool(step.get("failed")),
+                )
+                if error:
+                    warnings.append(error)
+            if step.get("failed"):
+                result.update(failed=True, failed_step=state, msg=f"Migration step {state} failed: {step.get('msg')}")
+                state = "failed"
+                continue
+            if state == "get_ocp_version":
+                facts["ocp_version"] = step.get("version", "")
+                if not _version_at_least(facts, 4, 12):
+                    warnings.append(
+                        f"The OpenShift version is {facts['ocp_version']}. EgressIP, EgressFirewall, and multicast features of SDN "
+                        "won't be automatically migrated to OVNKubernetes. You need to configure them manually."
+                    )
+            state = next_state
+
+        if resumed:
+            warnings.append(
+                f"Skipped steps {', '.join(resumed)} completed in an earlier {args['checkpoint_run']} run. "
+                "Rerun with checkpoint_reset=true to run every step again."
+            )
+        result["steps"] = steps
+        result["changed"] = any(step.get("changed") for step in steps)
+        if warnings:
+            result["warnings"] = warnings
+        if not result.get("failed"):
+            result["msg"] = f"Migration to {args['network_type']} completed."
+        return result
+
+    def _open_journal(self, args, warnings):
+        """Load and revalidate the checkpoints of this run; return a dict with the client, journal and completed steps."""
+        journal_file = args["journal_file"] or default_journal_path()
+        try:
+            client = get_client(StepModule("checkpoint", {}, spec=dict(argument_spec={}, supports_check_mode=True)))
+        except StepExit as failure:
+            return {"error": failure.result["msg"]}
+        journal = CheckpointJournal(journal_file)
+        checkpoints, error = load_checkpoints(client, journal, args["checkpoint_run"], args["checkpoint_max_age"])
+        if error:
+            return {"error": error}
+        completed = checkpoints["steps"].get(args["checkpoint_phase"], [])
+        reason = invalid_reason(checkpoints)
+        if reason:
+            completed = []
+            warnings.append(f"Checkpoints of the {args['checkpoint_run']} run are no longer valid ({reason}); starting over.")
+            error = None if self._task.check_mode else reset_checkpoints(journal, checkpoints["cluster_uid"], args["checkpoint_run"], reason)
+            if error:
+                return {"error": error}
+        elif completed:
+            display.v(f"migrate: resuming after completed steps {', '.join(completed)}")
+        return {"client": client, "journal": journal, "cluster_uid": checkpoints["cluster_uid"], "completed": completed}
@@ -0,0 +1,267 @@
+# Copyright (c) 2025, Red Hat
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+DOCUMENTATION = r"""
+name: migration_timing
+type: aggregate
+short_description: Report where the time of a migration or rollback run goes.
+version_added: "1.1.0"
+author: Miheer Salunke (@miheer)
+description:
+  - Records the wall-clock time of every play and task and, through the hooks in the collection's API client and
+    C(oc) command helpers, the number, errors and latency of the API requests and C(oc) commands each task made and
+    how often it retried.
+  - At the end of the playbook writes a JSON report and a Prometheus textfile (for the node_exporter textfile
+    collector) with the per-task durations and per-module call counts, latency histograms and retries.
+  - Covers every phase run by the playbook (prechecks, migration, reboot and post-migration or post-rollback checks),
+    so the C(*_timeout) role variables can be tuned from measured durations.
+  - Only tasks that run modules on the controller, like the ones in this collection's playbooks, report call metrics.
+requirements:
+  - enable in configuration, for example C(callbacks_enabled = network.offline_migration_sdn_to_ovnk.migration_timing)
+options:
+  report_file:
+    description:
+      - Path of the JSON report.
+      - Defaults to C(timing-report.json) in the collection's temporary directory.
+    type: path
+    env:
+      - name: NETWORK_MIGRATION_TIMING_REPORT
+    ini:
+      - section: callback_migration_timing
+        key: report_file
+  prometheus_file:
+    description:
+      - Path of the Prometheus textfile. Point it into the node_exporter textfile collector directory to scrape it.
+      - Defaults to C(network_migration.prom) in the collection's temporary directory.
+    type: path
+    env:
+      - name: NETWORK_MIGRATION_TIMING_PROMETHEUS
+    ini:
+      - section: callback_migration_timing
+        key: prometheus_file
+"""
+
+import json
+import os
+import tempfile
+import time
+
+from ansible.plugins.callback import CallbackBase
+from ansible_collections.network.offline_migration_sdn_to_ovnk.plugins.module_utils.cache import CACHE_DIR, default_cache_path
+from ansible_collections.network.offline_migration_sdn_to_ovnk.plugins.module_utils.metrics import LATENCY_BUCKETS, METRICS_ENV
+
+CALL_KINDS = ("api", "oc")
+
+
+def _new_calls():
+    return {"count": 0, "errors": 0, "sum": 0.0, "buckets": [0] * len(LATENCY_BUCKETS), "by_name": {}}
+
+
+def _label(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(**labels):
+    return "{" + ",".join(f'{key}="{_label(value)}"' for key, value in labels.items()) + "}"
+
+
+def _write_atomically(path, text):
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix=".timing-")
+    with os.fdopen(fd, "w", encoding="utf-8") as handle:
+        handle.write(text)
+    os.replace(tmp, path)
+
+
+class CallbackModule(CallbackBase):
+    """Collect task durations and the call metrics written by the module hooks."""
+
+    CALLBACK_VERSION = 2.0
+    CALLBACK_TYPE = "aggregate"
+    CALLBACK_NAME = "network.offline_migration_sdn_to_ovnk.migration_timing"
+    CALLBACK_NEEDS_ENABLED = True
+
+    def __init__(self, display=None):
+        super(CallbackModule, self).__init__(display)
+        self.playbook = None
+        self.started_at = None
+        self.start = None
+        self.play = None
+        self.plays = []
+        self.tasks = []
+        self.modules = {}
+        self.current = None
+        self.events_file = None
+        self.events_offset = 0
+
+    def v2_playbook_on_start(self, playbook):
+        self.playbook = os.path.basename(playbook._file_name)
+        self.started_at = time.time()
+        self.start = time.monotonic()
+        os.makedirs(CACHE_DIR, mode=0o700, exist_ok=True)
+        fd, self.events_file = tempfile.mkstemp(dir=CACHE_DIR, prefix="timing-events-", suffix=".jsonl")
+        os.close(fd)
+        # Modules started from now on inherit the variable and append their call events to the file.
+        os.environ[METRICS_ENV] = self.events_file
+
+    def v2_playbook_on_play_start(self, play):
+        self._finish_task()
+        self._finish_play()
+        self.play = {"name": play.get_name(), "start": time.monotonic()}
+
+    def v2_playbook_on_task_start(self, task, is_conditional):
+        self._finish_task()
+        self.current = {
+            "play": self.play["name"] if self.play else "",
+            "task": task.get_name(),
+            "action": task.action,
+            "status": "started",
+            "start": time.monotonic(),
+        }
+
+    def v2_playbook_on_handler_task_start(self, task):
+        self.v2_playbook_on_task_start(task, False)
+
+    def _set_status(self, status):
+        if self.current:
+            self.current["status"] = status
+
+    def v2_runner_on_ok(self, result):
+        self._set_status("changed" if result._result.get("changed") else "ok")
+
+    def v2_runner_on_failed(self, result, ignore_errors=False):
+        self._set_status("ignored" if ignore_errors else "failed")
+
+    def v2_runner_on_skipped(self, result):
+        self._set_status("skipped")
+
+    def v2_runner_on_unreachable(self, result):
+        self._set_status("unreachable")
+
+    def _read_events(self):
+        """Return the call events appended since the last read."""
+        events = []
+        try:
+            with open(self.events_file, encoding="utf-8") as handle:
+                handle.seek(self.events_offset)
+                while True:
+                    line = handle.readline()
+                    if not line.endswith("\n"):
+                        break  # not written completely yet; read it with the next task
+                    self.events_offset = handle.tell()
+                    try:
+                        events.append(json.loads(line))
+                    except ValueError:
+                        continue
+        except (OSError, TypeError):
+            pass
+        return events
+
+    def _finish_task(self):
+        task, self.current = self.current, None
+        if not task:
+            return
+        task["duration"] = round(time.monotonic() - task.pop("start"), 3)
+        module = self.modules.setdefault(task["action"], {"tasks": 0, "duration": 0.0, "retries": 0, "calls": {kind: _new_calls() for kind in CALL_KINDS}})
+        module["tasks"] += 1
+        module["duration"] = round(module["duration"] + task["duration"], 3)
+        task.update(api_calls=0, oc_calls=0, call_errors=0, retries=0)
+        for event in self._read_events():
+            kind = event.get("kind")
+            if kind == "retry":
+                task["retries"] += 1
+                module["retries"] += 1
+                continue
+            if kind not in CALL_KINDS:
+                continue
+            task[f"{kind}_calls"] += 1
+            calls = module["calls"][kind]
+            duration = event.get("duration", 0.0)
+            calls["count"] += 1
+            calls["sum"] = round(calls["sum"] + duration, 6)
+            calls["by_name"][event.get("name")] = calls["by_name"].get(event.get("name"), 0) + 1
+            if event.get("error"):
+                calls["errors"] += 1
+                task["call_errors"] += 1
+            for index, bound in enumerate(LATENCY_BUCKETS):
+                if duration <= bound:
+                    calls["buckets"][index] += 1
+        self.tasks.append(task)
+
+    def _finish_play(self):
+        if self.play:
+            self.plays.append({"name": self.play["name"], "duration": round(time.monotonic() - self.play["start"], 3)})
+            self.play = None
+
+    def v2_playbook_on_stats(self, stats):
+        self._finish_task()
+        self._finish_play()
+        os.environ.pop(METRICS_ENV, None)
+        try:
+            os.remove(self.events_file)
+        except (OSError, TypeError):
+            pass
+
+        report = {
+            "playbook": self.playbook,
+            "started_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(self.started_at)),
+            "duration": round(time.monotonic() - self.start, 3),
+            "latency_buckets": list(LATENCY_BUCKETS),
+            "plays": self.plays,
+            "tasks": self.tasks,
+            "modules": self.modules,
+        }
+        report_file = self.get_option("report_file") or default_cache_path("timing-report.json")
+        prometheus_file = self.get_option("prometheus_file") or default_cache_path("network_migration.prom")
+        try:
+            _write_atomically(report_file, json.dumps(report, indent=2, sort_keys=True) + "\n")
+            _write_atomically(prometheus_file, self._prometheus(report))
+        except OSError as exc:
+            self._display.warning(f"migration_timing: failed to write the timing report: {exc}")
+            return
+        self._display.display(f"Timing report written to {report_file} and {prometheus_file}")
+
+    @staticmethod
+    def _prometheus(report):
+        """Render ``report`` in the Prometheus text exposition format."""
+        playbook = report["playbook"]
+        lines = []
+
+        def metric(name, kind, help_text, samples):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            lines.extend(f"{sample_name}{_labels(playbook=playbook, **labels)} {value}" for sample_name, labels, value in samples)
+
+        metric("network_migration_run_duration_seconds", "gauge", "Wall-clock time of the playbook run.",
+               [("network_migration_run_duration_seconds", {}, report["duration"])])
+        metric("network_migration_play_duration_seconds", "gauge", "Wall-clock time of each play (phase).",
+               [("network_migration_play_duration_seconds", {"play": play["name"]}, play["duration"]) for play in report["plays"]])
+
+        task_durations = {}
+        for task in report["tasks"]:
+            key = (task["play"], task["task"], task["action"])
+            task_durations[key] = round(task_durations.get(key, 0.0) + task["duration"], 3)
+        metric("network_migration_task_duration_seconds", "gauge", "Wall-clock time of each task.",
+               [("network_migration_task_duration_seconds", {"play": play, "task": name, "module": action}, duration)
+                for (play, name, action), duration in task_durations.items()])
+
+        modules = sorted(report["modules"].items())
+        metric("network_migration_module_duration_seconds", "gauge", "Total wall-clock time of the tasks running each module.",
+               [("network_migration_module_duration_seconds", {"module": module}, data["duration"]) for module, data in modules])
+        metric("network_migration_retries_total", "counter", "Retries made by each module's API and oc helpers.",
+               [("network_migration_retries_total", {"module": module}, data["retries"]) for module, data in modules])
+        calls = [(module, kind, data["calls"][kind]) for module, data in modules for kind in CALL_KINDS if data["calls"][kind]["count"]]
+        metric("network_migration_call_errors_total", "counter", "API requests and oc commands that failed, per module.",
+               [("network_migration_call_errors_total", {"module": module, "type": kind}, stats["errors"]) for module, kind, stats in calls])
+
+        samples = []
+        for module, kind, stats in calls:
+            labels = {"module": module, "type": kind}
+            for bound, count in zip(report["latency_buckets"], stats["buckets"]):
+                samples.append(("network_migration_call_duration_seconds_bucket", dict(labels, le=bound), count))
+            samples.append(("network_migration_call_duration_seconds_bucket", dict(labels, le="+Inf"), stats["count"]))
+            samples.append(("network_migration_call_duration_seconds_sum", labels, stats["sum"]))
+            samples.append(("network_migration_call_duration_seconds_count", labels, stats["count"]))
+        metric("network_migration_call_duration_seconds", "histogram", "Latency of API requests and oc commands, per module.", samples)
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,18 @@
+# Copyright (c) 2025, Red Hat
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+
+class ModuleDocFragment(object):
+
+    DOCUMENTATION = r"""
+options:
+  snapshot_ttl:
+    description:
+      - Seconds for which a cluster object fetched by an earlier module of the same run may be reused from the
+        on-disk snapshot cache instead of being read from the API again.
+      - The snapshot is kept per API server and cluster UID, and is dropped by every module that changes the ClusterVersion,
+        the Network config or the Network operator object.
+      - Set to C(0) to always read from the API.
+    type: int
+    default: 30
+"""
@@ -0,0 +1,185 @@
+# Copyright (c) 2025, Red Hat
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""
+Small on-disk JSON cache shared by the modules.
+
+Entries survive between module runs (and between playbooks) on the controller
+or target host running the module.  A cache that cannot be read is treated as
+empty and a cache that cannot be written is skipped, so caching never fails a
+module.
+"""
+
+import fcntl
+import json
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+
+CACHE_DIR = os.path.join(tempfile.gettempdir(), "network.offline_migration_sdn_to_ovnk")
+# Snapshot entries older than this are dropped whenever the snapshot is saved.
+SNAPSHOT_MAX_AGE = 3600
+
+
+def default_cache_path(name):
+    """Return the default location of the cache file ``name``."""
+    return os.path.join(CACHE_DIR, name)
+
+
+def write_json(path, data):
+    """Atomically replace the file at *path* with *data* as JSON; return an error string or None."""
+    directory = os.path.dirname(path) or "."
+    try:
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=directory, prefix=".cache-")
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            json.dump(data, handle, sort_keys=True)
+        os.replace(tmp, path)
+    except OSError as exc:
+        return f"{path}: {exc}"
+    return None
+
+
+@contextmanager
+def file_lock(path):
+    """Hold an exclusive lock on ``<path>.lock`` for the duration of the block; go on unlocked if it cannot be taken."""
+    handle = None
+    try:
+        os.makedirs(os.path.dirname(path) or ".", mode=0o700, exist_ok=True)
+        handle = open(path + ".lock", "a", encoding="utf-8")  # pylint: disable=consider-using-with
+        fcntl.flock(handle, fcntl.LOCK_EX)
+    except OSError:
+        pass
+    try:
+        yield
+    finally:
+        if handle:
+            handle.close()
+
+
+def read_json(path):
+    """Return the JSON object stored at *path*, or an empty dict if it is missing or unreadable."""
+    try:
+        with open(path, encoding="utf-8") as handle:
+            data = json.load(handle)
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+class JsonFileCache:
+    """Key/value cache persisted as a single JSON document."""
+
+    def __init__(self, path):
+        self.path = path
+        self.entries = read_json(path)
+        self.dirty = False
+
+    def get(self, key, default=None):
+        return self.entries.get(key, default)
+
+    def set(self, key, value):
+        if self.entries.get(key) != value:
+            self.entries[key] = value
+            self.dirty = True
+
+    def save(self):
+        """Atomically write the cache back to disk; return an error string or None."""
+        if not self.dirty:
+            return None
+        error = write_json(self.path, self.entries)
+        if error:
+            return f"Failed to write cache {error}"
+        self.dirty = False
+        return None
+
+    def clear(self):
+        """Forget every entry and remove the cache file."""
+        self.entries = {}
+        self.dirty = False
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+
+class SnapshotCache(JsonFileCache):
+    """Cluster objects read by earlier modules of a run, keyed by cluster UID, kind and name.
+
+    Each entry records the object's resourceVersion and when it was fetched; readers decide how old an entry
+    they accept.  Nothing is served or stored before the ClusterVersion has told which cluster is behind the API
+    URL, and writers invalidate the objects so later readers never see a pre-change view.
+
+    Several processes share the file, and one of them (the migrate action plugin) may keep its snapshot open for a
+    whole run, so the file is merged back in before every lookup and before every save: the later invalidation (and
+    the cluster UID that came with it) wins, and of two fetches of an object the newer one.
+    """
+
+    def _key(self, kind, name):
+        return f"{self.get('cluster_uid')}/{kind}/{name}"
+
+    def merge(self, entries):
+        """Fold the snapshot *entries* saved by another process into this one."""
+        newer, older = self.entries, entries
+        if older.get("invalidated_at", 0) > newer.get("invalidated_at", 0):
+            newer, older = older, newer
+        merged = {"cluster_uid": newer.get("cluster_uid") or older.get("cluster_uid"), "invalidated_at": newer.get("invalidated_at", 0)}
+        prefix = f"{merged['cluster_uid']}/"
+        for key, entry in list(older.items()) + list(newer.items()):
+            if not isinstance(entry, dict) or not key.startswith(prefix) or entry.get("fetched_at", 0) < merged["invalidated_at"]:
+                continue
+            if entry.get("fetched_at", 0) >= merged.get(key, {}).get("fetched_at", 0):
+                merged[key] = entry
+        self.entries = {key: value for key, value in merged.items() if value}
+
+    def lookup(self, kind, name, ttl):
+        """Return the cached object if it was fetched less than ``ttl`` seconds ago, else None."""
+        saved = read_json(self.path)
+        self.merge(saved)
+        self.dirty = self.entries != saved
+        if not self.get("cluster_uid"):
+            return None
+        entry = self.get(self._key(kind, name))
+        if entry and entry.get("resourceVersion") and time.time() - entry.get("fetched_at", 0) < ttl:
+            return entry.get("object")
+        return None
+
+    def store(self, kind, name, obj, fetched_at=None):
+        """Record *obj*, read from the API at *fetched_at* (default now).
+
+        An object of an unknown cluster or without a resourceVersion is not cached.
+        """
+        now = time.time()
+        fetched_at = now if fetched_at is None else fetched_at
+        if kind == "clusterversions":
+            cluster_uid = obj.get("spec", {}).get("clusterID")
+            if cluster_uid and cluster_uid != self.get("cluster_uid"):
+                # A different cluster behind the same API URL: nothing cached so far applies to it.
+                self.entries = {"cluster_uid": cluster_uid, "invalidated_at": fetched_at}
+                self.dirty = True
+        if not self.get("cluster_uid"):
+            return
+        resource_version = obj.get("metadata", {}).get("resourceVersion")
+        if not resource_version:
+            return
+        for key in [k for k, v in self.entries.items() if isinstance(v, dict) and now - v.get("fetched_at", 0) > SNAPSHOT_MAX_AGE]:
+            del self.entries[key]
+            self.dirty = True
+        self.set(self._key(kind, name), {"object": obj, "resourceVersion": resource_version, "fetched_at": fetched_at})
+
+    def invalidate(self):
+        """Drop every cached object but remember which cluster the snapshot belongs to."""
+        self.entries = {key: value for key, value in self.entries.items() if key == "cluster_uid"}
+        self.entries["invalidated_at"] = time.time()
+        self.dirty = True
+
+    def save(self):
+        """Merge in what other processes saved meanwhile, then write the snapshot back; return an error string or None."""
+        if not self.dirty:
+            return None
+        with file_lock(self.path):
+            saved = read_json(self.path)
+            self.merge(saved)
+            self.dirty = self.entries != saved
+            return super(SnapshotCache, self).save()
@@ -0,0 +1,52 @@
+# Copyright (c) 2025, Red Hat
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""
+CIDR overlap detection shared by the modules that validate cluster networks.
+
+Ranges are parsed once into ``(version, first, last)`` integer intervals and
+all overlaps between a deny-list and the ranges in use are found with a single
+sweep over the sorted intervals, instead of comparing every pair.
+"""
+
+import ipaddress
+
+
+def to_interval(cidr):
+    """Return ``(ip_version, first_address, last_address)`` for *cidr*; host bits are ignored."""
+    network = ipaddress.ip_network(str(cidr), strict=False)
+    return network.version, int(network.network_address), int(network.broadcast_address)
+
+
+def find_overlaps(forbidden, used):
+    """Find every overlap between two sets of ranges.
+
+    *forbidden* is an iterable of CIDRs and *used* an iterable of ``(cidr, source)`` pairs, where ``source`` names
+    the field the range came from (e.g. ``clusterNetwork``).  Returns a list of
+    ``{"forbidden": cidr, "used": cidr, "source": source}`` dicts without duplicates, ordered by address.
+    Raises ``ValueError`` for a malformed CIDR.
+    """
+    # (version, first, last, side, cidr, source); side 0 is the deny-list, side 1 the ranges in use
+    intervals = set()
+    for cidr in forbidden:
+        intervals.add(to_interval(cidr) + (0, str(cidr), None))
+    for cidr, source in used:
+        intervals.add(to_interval(cidr) + (1, str(cidr), source))
+
+    overlaps = []
+    active = ([], [])
+    current_version = None
+    for version, first, last, side, cidr, source in sorted(intervals, key=lambda i: (i[0], i[1], i[2], i[3], i[4], i[5] or "")):
+        if version != current_version:
+            active = ([], [])
+            current_version = version
+        # Drop the intervals that end before this one starts; the rest overlap it.
+        for index in (0, 1):
+            active[index][:] = [entry for entry in active[index] if entry[0] >= first]
+        for other_last, other_cidr, other_source in active[1 - side]:
+            if side == 0:
+                overlaps.append({"forbidden": cidr, "used": other_cidr, "source": other_source})
+            else:
+                overlaps.append({"forbidden": other_cidr, "used": cidr, "source": source})
+        active[side].append((last, cidr, source))
+    return overlaps
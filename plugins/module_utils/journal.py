@@ -0,0 +1,185 @@
+# Copyright (c) 2025, Red Hat
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""
+Append-only checkpoint journal for resuming a migration or rollback run.
+
+Every completed phase (and every completed step of the ``migrate`` action)
+appends one JSON line recording the cluster UID, the run (``migration`` or
+``rollback``) and the ``resourceVersion`` and ``generation`` of the cluster
+objects whose spec the run changes.  On a rerun the newest record is
+revalidated with one GET per recorded object: while the generations are
+unchanged nobody has edited those specs since, so everything the journal
+recorded is still complete.  Otherwise, or once the newest record is older
+than the maximum age a caller accepts, a reset record is appended and the run
+starts over.
+
+The journal lives in the home directory of the user running the module rather
+than in the temporary directory, which is shared and cleaned behind our back.
+"""
+
+import json
+import os
+import time
+
+JOURNAL_DIR = os.path.join(os.path.expanduser("~"), ".ansible", "network.offline_migration_sdn_to_ovnk")
+JOURNAL_FILE = "checkpoints.jsonl"
+# Seconds after the newest record of a run before its history is no longer trusted.
+CHECKPOINT_MAX_AGE = 86400
+# Objects observed when a whole phase completes.  post_migration and post_rollback edit network.operator, so only
+# the cluster network config, which they leave alone, is used to revalidate phase records.
+PHASE_WATCH = (("network.config", "cluster"),)
+# Objects observed when a migration step completes: the two specs the migration steps patch.
+STEP_WATCH = (("network.operator", "cluster"), ("network.config", "cluster"))
+
+
+def default_journal_path():
+    return os.path.join(JOURNAL_DIR, JOURNAL_FILE)
+
+
+class CheckpointJournal:
+    """The journal file; unreadable lines are ignored so a torn final write cannot break a rerun."""
+
+    def __init__(self, path):
+        self.path = path
+        self.records = []
+        try:
+            with open(path, encoding="utf-8") as handle:
+                for line in handle:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue
+                    if isinstance(record, dict):
+                        self.records.append(record)
+        except OSError:
+            pass
+
+    def history(self, cluster_uid, run):
+        """Return the records of ``run`` on ``cluster_uid`` since its last reset, oldest first."""
+        history = []
+        for record in self.records:
+            if record.get("cluster_uid") != cluster_uid or record.get("run") != run:
+                continue
+            if record.get("reset"):
+                history = []
+            else:
+                history.append(record)
+        return history
+
+    def append(self, record):
+        """Append ``record`` and flush it to disk; return an error string or None."""
+        record = dict(record, recorded_at=time.time())
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", mode=0o700, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as handle:
+                handle.write(json.dumps(record, sort_keys=True) + "\n")
+                handle.flush()
+                os.fsync(handle.fileno())
+        except OSError as exc:
+            return f"Failed to write checkpoint journal {self.path}: {exc}"
+        self.records.append(record)
+        return None
+
+
+def get_cluster_uid(client):
+    """Return ``(cluster_uid, error)`` from the ClusterVersion object."""
+    version, error = client.get("clusterversions", "version")
+    if error:
+        return None, f"Failed to read the cluster ID: {error}"
+    cluster_uid = version.get("spec", {}).get("clusterID")
+    if not cluster_uid:
+        return None, "ClusterVersion 'version' has no spec.clusterID."
+    return cluster_uid, None
+
+
+def observe(client, watch):
+    """Return ``({"kind/name": {"resourceVersion", "generation"}}, error)`` for the objects in ``watch``."""
+    observed = {}
+    for kind, name in watch:
+        obj, error = client.get(kind, name)
+        if error:
+            return None, f"Failed to read {kind}/{name}: {error}"
+        metadata = obj.get("metadata", {})
+        observed[f"{kind}/{name}"] = {"resourceVersion": metadata.get("resourceVersion"), "generation": metadata.get("generation")}
+    return observed, None
+
+
+def load_checkpoints(client, journal, run, max_age=CHECKPOINT_MAX_AGE):
+    """Revalidate the journal of ``run`` against the cluster.
+
+    Returns ``(state, error)`` where ``state`` has ``cluster_uid``, ``phases`` (completed phases, in order),
+    ``steps`` (phase -> completed steps), ``invalidated`` (objects whose spec changed since the newest record),
+    ``recorded_at`` (time of the newest record) and ``expired`` (the newest record is older than ``max_age``
+    seconds; ``0`` never expires).  When :func:`invalid_reason` returns a reason the recorded phases and steps can
+    no longer be trusted: callers treat nothing as complete and reset the history.
+    """
+    cluster_uid, error = get_cluster_uid(client)
+    if error:
+        return None, error
+    state = {"cluster_uid": cluster_uid, "phases": [], "steps": {}, "invalidated": [], "recorded_at": None, "expired": False}
+    history = journal.history(cluster_uid, run)
+    if not history:
+        return state, None
+
+    state["recorded_at"] = history[-1].get("recorded_at", 0)
+    state["expired"] = bool(max_age) and time.time() - state["recorded_at"] > max_age
+
+    recorded = history[-1].get("observed", {})
+    current, error = observe(client, [tuple(key.split("/", 1)) for key in recorded])
+    if error:
+        return None, error
+    # Status updates bump resourceVersion but not generation; fall back to resourceVersion for objects without one.
+    state["invalidated"] = sorted(
+        key for key, seen in recorded.items() if seen != current[key] and (seen.get("generation") is None or seen["generation"] != current[key]["generation"])
+    )
+    for record in history:
+        if record.get("failed"):
+            continue
+        if record.get("step"):
+            state["steps"].setdefault(record["phase"], []).append(record["step"])
+        elif record.get("phase") not in state["phases"]:
+            state["phases"].append(record["phase"])
+    return state, None
+
+
+def invalid_reason(state):
+    """Return why the history loaded by :func:`load_checkpoints` can no longer be trusted, or None."""
+    if state["invalidated"]:
+        return f"changed: {', '.join(state['invalidated'])}"
+    if state["expired"]:
+        return f"last recorded {format_age(state['recorded_at'])} ago"
+    return None
+
+
+def format_age(recorded_at):
+    """Return how long ago ``recorded_at`` was, e.g. ``3h12m``."""
+    seconds = int(max(0, time.time() - recorded_at))
+    minutes = seconds // 60
+    if minutes < 1:
+        return f"{seconds}s"
+    if minutes < 60:
+        return f"{minutes}m"
+    return f"{minutes // 60}h{minutes % 60:02d}m"
+
+
+def record_checkpoint(client, journal, cluster_uid, run, phase, step=None, failed=False):
+    """Append a checkpoint for a completed phase, or for a ``step`` of it; return an error or None.
+
+    A ``failed`` step is recorded too, without counting as complete, so that the changes it made before failing do
+    not invalidate the steps completed before it.
+    """
+    observed, error = observe(client, STEP_WATCH if step else PHASE_WATCH)
+    if error:
+        return error
+    record = {"cluster_uid": cluster_uid, "run": run, "phase": phase, "observed": observed}
+    if step:
+        record["step"] = step
+    if failed:
+        record["failed"] = True
+    return journal.append(record)
+
+
+def reset_checkpoints(journal, cluster_uid, run, reason="requested"):
+    """Discard the recorded history of ``run`` on ``cluster_uid``; return an error or None."""
+    return journal.append({"cluster_uid": cluster_uid, "run": run, "reset": True, "reason": reason})
@@ -0,0 +1,618 @@
+# Copyright (c) 2025, Red Hat
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""
+Shared in-process client for the Kubernetes / OpenShift API.
+
+The kubeconfig is parsed once per process and requests go over a small pool of
+keep-alive HTTPS connections instead of spawning a new ``oc`` process for every
+read, patch and wait.  Like the ``run_command`` helpers used by the modules,
+every call returns an ``(result, error)`` tuple instead of raising.
+"""
+
+import base64
+import calendar
+import hashlib
+import http.client
+import json
+import os
+import socket
+import ssl
+import tempfile
+import threading
+import time
+import urllib.parse
+
+try:
+    import yaml
+
+    HAS_YAML = True
+except ImportError:
+    HAS_YAML = False
+
+from ansible_collections.network.offline_migration_sdn_to_ovnk.plugins.module_utils.cache import SnapshotCache, default_cache_path
+from ansible_collections.network.offline_migration_sdn_to_ovnk.plugins.module_utils.metrics import record, timed_run_command
+from ansible_collections.network.offline_migration_sdn_to_ovnk.plugins.module_utils.polling import PollSchedule
+
+
+# kind -> (API group/version prefix, plural, namespaced)
+RESOURCES = {
+    "namespaces": ("/api/v1", "namespaces", False),
+    "nodes": ("/api/v1", "nodes", False),
+    "pods": ("/api/v1", "pods", True),
+    "daemonsets": ("/apis/apps/v1", "daemonsets", True),
+    "deployments": ("/apis/apps/v1", "deployments", True),
+    "customresourcedefinitions": ("/apis/apiextensions.k8s.io/v1", "customresourcedefinitions", False),
+    "clusteroperators": ("/apis/config.openshift.io/v1", "clusteroperators", False),
+    "clusterversions": ("/apis/config.openshift.io/v1", "clusterversions", False),
+    "network.config": ("/apis/config.openshift.io/v1", "networks", False),
+    "network.operator": ("/apis/operator.openshift.io/v1", "networks", False),
+    "machineconfigpools": ("/apis/machineconfiguration.openshift.io/v1", "machineconfigpools", False),
+    "machineconfigs": ("/apis/machineconfiguration.openshift.io/v1", "machineconfigs", False),
+    "nodenetworkconfigurationpolicies": ("/apis/nmstate.io/v1", "nodenetworkconfigurationpolicies", False),
+    "selfsubjectaccessreviews": ("/apis/authorization.k8s.io/v1", "selfsubjectaccessreviews", False),
+    "users": ("/apis/user.openshift.io/v1", "users", False),
+}
+
+PATCH_CONTENT_TYPES = {
+    "merge": "application/merge-patch+json",
+    "json": "application/json-patch+json",
+    "strategic": "application/strategic-merge-patch+json",
+}
+
+DEFAULT_REQUEST_TIMEOUT = 60
+DEFAULT_POOL_SIZE = 8
+# Cluster-scoped kinds the modules read through the snapshot cache.  The operators keep their status in step with
+# each other's spec (a network.operator patch moves network.config status), so a write to any of them invalidates
+# all of them; writes to other kinds, such as pod evictions, leave the snapshot alone.
+SNAPSHOT_KINDS = ("clusterversions", "network.config", "network.operator")
+
+
+class KubeAPIError(Exception):
+    """Error returned (not raised) by :class:`KubeClient` calls.
+
+    ``status`` is the HTTP status code, or ``None`` when the API server could
+    not be reached at all.  ``reason`` is the ``reason`` field of the returned
+    ``Status`` object, e.g. ``NotFound`` or ``Expired``.
+    """
+
+    def __init__(self, message, status=None, reason=None):
+        super().__init__(message)
+        self.status = status
+        self.reason = reason
+
+
+class KubeConfigError(Exception):
+    """Raised when the kubeconfig cannot be turned into usable credentials."""
+
+
+def _kubeconfig_paths():
+    value = os.environ.get("KUBECONFIG")
+    if value:
+        return [p for p in value.split(os.pathsep) if p]
+    return [os.path.expanduser("~/.kube/config")]
+
+
+def load_kubeconfig(paths=None):
+    """Load and merge the kubeconfig files the same way ``oc`` does.
+
+    The first file that sets ``current-context`` wins and, for contexts,
+    clusters and users, the first entry with a given name wins.
+    """
+    merged = {"current-context": None, "contexts": {}, "clusters": {}, "users": {}}
+    found = False
+    for path in paths or _kubeconfig_paths():
+        if not os.path.isfile(path):
+            continue
+        found = True
+        with open(path, "r") as f:
+            text = f.read()
+        try:
+            data = json.loads(text)
+        except ValueError:
+            if not HAS_YAML:
+                raise KubeConfigError(f"PyYAML is required to parse the kubeconfig at {path}.")
+            data = yaml.safe_load(text)
+        data = data or {}
+        if not merged["current-context"] and data.get("current-context"):
+            merged["current-context"] = data["current-context"]
+        for section, key in (("contexts", "context"), ("clusters", "cluster"), ("users", "user")):
+            for entry in data.get(section) or []:
+                merged[section].setdefault(entry.get("name"), entry.get(key) or {})
+        merged.setdefault("base_dir", os.path.dirname(os.path.abspath(path)))
+    if not found:
+        raise KubeConfigError(f"No kubeconfig found at: {', '.join(paths or _kubeconfig_paths())}.")
+    return merged
+
+
+def _resolve_path(base_dir, path):
+    if path and not os.path.isabs(path):
+        return os.path.join(base_dir, path)
+    return path
+
+
+def _read_material(entry, data_key, file_key, base_dir):
+    """Return PEM bytes from either the inline ``*-data`` or the file field."""
+    if entry.get(data_key):
+        return base64.b64decode(entry[data_key])
+    if entry.get(file_key):
+        with open(_resolve_path(base_dir, entry[file_key]), "rb") as f:
+            return f.read()
+    return None
+
+
+def _load_cert_chain(context, cert_pem, key_pem):
+    """``SSLContext.load_cert_chain`` only accepts files, so stage the PEMs privately."""
+    tmpdir = tempfile.mkdtemp(prefix="kube-client-")
+    cert_path = os.path.join(tmpdir, "client.crt")
+    key_path = os.path.join(tmpdir, "client.key")
+    try:
+        for path, data in ((cert_path, cert_pem), (key_path, key_pem)):
+            fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+        context.load_cert_chain(cert_path, key_path)
+    finally:
+        for path in (cert_path, key_path):
+            if os.path.exists(path):
+                os.unlink(path)
+        os.rmdir(tmpdir)
+
+
+def _run_exec_plugin(module, exec_config):
+    """Run a ``client.authentication.k8s.io`` exec credential plugin."""
+    command = [exec_config["command"]] + list(exec_config.get("args") or [])
+    environ = {e["name"]: e["value"] for e in exec_config.get("env") or []}
+    environ["KUBERNETES_EXEC_INFO"] = json.dumps(
+        {
+            "apiVersion": exec_config.get("apiVersion", "client.authentication.k8s.io/v1"),
+            "kind": "ExecCredential",
+            "spec": {"interactive": False},
+        }
+    )
+    rc, stdout, stderr = timed_run_command(module, command, environ_update=environ)
+    if rc != 0:
+        raise KubeConfigError(f"Credential plugin '{command[0]}' failed: {stderr.strip()}")
+    return json.loads(stdout).get("status", {})
+
+
+class KubeClient(object):
+    """Thin client over a pool of keep-alive connections to one API server."""
+
+    def __init__(self, module, kubeconfig=None, pool_size=DEFAULT_POOL_SIZE, request_timeout=DEFAULT_REQUEST_TIMEOUT):
+        self.module = module
+        self.request_timeout = request_timeout
+        self._pool_size = pool_size
+        self._idle = []
+        self._lock = threading.Lock()
+        self._snapshot = None
+        self._configure(kubeconfig or load_kubeconfig())
+
+    # ------------------------------------------------------------------
+    # Configuration
+    # ------------------------------------------------------------------
+    def _configure(self, config):
+        context_name = config.get("current-context")
+        if not context_name or context_name not in config["contexts"]:
+            raise KubeConfigError("The kubeconfig has no usable current-context.")
+        context = config["contexts"][context_name]
+        cluster = config["clusters"].get(context.get("cluster"))
+        if not cluster or not cluster.get("server"):
+            raise KubeConfigError(f"Cluster for context '{context_name}' has no server set.")
+        user = config["users"].get(context.get("user"), {})
+        base_dir = config.get("base_dir", os.getcwd())
+
+        self.server = cluster["server"]
+        url = urllib.parse.urlsplit(self.server)
+        self.scheme = url.scheme or "https"
+        self.host = url.hostname
+        self.port = url.port or (443 if self.scheme == "https" else 80)
+        self.path_prefix = url.path.rstrip("/")
+        self.headers = {"Accept": "application/json", "User-Agent": "network.offline_migration_sdn_to_ovnk"}
+
+        self.ssl_context = None
+        if self.scheme == "https":
+            if cluster.get("insecure-skip-tls-verify"):
+                self.ssl_context = ssl.create_default_context()
+                self.ssl_context.check_hostname = False
+                self.ssl_context.verify_mode = ssl.CERT_NONE
+            else:
+                ca = _read_material(cluster, "certificate-authority-data", "certificate-authority", base_dir)
+                self.ssl_context = ssl.create_default_context(cadata=ca.decode() if ca else None)
+
+        cert = _read_material(user, "client-certificate-data", "client-certificate", base_dir)
+        key = _read_material(user, "client-key-data", "client-key", base_dir)
+        token = user.get("token")
+        if not token and user.get("tokenFile"):
+            with open(_resolve_path(base_dir, user["tokenFile"]), "r") as f:
+                token = f.read().strip()
+        if user.get("exec") and not (token or cert):
+            status = _run_exec_plugin(self.module, user["exec"])
+            token = status.get("token")
+            if status.get("clientCertificateData"):
+                cert = status["clientCertificateData"].encode()
+                key = status["clientKeyData"].encode()
+
+        if cert and key:
+            if self.ssl_context is None:
+                raise KubeConfigError("Client certificates require an https:// server.")
+            _load_cert_chain(self.ssl_context, cert, key)
+        if token:
+            self.headers["Authorization"] = f"Bearer {token}"
+        elif user.get("username") and user.get("password"):
+            basic = base64.b64encode(f"{user['username']}:{user['password']}".encode()).decode()
+            self.headers["Authorization"] = f"Basic {basic}"
+        elif not cert:
+            raise KubeConfigError(f"User for context '{context_name}' has no supported credentials; log in again with `oc login`.")
+
+    # ------------------------------------------------------------------
+    # Connection pool
+    # ------------------------------------------------------------------
+    def _new_connection(self, timeout):
+        if self.scheme == "https":
+            return http.client.HTTPSConnection(self.host, self.port, timeout=timeout, context=self.ssl_context)
+        return http.client.HTTPConnection(self.host, self.port, timeout=timeout)
+
+    def _acquire(self):
+        with self._lock:
+            if self._idle:
+                return self._idle.pop(), True
+        return self._new_connection(self.request_timeout), False
+
+    def _release(self, conn):
+        with self._lock:
+            if len(self._idle) < self._pool_size:
+                self._idle.append(conn)
+                return
+        conn.close()
+
+    def close(self):
+        """Close all idle pooled connections."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+    # ------------------------------------------------------------------
+    # Requests
+    # ------------------------------------------------------------------
+    def path(self, kind, name=None, namespace=None, subresource=None):
+        """Build the REST path for *kind* (a key of ``RESOURCES``)."""
+        prefix, plural, namespaced = RESOURCES[kind]
+        parts = [self.path_prefix + prefix]
+        if namespaced and namespace:
+            parts += ["namespaces", urllib.parse.quote(namespace, safe="")]
+        parts.append(plural)
+        if name:
+            parts.append(urllib.parse.quote(name, safe=""))
+        if subresource:
+            parts.append(subresource)
+        return "/".join(parts)
+
+    @staticmethod
+    def _error_from_response(method, path, status, reason, payload):
+        try:
+            body = json.loads(payload)
+            message = body.get("message") or payload
+            api_reason = body.get("reason")
+        except ValueError:
+            message = payload.decode(errors="replace").strip() if isinstance(payload, bytes) else payload
+            api_reason = None
+        return KubeAPIError(f"{method} {path} failed ({status} {reason}): {message}", status=status, reason=api_reason)
+
+    def request(self, method, path, body=None, query=None, content_type="application/json", kind=None):
+        """Send one request and return ``(decoded_json, error)``; *kind* labels its timing metrics."""
+        start = time.monotonic()
+        result = self._send(method, path, body, query, content_type)
+        record("api", f"{method} {kind or path}", time.monotonic() - start, result[1] is not None)
+        return result
+
+    def _send(self, method, path, body, query, content_type):
+        if query:
+            path = f"{path}?{urllib.parse.urlencode({k: v for k, v in query.items() if v is not None})}"
+        headers = dict(self.headers)
+        payload = None
+        if body is not None:
+            payload = json.dumps(body).encode()
+            headers["Content-Type"] = content_type
+
+        # A pooled connection may have been closed by the server while idle;
+        # retry exactly once on a fresh connection in that case.
+        for attempt in range(2):
+            conn, reused = self._acquire()
+            try:
+                conn.request(method, path, body=payload, headers=headers)
+                resp = conn.getresponse()
+                data = resp.read()
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError) as exc:
+                conn.close()
+                if reused and attempt == 0:
+                    continue
+                return None, KubeAPIError(f"{method} {path} failed: {exc}")
+            except (OSError, http.client.HTTPException) as exc:
+                conn.close()
+                return None, KubeAPIError(f"{method} {path} failed: {exc}")
+
+            if resp.will_close:
+                conn.close()
+            else:
+                self._release(conn)
+
+            if resp.status >= 400:
+                return None, self._error_from_response(method, path, resp.status, resp.reason, data)
+            if not data:
+                return {}, None
+            try:
+                return json.loads(data), None
+            except ValueError:
+                return None, KubeAPIError(f"{method} {path} returned invalid JSON.")
+        return None, KubeAPIError(f"{method} {path} failed: connection closed by server.")
+
+    def get(self, kind, name, namespace=None):
+        """Return ``(object, error)`` for a single named object."""
+        return self.request("GET", self.path(kind, name, namespace), kind=kind)
+
+    def snapshot(self):
+        """Return the on-disk snapshot cache shared by the modules talking to this API server."""
+        if self._snapshot is None:
+            digest = hashlib.sha256(self.server.encode()).hexdigest()[:16]
+            self._snapshot = SnapshotCache(default_cache_path(f"snapshot-{digest}.json"))
+        return self._snapshot
+
+    def cached_get(self, kind, name, ttl):
+        """Like :meth:`get` for one of the ``SNAPSHOT_KINDS``, but reuse a snapshot entry younger than ``ttl`` seconds.
+
+        The snapshot is tied to the cluster UID of the ClusterVersion, so the ClusterVersion is read (and cached)
+        first when the snapshot does not know it yet.
+        """
+        if ttl <= 0 or kind not in SNAPSHOT_KINDS:
+            return self.get(kind, name)
+        snapshot = self.snapshot()
+        if kind != "clusterversions" and not snapshot.get("cluster_uid"):
+            self.cached_get("clusterversions", "version", ttl)
+        obj = snapshot.lookup(kind, name, ttl)
+        if obj is not None:
+            return obj, None
+        fetched_at = time.time()
+        obj, error = self.get(kind, name)
+        if not error:
+            snapshot.store(kind, name, obj, fetched_at)
+            snapshot.save()
+        return obj, error
+
+    def _mutated(self, kind, result):
+        if not result[1] and kind in SNAPSHOT_KINDS:
+            snapshot = self.snapshot()
+            snapshot.invalidate()
+            snapshot.save()
+        return result
+
+    def list(self, kind, namespace=None, label_selector=None, field_selector=None, limit=None, continue_token=None):
+        """Return ``(list_object, error)``; the object carries ``items`` and ``metadata``."""
+        query = {"labelSelector": label_selector, "fieldSelector": field_selector, "limit": limit, "continue": continue_token}
+        return self.request("GET", self.path(kind, namespace=namespace), query=query, kind=kind)
+
+    def create(self, kind, body, namespace=None, name=None, subresource=None):
+        """POST *body* to the collection (or to a subresource of *name*)."""
+        return self._mutated(kind, self.request("POST", self.path(kind, name, namespace, subresource), body=body, kind=kind))
+
+    def patch(self, kind, name, patch, namespace=None, patch_type="merge"):
+        """Return ``(patched_object, error)``; ``patch_type`` is merge, json or strategic."""
+        result = self.request("PATCH", self.path(kind, name, namespace), body=patch, content_type=PATCH_CONTENT_TYPES[patch_type], kind=kind)
+        return self._mutated(kind, result)
+
+    def delete(self, kind, name, namespace=None):
+        """Return ``(status, error)`` for deleting one named object."""
+        return self._mutated(kind, self.request("DELETE", self.path(kind, name, namespace), kind=kind))
+
+    def watch(self, kind, namespace=None, resource_version=None, label_selector=None, field_selector=None, timeout_seconds=60):
+        """Yield ``(event_type, object)`` pairs from a watch stream.
+
+        The stream runs on its own connection and ends when the server closes
+        it after *timeout_seconds*.  Connection problems are reported as a
+        final ``("ERROR", KubeAPIError)`` pair; an expired *resource_version*
+        arrives as an ``ERROR`` event whose object is a ``Status`` with code 410.
+        """
+        query = {
+            "watch": "1",
+            "allowWatchBookmarks": "true",
+            "resourceVersion": resource_version,
+            "labelSelector": label_selector,
+            "fieldSelector": field_selector,
+            "timeoutSeconds": max(1, int(timeout_seconds)),
+        }
+        path = f"{self.path(kind, namespace=namespace)}?{urllib.parse.urlencode({k: v for k, v in query.items() if v is not None})}"
+        conn = self._new_connection(timeout_seconds + 30)
+        start = time.monotonic()
+        failed = False
+        try:
+            conn.request("GET", path, headers=self.headers)
+            resp = conn.getresponse()
+            if resp.status >= 400:
+                failed = True
+                yield "ERROR", self._error_from_response("GET", path, resp.status, resp.reason, resp.read())
+                return
+            while True:
+                line = resp.readline()
+                if not line:
+                    return
+                line = line.strip()
+                if not line:
+                    continue
+                event = json.loads(line)
+                yield event.get("type"), event.get("object") or {}
+        except (OSError, socket.timeout, http.client.HTTPException, ValueError) as exc:
+            failed = True
+            yield "ERROR", KubeAPIError(f"Watch on {path} failed: {exc}")
+        finally:
+            conn.close()
+            record("api", f"WATCH {kind}", time.monotonic() - start, failed)
+
+    def wait_for(self, kind, predicate, timeout, namespace=None, label_selector=None, field_selector=None, resync_seconds=300, stop=None):
+        """Keep a list+watch view of *kind* until ``predicate(items)`` is true.
+
+        *predicate* is called with the full current list of objects after the
+        initial list, after every watch event and at least every
+        *resync_seconds* even when nothing changes, so time-based predicates
+        are re-evaluated.  Returns ``(items, None)`` as soon as it is
+        satisfied, or ``(items, error)`` once *timeout* seconds have passed.
+        Expired watches and dropped streams trigger a relist after a backoff
+        delay, and a watch that ends before its timeout without any event is
+        restarted after one.  The delay only goes back to the fast initial
+        cadence once a watch has delivered an event, so a watch that keeps
+        failing or returning nothing straight away (no ``watch`` permission, a
+        proxy that does not stream) does not turn into a tight loop.
+
+        *stop*, if given, is called with the same list whenever *predicate* is
+        false; when it returns a message the wait gives up early and returns
+        ``(items, error)`` with that message, e.g. once progress has stalled.
+        """
+        deadline = time.time() + timeout
+        # Paces the relists after failed lists and failed watches; a watch that delivers an event goes back to the fast initial cadence.
+        backoff = PollSchedule(timeout)
+        objects = None
+        last_error = None
+
+        def outcome():
+            """Return the result of the wait if it is over, else None."""
+            items = list(objects.values())
+            if predicate(items):
+                return items, None
+            message = stop(items) if stop else None
+            if message:
+                return items, KubeAPIError(message)
+            return None
+
+        while time.time() < deadline:
+            listing, error = self.list(kind, namespace=namespace, label_selector=label_selector, field_selector=field_selector)
+            if error:
+                last_error = error
+                backoff.wait()
+                continue
+            objects = {_object_key(o): o for o in listing.get("items", [])}
+            result = outcome()
+            if result:
+                return result
+            resource_version = listing.get("metadata", {}).get("resourceVersion")
+
+            while time.time() < deadline:
+                watch_timeout = min(int(deadline - time.time()) or 1, resync_seconds)
+                watch_started = time.time()
+                relist = False
+                events = 0
+                for event_type, obj in self.watch(kind, namespace, resource_version, label_selector, field_selector, timeout_seconds=watch_timeout):
+                    if event_type == "ERROR":
+                        last_error = obj if isinstance(obj, KubeAPIError) else KubeAPIError(obj.get("message", "watch error"), obj.get("code"))
+                        relist = True
+                        break
+                    events += 1
+                    backoff.reset()
+                    resource_version = obj.get("metadata", {}).get("resourceVersion", resource_version)
+                    if event_type == "BOOKMARK":
+                        continue
+                    if event_type == "DELETED":
+                        objects.pop(_object_key(obj), None)
+                    else:
+                        objects[_object_key(obj)] = obj
+                    result = outcome()
+                    if result:
+                        return result
+                if relist:
+                    backoff.wait()
+                    break
+                result = outcome()
+                if result:
+                    return result
+                # A watch that ends early without a single event (an empty response) is retried at the backoff pace too.
+                if not events and time.time() - watch_started < watch_timeout:
+                    backoff.wait()
+
+        items = list(objects.values()) if objects is not None else []
+        reason = f" Last error: {last_error}" if last_error else ""
+        return items, KubeAPIError(f"Timed out after {timeout}s waiting for {kind}.{reason}")
+
+
+def condition_status(obj, condition_type):
+    """Return the ``status`` of the named condition of *obj*, or ``Unknown``."""
+    for condition in obj.get("status", {}).get("conditions") or []:
+        if condition.get("type") == condition_type:
+            return condition.get("status", "Unknown")
+    return "Unknown"
+
+
+def get_condition(obj, condition_type):
+    """Return the named condition of *obj*, or an empty dict."""
+    for condition in obj.get("status", {}).get("conditions") or []:
+        if condition.get("type") == condition_type:
+            return condition
+    return {}
+
+
+def describe_condition(obj, condition_type, max_length=300):
+    """Return ``Type=Status`` for the named condition of *obj*, followed by its reason and (shortened) message if any."""
+    condition = get_condition(obj, condition_type)
+    text = f"{condition_type}={condition.get('status', 'Unknown')}"
+    reason, message = condition.get("reason"), (condition.get("message") or "").strip()
+    if len(message) > max_length:
+        message = message[:max_length] + "..."
+    if reason or message:
+        text += f" ({': '.join(part for part in (reason, message) if part)})"
+    return text
+
+
+def parse_timestamp(value):
+    """Convert an API ``2006-01-02T15:04:05Z`` timestamp to epoch seconds, or None if it is missing or malformed."""
+    try:
+        return calendar.timegm(time.strptime(value, "%Y-%m-%dT%H:%M:%SZ"))
+    except (TypeError, ValueError):
+        return None
+
+
+def _object_key(obj):
+    metadata = obj.get("metadata", {})
+    return metadata.get("namespace"), metadata.get("name")
+
+
+def call_with_retries(module, call, retries=3, delay=3):
+    """Retry a client call returning ``(result, error)``, like ``run_command_with_retries``."""
+    for attempt in range(retries):
+        result, error = call()
+        if not error:
+            return result, None
+        if attempt < retries - 1:
+            module.warn(f"Retrying in {delay} seconds due to error: {error}")
+            record("retry", "call_with_retries")
+            time.sleep(delay)
+        else:
+            return None, f"Request failed after {retries} attempts: {error}"
+    return None, "Unknown error"
+
+
+def read_with_backoff(module, call, timeout, delay=1, max_delay=30):
+    """Return the first successful result of ``call``, backing off exponentially on errors until ``timeout``."""
+    schedule = PollSchedule(timeout, initial=delay, max_interval=max_delay)
+    while True:
+        schedule.attempts += 1
+        result, error = call()
+        if not error:
+            return result, None
+        if schedule.expired():
+            return None, f"Request failed after {schedule.attempts} attempts in {timeout} seconds: {error}"
+        wait = schedule.next_delay()
+        module.warn(f"Retrying in {wait:.0f} seconds due to error: {error}")
+        record("retry", "read_with_backoff")
+        time.sleep(wait)
+
+
+_CLIENTS = {}
+
+
+def get_client(module):
+    """Return the process-wide :class:`KubeClient`, failing the module if it cannot be built."""
+    key = os.environ.get("KUBECONFIG", "")
+    if key not in _CLIENTS:
+        try:
+            _CLIENTS[key] = KubeClient(module)
+        except (KubeConfigError, OSError, ssl.SSLError, ValueError) as exc:
+            module.fail_json(msg=f"Failed to load kubeconfig: {exc}")
+    return _CLIENTS[key]
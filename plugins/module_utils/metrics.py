@@ -0,0 +1,48 @@
+# Copyright (c) 2025, Red Hat
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""
+Timing hooks for API requests, ``oc`` commands and retries.
+
+The ``migration_timing`` callback plugin exports ``METRICS_ENV`` pointing at a
+JSON-lines file before the first task runs.  While it is set, every API
+request, ``oc`` command and retry made by a module (or by the ``migrate``
+action in the controller) appends one line to that file, and the callback
+attributes the lines to the task that was running.  Without the callback the
+hooks do nothing.
+"""
+
+import json
+import os
+import time
+
+METRICS_ENV = "NETWORK_MIGRATION_METRICS_FILE"
+# Upper bounds in seconds of the call latency histogram buckets.
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 300)
+
+
+def record(kind, name, duration=0.0, error=False):
+    """Append one ``kind`` (``api``, ``oc`` or ``retry``) event to the metrics file, if one is configured."""
+    path = os.environ.get(METRICS_ENV)
+    if not path:
+        return
+    event = {"kind": kind, "name": name, "duration": round(duration, 6), "error": bool(error), "pid": os.getpid(), "time": time.time()}
+    try:
+        with open(path, "a", encoding="utf-8") as handle:
+            handle.write(json.dumps(event) + "\n")
+    except OSError:
+        pass
+
+
+def command_name(command):
+    """Return a short label for ``command``: the program and its subcommand, e.g. ``oc get``."""
+    args = command.split() if isinstance(command, str) else [str(arg) for arg in command]
+    return " ".join(os.path.basename(arg) if index == 0 else arg for index, arg in enumerate(args[:2]))
+
+
+def timed_run_command(module, command, **kwargs):
+    """``module.run_command`` that records the command's duration; returns ``(rc, stdout, stderr)``."""
+    start = time.monotonic()
+    rc, stdout, stderr = module.run_command(command, **kwargs)
+    record("oc", command_name(command), time.monotonic() - start, rc != 0)
+    return rc, stdout, stderr
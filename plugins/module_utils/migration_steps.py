@@ -0,0 +1,1129 @@
+# Copyright (c) 2025, Red Hat
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""
+Implementation of the migration steps.
+
+Each step is described by an entry in ``STEP_SPECS`` (the keyword arguments
+for ``AnsibleModule``) and implemented by a ``run_<step>(module)`` function
+that reads ``module.params`` and finishes with ``module.exit_json`` or
+``module.fail_json``, exactly like a module's ``main``.  The modules of the
+same name are thin wrappers around these functions, and the ``migrate``
+action plugin calls them in-process, one after another, with a controller-side
+stand-in for ``AnsibleModule``.
+"""
+
+import ipaddress
+import json
+import time
+
+from ansible_collections.network.offline_migration_sdn_to_ovnk.plugins.module_utils.cache import JsonFileCache, default_cache_path, write_json
+from ansible_collections.network.offline_migration_sdn_to_ovnk.plugins.module_utils.cidr import find_overlaps
+from ansible_collections.network.offline_migration_sdn_to_ovnk.plugins.module_utils.kube_client import (
+    call_with_retries,
+    condition_status,
+    describe_condition,
+    get_client,
+    read_with_backoff,
+)
+from ansible_collections.network.offline_migration_sdn_to_ovnk.plugins.module_utils.polling import StallDetector, poll
+
+NETWORK_TYPES = ["OVNKubernetes", "OpenShiftSDN"]
+
+STEP_SPECS = {
+    "clean_migration_field": dict(
+        argument_spec=dict(
+            timeout=dict(type="int", default=120),  # Timeout in seconds
+        ),
+    ),
+    "delete_primary_nncp": dict(
+        argument_spec=dict(interface_name=dict(type="str", required=True), retries=dict(type="int", default=3), delay=dict(type="int", default=3)),
+    ),
+    "change_network_type": dict(
+        argument_spec=dict(
+            network_type=dict(type="str", choices=NETWORK_TYPES, required=True),  # Target network type
+            timeout=dict(type="int", default=120),  # Timeout in seconds
+        ),
+    ),
+    "get_ocp_version": dict(
+        argument_spec=dict(
+            retries=dict(type="int", default=3),
+            delay=dict(type="int", default=5),
+            snapshot_ttl=dict(type="int", default=30),
+        ),
+        supports_check_mode=True,
+    ),
+    "disable_automatic_migration": dict(
+        argument_spec={
+            "network_type": {"type": "str", "choices": NETWORK_TYPES, "required": True},  # Takes OpenShiftSDN or OVNKubernetes
+            "egress_ip": {"type": "raw", "default": None},
+            "egress_firewall": {"type": "raw", "default": None},
+            "multicast": {"type": "raw", "default": None},
+        },
+        supports_check_mode=True,
+    ),
+    "configure_network_settings": dict(
+        argument_spec={
+            "configure_network_type": {"type": "str", "choices": ["ovnKubernetes", "openshiftSDN"], "required": True},
+            "mtu": {"type": "int", "required": False},
+            "geneve_port": {"type": "int", "required": False},
+            "ipv4_subnet": {"type": "str", "required": False},
+            "retries": {"type": "int", "default": 3},
+            "delay": {"type": "int", "default": 5},
+            "vxlanPort": {"type": "int", "required": False},
+            "routing_via_host": {"type": "bool", "required": False},
+            "ip_forwarding": {"type": "str", "choices": ["Global", "Restricted"], "required": False},
+        },
+        supports_check_mode=True,
+    ),
+    "wait_for_mco": dict(
+        argument_spec=dict(
+            timeout=dict(type="int", required=True),
+        ),
+    ),
+    "wait_for_mco_completion": dict(
+        argument_spec=dict(
+            timeout=dict(type="int", required=False, default=2700),  # Timeout in seconds
+            stall_timeout=dict(type="int", required=False, default=1800),  # Seconds without progress before giving up, 0 disables
+            status_file=dict(type="path", required=False),  # Where to write the rollout progress, see MCOProgress
+            progress_interval=dict(type="int", required=False, default=60),  # Seconds between progress warnings
+        ),
+    ),
+    "verify_machine_config": dict(
+        argument_spec=dict(
+            timeout=dict(type="int", default=300),
+            network_type=dict(type="str", required=True),
+            cache=dict(type="bool", default=True),
+            cache_file=dict(type="path"),
+        ),
+    ),
+    "plan_cluster_network": dict(
+        argument_spec=dict(
+            cidr=dict(type="str", required=True),
+            prefix=dict(type="int", required=True),
+            node_headroom=dict(type="int", required=False, default=0),
+        ),
+        supports_check_mode=True,
+    ),
+    "trigger_network_type": dict(
+        argument_spec=dict(
+            cidr=dict(type="str", required=False),
+            prefix=dict(type="int", required=False),
+            network_type=dict(type="str", choices=NETWORK_TYPES, required=True),  # Target network type
+            timeout=dict(type="int", required=False, default=60),  # Timeout in seconds
+            node_headroom=dict(type="int", required=False, default=0),
+        ),
+        required_together=[("cidr", "prefix")],
+    ),
+    "wait_for_network_co": dict(
+        argument_spec=dict(
+            timeout=dict(type="int", required=True),
+            stall_timeout=dict(type="int", required=False, default=300),  # Seconds without progress before giving up, 0 disables
+        ),
+    ),
+    "wait_multus_restart": dict(
+        argument_spec=dict(
+            timeout=dict(type="int", required=False, default=300),  # Timeout in seconds
+            network_type=dict(type="str", choices=NETWORK_TYPES),
+            stall_timeout=dict(type="int", required=False, default=600),  # Seconds without progress before giving up, 0 disables
+        ),
+    ),
+}
+
+
+# ─────────────────────────────────────────────────────────────
+# clean_migration_field
+# ─────────────────────────────────────────────────────────────
+def run_clean_migration_field(module):
+    timeout = module.params["timeout"]
+    client = get_client(module)
+
+    try:
+
+        patch = {"spec": {"migration": None}}
+
+        # Wait until migration field is cleared
+        patched = False
+        for _attempt in poll(timeout, max_interval=10):
+            try:
+                # Patch the network operator until the patch goes through
+                if not patched:
+                    output, error = client.patch("network.operator", "cluster", patch)
+                    if error:
+                        module.warn(f"Retrying as got an error: {error}")
+                        continue
+                    patched = True
+
+                output, error = client.get("network.config", "cluster")
+                if not error:
+                    if not output.get("spec", {}).get("migration") and not output.get("status", {}).get("migration"):
+                        module.exit_json(changed=True, msg="Migration field cleared.")
+                elif error:
+                    module.warn(f"Retrying as got an error: {error}")
+            except Exception as ex:
+                module.fail_json(msg=str(ex))
+
+        module.fail_json(msg="Timeout waiting for migration field to be cleared.")
+    except Exception as ex:
+        module.fail_json(msg=str(ex))
+
+
+# ─────────────────────────────────────────────────────────────
+# delete_primary_nncp
+# ─────────────────────────────────────────────────────────────
+def run_delete_primary_nncp(module):
+    interface_name = module.params["interface_name"]
+    retries = module.params["retries"]
+    delay = module.params["delay"]
+    client = get_client(module)
+
+    # Step 0: Check if NMState Operator is installed (CRD must exist)
+    _unused, crd_error = call_with_retries(
+        module, lambda: client.get("customresourcedefinitions", "nodenetworkconfigurationpolicies.nmstate.io"), retries, delay
+    )
+    if crd_error:
+        module.exit_json(changed=False, skipped=True, msg="NMState Operator not installed or NNCP CRD is missing. Skipping deletion.")
+
+    # Step 1: Get list of NNCPs
+    nncp_data, error = call_with_retries(module, lambda: client.list("nodenetworkconfigurationpolicies"), retries, delay)
+    if error:
+        module.fail_json(msg=f"Failed to retrieve NNCPs: {error}")
+
+    target_nncp = None
+    for item in nncp_data.get("items", []):
+        name = item["metadata"]["name"]
+        interfaces = item.get("spec", {}).get("desiredState", {}).get("interfaces", [])
+        for iface in interfaces:
+            if iface.get("name") == interface_name:
+                target_nncp = name
+                break
+        if target_nncp:
+            break
+
+    if not target_nncp:
+        module.exit_json(changed=False, msg=f"No NNCP found for interface '{interface_name}'.")
+
+    # Step 2: Delete the NNCP
+    _unused, error = call_with_retries(module, lambda: client.delete("nodenetworkconfigurationpolicies", target_nncp), retries, delay)
+    if error:
+        module.fail_json(msg=f"Failed to delete NNCP '{target_nncp}': {error}")
+
+    module.exit_json(changed=True, msg=f"NNCP '{target_nncp}' deleted successfully.")
+
+
+# ─────────────────────────────────────────────────────────────
+# change_network_type
+# ─────────────────────────────────────────────────────────────
+def run_change_network_type(module):
+    timeout = module.params["timeout"]
+    network_type = module.params["network_type"]
+
+    client = get_client(module)
+
+    try:
+        patch = {"spec": {"migration": {"networkType": network_type}}}
+        _unused, error = call_with_retries(module, lambda: client.patch("network.operator", "cluster", patch))
+        if error:
+            module.fail_json(msg=f"Failed to patch network.operator.openshift.io/cluster: {error}")
+
+        # Wait until the migration field is reflected in the cluster network config
+        for _attempt in poll(timeout, max_interval=10):
+            try:
+                network_config, error = client.get("network.config", "cluster")
+                if not error:
+                    if (network_config.get("status", {}).get("migration") or {}).get("networkType") == network_type:
+                        module.exit_json(changed=True, msg=f"Migration field set to networkType:{network_type}.")
+                elif error:
+                    module.warn(f"Retrying as got an error: {error}")
+
+            except Exception as ex:
+                module.fail_json(msg=str(ex))
+
+        module.fail_json(msg=f"Network type could not be changed to {network_type}.")
+    except Exception as ex:
+        module.fail_json(msg=str(ex))
+
+
+# ─────────────────────────────────────────────────────────────
+# get_ocp_version
+# ─────────────────────────────────────────────────────────────
+def run_get_ocp_version(module):
+    retries = module.params["retries"]
+    delay = module.params["delay"]
+
+    client = get_client(module)
+
+    version_data, error = call_with_retries(module, lambda: client.cached_get("clusterversions", "version", module.params["snapshot_ttl"]), retries, delay)
+
+    if error:
+        module.fail_json(msg=error)
+
+    try:
+        ocp_version = version_data["status"]["history"][0]["version"]
+        module.exit_json(changed=False, version=ocp_version)
+    except (KeyError, IndexError) as e:
+        module.fail_json(msg=f"Failed to parse OpenShift version: {str(e)}")
+
+
+# ─────────────────────────────────────────────────────────────
+# disable_automatic_migration
+# ─────────────────────────────────────────────────────────────
+def patch_network(module, network_type, egress_ip, egress_firewall, multicast):
+    """Patch the Network.operator.openshift.io cluster resource with generic networkType."""
+
+    # Validate network type
+    if network_type not in NETWORK_TYPES:
+        return None, f"Invalid networkType '{network_type}'. Supported: 'OVNKubernetes', 'OpenShiftSDN'."
+
+    # Check if any field is set (prevent empty patch)
+    if egress_ip is None and egress_firewall is None and multicast is None:
+        return None, "No values provided. Automatic migration will be applied."
+
+    if network_type == "OVNKubernetes":
+        patch_data = {"spec": {"migration": {"networkType": network_type, "features": {}}}}
+    elif network_type == "OpenShiftSDN":
+        patch_data = {"spec": {"migration": {"features": {}}}}
+
+    if egress_ip is not None:
+        patch_data["spec"]["migration"]["features"]["egressIP"] = egress_ip
+    if egress_firewall is not None:
+        patch_data["spec"]["migration"]["features"]["egressFirewall"] = egress_firewall
+    if multicast is not None:
+        patch_data["spec"]["migration"]["features"]["multicast"] = multicast
+
+    client = get_client(module)
+    _unused, error = call_with_retries(module, lambda: client.patch("network.operator", "cluster", patch_data), retries=3, delay=5)
+    if error:
+        return None, error
+    return "network.operator.openshift.io/cluster patched", None
+
+
+def run_disable_automatic_migration(module):
+    network_type = module.params["network_type"]
+    egress_ip = module.params["egress_ip"]
+    egress_firewall = module.params["egress_firewall"]
+    multicast = module.params["multicast"]
+
+    # Patch the network operator
+    output, error = patch_network(module, network_type, egress_ip, egress_firewall, multicast)
+    if error:
+        module.exit_json(changed=False, msg=error)
+
+    module.exit_json(changed=True, msg=f"Network operator migration settings updated for {network_type}.", output=output)
+
+
+# ─────────────────────────────────────────────────────────────
+# configure_network_settings
+# ─────────────────────────────────────────────────────────────
+def run_patch_command(module, patch_data, retries, delay):
+    """Patch the Network.operator.openshift.io cluster resource with retries."""
+    if module.check_mode:
+        module.exit_json(changed=True, msg="Check mode: Patch command prepared", command=json.dumps(patch_data))
+
+    client = get_client(module)
+    try:
+        output, error = call_with_retries(module, lambda: client.patch("network.operator", "cluster", patch_data), retries=retries, delay=delay)
+        if not error:
+            module.exit_json(changed=True, msg="Network configuration patched successfully.", output="network.operator.openshift.io/cluster patched")
+        else:
+            module.fail_json(msg=f"Patch command failed: {error}")
+    except Exception as e:
+        module.fail_json(msg=f"Unexpected error while executing patch command: {str(e)}")
+
+
+def run_configure_network_settings(module):
+    network_type = module.params["configure_network_type"]
+    mtu = module.params["mtu"]
+    geneve_port = module.params["geneve_port"]
+    ipv4_subnet = module.params["ipv4_subnet"]
+    retries = module.params["retries"]
+    delay = module.params["delay"]
+    vxlanPort = module.params["vxlanPort"]
+    routing_via_host = module.params["routing_via_host"]
+    ip_forwarding = module.params["ip_forwarding"]
+
+    # Ensure patching is needed
+    if not any([mtu, geneve_port, ipv4_subnet, vxlanPort, routing_via_host, ip_forwarding]):
+        module.exit_json(changed=False, msg="No changes required. No valid parameters provided.")
+
+    # Build the patch payload
+    if routing_via_host or ip_forwarding:
+        patch_data = {"spec": {"defaultNetwork": {f"{network_type}Config": {"gatewayConfig": {}}}}}
+    else:
+        patch_data = {"spec": {"defaultNetwork": {f"{network_type}Config": {}}}}
+
+    if network_type == "ovnKubernetes":
+        if mtu:
+            patch_data["spec"]["defaultNetwork"][f"{network_type}Config"]["mtu"] = mtu
+        if geneve_port:
+            patch_data["spec"]["defaultNetwork"][f"{network_type}Config"]["genevePort"] = geneve_port
+        if ipv4_subnet:
+            patch_data["spec"]["defaultNetwork"][f"{network_type}Config"]["v4InternalSubnet"] = ipv4_subnet
+        if vxlanPort:
+            module.warn("vxlanPort can't be set in ovnKubernetesConfig")
+        if routing_via_host:
+            patch_data["spec"]["defaultNetwork"][f"{network_type}Config"]["gatewayConfig"]["routingViaHost"] = routing_via_host
+        if ip_forwarding:
+            patch_data["spec"]["defaultNetwork"][f"{network_type}Config"]["gatewayConfig"]["ipForwarding"] = ip_forwarding
+
+        # Execute the patch
+        run_patch_command(module, patch_data, retries, delay)
+
+    elif network_type == "openshiftSDN":
+        if mtu:
+            patch_data["spec"]["defaultNetwork"][f"{network_type}Config"]["mtu"] = mtu
+        if vxlanPort:
+            patch_data["spec"]["defaultNetwork"][f"{network_type}Config"]["vxlanPort"] = vxlanPort
+        if geneve_port or ipv4_subnet:
+            module.warn("geneve_port or ipv4_subnet can't be set in openshiftSDNConfig")
+        # Execute the patch
+        run_patch_command(module, patch_data, retries, delay)
+
+    else:
+        module.exit_json(changed=False, msg="No changes patched. No valid parameters provided.")
+
+
+# ─────────────────────────────────────────────────────────────
+# wait_for_mco
+# ─────────────────────────────────────────────────────────────
+def all_pools_updating(pools):
+    """Return True when there are pools and every one of them that has machines reports Updating=True.
+
+    Custom pools count like master and worker; a pool without machines never starts updating, so it is not waited for.
+    """
+    return bool(pools) and all(
+        condition_status(pool, "Updating") == "True" for pool in pools if pool.get("status", {}).get("machineCount") != 0
+    )
+
+
+def wait_for_mco(module, timeout):
+    """Wait until the MCO starts applying the new machine config."""
+    client = get_client(module)
+    _unused, error = client.wait_for("machineconfigpools", all_pools_updating, timeout)
+    if not error:
+        return "MCO started updating nodes successfully."
+    return "Timeout waiting for MCO to start updating nodes."
+
+
+def run_wait_for_mco(module):
+    timeout = module.params["timeout"]
+
+    result_message = wait_for_mco(module, timeout)
+    if "Timeout" in result_message:
+        module.fail_json(msg=result_message)
+    else:
+        module.exit_json(changed=False, msg=result_message)
+
+
+# ─────────────────────────────────────────────────────────────
+# wait_for_mco_completion
+# ─────────────────────────────────────────────────────────────
+# Condition statuses every MachineConfigPool must report once the MCO is done
+DESIRED_CONDITIONS = {"Updated": "True", "Updating": "False", "Degraded": "False"}
+
+
+def pool_mismatches(pool):
+    """Return the conditions of *pool* that are not yet in the desired state."""
+    mismatches = []
+    for condition_type, desired in DESIRED_CONDITIONS.items():
+        status = condition_status(pool, condition_type)
+        if status != desired:
+            mismatches.append(f"{condition_type}={status}")
+    return mismatches
+
+
+def all_pools_converged(pools):
+    """Return True when there are pools and none of them has a mismatching condition."""
+    return bool(pools) and not any(pool_mismatches(pool) for pool in pools)
+
+
+# Machine counts a MachineConfigPool reports while the MCO rolls a config out
+MACHINE_COUNTS = ("machineCount", "updatedMachineCount", "readyMachineCount", "unavailableMachineCount", "degradedMachineCount")
+
+
+def pool_progress(pool):
+    """Return the progress signals of *pool*: its rendered config, machine counts and condition reasons."""
+    status = pool.get("status", {})
+    progress = {count: status.get(count) for count in MACHINE_COUNTS}
+    progress["configuration"] = (status.get("configuration") or {}).get("name")
+    progress["conditions"] = [describe_condition(pool, condition_type) for condition_type in ("Updated", "Updating", "Degraded")]
+    return progress
+
+
+def describe_pools(module, pools):
+    """Explain why the MachineConfigPools are not converged: per pool its counts and degraded conditions, plus the degraded nodes."""
+    details = []
+    for pool in sorted(pools, key=lambda p: p["metadata"]["name"]):
+        mismatches = pool_mismatches(pool)
+        if not mismatches:
+            continue
+        status = pool.get("status", {})
+        total = status.get("machineCount", 0)
+        detail = (
+            f"{pool['metadata']['name']}: {status.get('updatedMachineCount', 0)}/{total} updated, "
+            f"{status.get('readyMachineCount', 0)}/{total} ready, {status.get('degradedMachineCount', 0)} degraded ({', '.join(mismatches)})"
+        )
+        if pool.get("spec", {}).get("paused"):
+            detail += ", paused"
+        for condition_type in ("NodeDegraded", "RenderDegraded"):
+            if condition_status(pool, condition_type) == "True":
+                detail += f", {describe_condition(pool, condition_type)}"
+        details.append(detail)
+    nodes, error = get_client(module).list("nodes")
+    if error:
+        module.warn(f"Could not list the nodes: {error}")
+        return details
+    for node in nodes.get("items", []):
+        annotations = node["metadata"].get("annotations") or {}
+        state = annotations.get(MCO_ANNOTATION + "state")
+        if state in ("Degraded", "Unreconcilable"):
+            details.append(f"node {node['metadata']['name']} is {state}: {annotations.get(MCO_ANNOTATION + 'reason') or 'no reason given'}")
+    return details
+
+
+def format_duration(seconds):
+    """Format *seconds* as ``1h05m``, ``12m30s`` or ``45s``."""
+    seconds = int(round(seconds))
+    if seconds >= 3600:
+        return f"{seconds // 3600}h{seconds % 3600 // 60:02d}m"
+    if seconds >= 60:
+        return f"{seconds // 60}m{seconds % 60:02d}s"
+    return f"{seconds}s"
+
+
+class MCOProgress:
+    """Per-pool progress of an MCO rollout, with a per-node rate and an ETA estimated from the observed transitions.
+
+    Every increase of a pool's ``updatedMachineCount`` is a transition.  The rate of a pool is the number of
+    machines updated since the oldest of its last ``WINDOW`` transitions divided by the time since then, so it
+    follows the current pace and slows down while nothing moves.  A pool whose count goes down, or that
+    targets a new rendered config, starts over.
+    """
+
+    WINDOW = 10
+
+    def __init__(self):
+        self.started = time.time()
+        self.history = {}  # pool name -> [(time, updatedMachineCount)], oldest first
+        self.targets = {}
+        self.pools = {}
+
+    def update(self, pools):
+        """Record the current state of *pools*; return True when any machine count changed."""
+        now = time.time()
+        changed = False
+        for pool in pools:
+            name = pool["metadata"]["name"]
+            status = pool.get("status", {})
+            counts = {count: status.get(count, 0) for count in MACHINE_COUNTS}
+            target = (pool.get("spec", {}).get("configuration") or {}).get("name")
+            history = self.history.get(name)
+            if not history or counts["updatedMachineCount"] < history[-1][1] or target != self.targets.get(name):
+                history = self.history[name] = [(now, counts["updatedMachineCount"])]
+            elif counts["updatedMachineCount"] > history[-1][1]:
+                history.append((now, counts["updatedMachineCount"]))
+                del history[:-(self.WINDOW + 1)]
+            self.targets[name] = target
+            previous = self.pools.get(name, {})
+            changed |= any(previous.get(count) != value for count, value in counts.items())
+            self.pools[name] = dict(counts, configuration=target, paused=bool(pool.get("spec", {}).get("paused")), converged=not pool_mismatches(pool))
+        return changed
+
+    def estimate(self, name):
+        """Return ``(seconds_per_node, eta_seconds)`` of a pool; either is None while there is nothing to go by."""
+        pool = self.pools[name]
+        remaining = pool["machineCount"] - pool["updatedMachineCount"]
+        history = self.history[name]
+        since, updated = history[0]
+        done = pool["updatedMachineCount"] - updated
+        # A finished pool keeps the pace it had up to its last transition.
+        seconds_per_node = ((history[-1][0] if remaining <= 0 else time.time()) - since) / done if done > 0 else None
+        if remaining <= 0:
+            return seconds_per_node, 0
+        if seconds_per_node is None or pool["paused"]:
+            return seconds_per_node, None
+        return seconds_per_node, remaining * seconds_per_node
+
+    def report(self):
+        """Return the progress of every pool and the overall ETA, the time until the slowest pool is done."""
+        pools = {}
+        etas = []
+        for name in sorted(self.pools):
+            seconds_per_node, eta = self.estimate(name)
+            pools[name] = dict(
+                self.pools[name],
+                seconds_per_node=None if seconds_per_node is None else round(seconds_per_node, 1),
+                eta_seconds=None if eta is None else round(eta),
+            )
+            etas.append(eta)
+        eta = None if not etas or None in etas else max(etas)
+        now = time.time()
+        return {
+            "updated_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(now)),
+            "elapsed_seconds": round(now - self.started),
+            "eta_seconds": None if eta is None else round(eta),
+            "eta": None if eta is None else time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(now + eta)),
+            "pools": pools,
+        }
+
+    def summary(self, report):
+        """Return a one-line summary of *report*."""
+        parts = []
+        for name, pool in report["pools"].items():
+            total = pool["machineCount"]
+            part = (
+                f"{name}: {pool['updatedMachineCount']}/{total} updated, {pool['readyMachineCount']}/{total} ready, "
+                f"{pool['unavailableMachineCount']} unavailable"
+            )
+            if pool["degradedMachineCount"]:
+                part += f", {pool['degradedMachineCount']} degraded"
+            if pool["paused"]:
+                part += ", paused"
+            if pool["seconds_per_node"] is not None:
+                part += f", {format_duration(pool['seconds_per_node'])}/node"
+            if pool["eta_seconds"] and pool["seconds_per_node"] is not None:
+                part += f", ETA {format_duration(pool['eta_seconds'])}"
+            parts.append(part)
+        eta = "unknown" if report["eta_seconds"] is None else f"{format_duration(report['eta_seconds'])} ({report['eta']})"
+        return f"MCO rollout after {format_duration(report['elapsed_seconds'])}: {'; '.join(parts)}. ETA {eta}."
+
+
+def wait_for_mco_completion(module, timeout, stall_timeout=0, status_file=None, progress_interval=60):
+    """Wait until MCO conditions are satisfied; return ``(done, stalled, details, progress)``.
+
+    Gives up early, with *stalled* True, once no pool's machine counts, rendered config or conditions have changed
+    for *stall_timeout* seconds.  *details* explains which pools are not converged and why.  While waiting, the
+    rollout progress (see ``MCOProgress``) is written to *status_file* whenever a machine count changes and
+    reported as a warning at most every *progress_interval* seconds; *progress* is its last report.
+    """
+    module.warn("Checking MCO status...")
+    client = get_client(module)
+    stall = StallDetector(stall_timeout)
+    progress = MCOProgress()
+    reported = {"at": 0, "file_error": False}
+
+    def track(pools):
+        changed = progress.update(pools)
+        report = progress.report()
+        due = time.time() - reported["at"] >= progress_interval
+        if (changed or due) and status_file:
+            error = write_json(status_file, report)
+            if error and not reported["file_error"]:
+                module.warn(f"Could not write the MCO progress: {error}")
+                reported["file_error"] = True
+        if due:
+            module.warn(progress.summary(report))
+            reported["at"] = time.time()
+        return report
+
+    def stalled(pools):
+        track(pools)
+        if stall.observe({pool["metadata"]["name"]: pool_progress(pool) for pool in pools}):
+            return f"No MachineConfigPool made progress in {stall_timeout}s."
+        return None
+
+    pools, error = client.wait_for(
+        "machineconfigpools", all_pools_converged, timeout, resync_seconds=min(stall.resync_seconds(), max(1, progress_interval)), stop=stalled
+    )
+    reported["at"] = 0  # Always report and record the final state
+    report = track(pools)
+
+    if not error:
+        module.warn("✅ MCO is in the desired state.")
+        return True, False, "", report
+
+    return False, stall.stalled(), f"{error} {'; '.join(describe_pools(module, pools))}", report
+
+
+def run_wait_for_mco_completion(module):
+    timeout = module.params["timeout"]
+    stall_timeout = module.params["stall_timeout"]
+    status_file = module.params["status_file"] or default_cache_path("mco-progress.json")
+
+    try:
+        done, stalled, details, progress = wait_for_mco_completion(module, timeout, stall_timeout, status_file, module.params["progress_interval"])
+        if done:
+            module.exit_json(changed=False, msg="✅ MCO finished successfully.", stalled=False, progress=progress, status_file=status_file)
+        if stalled:
+            module.fail_json(msg=f"❌ MCO stopped making progress. {details}", stalled=True, progress=progress, status_file=status_file)
+        module.fail_json(msg=f"❌ Timeout reached while waiting for MCO to finish. {details}", stalled=False, progress=progress, status_file=status_file)
+    except Exception as ex:
+        module.fail_json(msg=f"Unexpected error: {str(ex)}")
+
+
+# ─────────────────────────────────────────────────────────────
+# verify_machine_config
+# ─────────────────────────────────────────────────────────────
+MCO_ANNOTATION = "machineconfiguration.openshift.io/"
+
+
+def node_config_state(node):
+    """Return the hostname and MachineConfig annotations of a node."""
+    metadata = node.get("metadata", {})
+    annotations = metadata.get("annotations") or {}
+    return {
+        "hostname": (metadata.get("labels") or {}).get("kubernetes.io/hostname", metadata.get("name")),
+        "currentConfig": annotations.get(MCO_ANNOTATION + "currentConfig", ""),
+        "desiredConfig": annotations.get(MCO_ANNOTATION + "desiredConfig", ""),
+        "state": annotations.get(MCO_ANNOTATION + "state", ""),
+    }
+
+
+def is_node_settled(node):
+    """Check whether the machine config daemon has finished applying the desired config on a node."""
+    return node["state"] == "Done" and node["currentConfig"] and node["currentConfig"] == node["desiredConfig"]
+
+
+def get_machine_config_status(module, timeout):
+    """Watch the nodes until every node reports the desired config as Done, or the timeout expires."""
+    client = get_client(module)
+    listed = []
+
+    def all_settled(nodes):
+        listed.append(True)
+        return all(is_node_settled(node_config_state(n)) for n in nodes)
+
+    nodes, error = client.wait_for("nodes", all_settled, timeout)
+    if not listed:
+        module.fail_json(msg=f"Failed to list nodes: {error}")
+    return [node_config_state(n) for n in nodes]
+
+
+def get_exec_start_lines(machine_config):
+    """Return every ExecStart line of the systemd units in a MachineConfig."""
+    lines = []
+    for unit in machine_config.get("spec", {}).get("config", {}).get("systemd", {}).get("units") or []:
+        for text in [unit.get("contents") or ""] + [d.get("contents") or "" for d in unit.get("dropins") or []]:
+            lines.extend(line.strip() for line in text.splitlines() if "ExecStart" in line)
+    return "\n".join(lines)
+
+
+def verify_machine_config(module, config_name, network_type, timeout):
+    """Check whether a rendered MachineConfig runs configure-ovs.sh for the network type; return ``(verified, error)``."""
+    client = get_client(module)
+    machine_config, error = read_with_backoff(module, lambda: client.get("machineconfigs", config_name), timeout)
+    if error:
+        return False, error
+    return f"ExecStart=/usr/local/bin/configure-ovs.sh {network_type}" in get_exec_start_lines(machine_config), None
+
+
+def verify_rendered_configs(module, config_names, network_type, timeout, cache):
+    """Verify each distinct rendered config once, reusing verdicts cached by config name and network type."""
+    results = {}
+    deadline = time.time() + timeout
+    for name in sorted(config_names):
+        key = f"{name}/{network_type}"
+        verified = cache.get(key) if cache else None
+        if verified is not None:
+            results[name] = {"name": name, "verified": verified, "cached": True}
+            continue
+        # Rendered MachineConfigs are immutable by name, so a successful read is a final verdict.
+        verified, error = verify_machine_config(module, name, network_type, max(1, deadline - time.time()))
+        results[name] = {"name": name, "verified": verified, "cached": False}
+        if error:
+            results[name]["error"] = error
+        elif cache:
+            cache.set(key, verified)
+    return results
+
+
+def run_verify_machine_config(module):
+    timeout = module.params["timeout"]
+    network_type = module.params["network_type"]
+    cache = None
+    if module.params["cache"]:
+        cache = JsonFileCache(module.params["cache_file"] or default_cache_path("machineconfig_verdicts.json"))
+    try:
+        deadline = time.time() + timeout
+        nodes = get_machine_config_status(module, timeout)
+        configs = verify_rendered_configs(
+            module, {node["currentConfig"] for node in nodes if node["currentConfig"]}, network_type, max(1, deadline - time.time()), cache
+        )
+        if cache:
+            error = cache.save()
+            if error:
+                module.warn(error)
+        issues = []
+        for node in nodes:
+            if node["state"] != "Done":
+                issues.append(f"Node {node['hostname']} state is {node['state']}, not Done.")
+            if node["currentConfig"] != node["desiredConfig"]:
+                issues.append(f"Node {node['hostname']} currentConfig ({node['currentConfig']}) does not match desiredConfig ({node['desiredConfig']}).")
+            config = configs.get(node["currentConfig"])
+            if config and config.get("error"):
+                issues.append(f"Node {node['hostname']} configuration {node['currentConfig']} could not be read: {config['error']}")
+            elif not config or not config["verified"]:
+                issues.append(f"Node {node['hostname']} configuration {node['currentConfig']} does not contain expected ExecStart.")
+        machine_configs = [configs[name] for name in sorted(configs)]
+        if issues:
+            module.fail_json(msg="Issues detected with machine configuration.", issues=issues, machine_configs=machine_configs)
+
+        module.exit_json(changed=False, msg="All machine configurations are correct.", issues=[], machine_configs=machine_configs)
+    except Exception as e:
+        module.fail_json(msg=str(e))
+
+
+# ─────────────────────────────────────────────────────────────
+# trigger_network_type
+# ─────────────────────────────────────────────────────────────
+# Reusable deny-list of networks that must not overlap
+FORBIDDEN_NETS = [
+    "100.64.0.0/16",
+    "169.254.169.0/29",
+    "100.88.0.0/16",
+    "fd98::/64",
+    "fd69::/125",
+    "fd97::/64",
+]
+
+
+def _ensure_no_overlap(cidr):
+    """Validate that *cidr* does not overlap any forbidden network."""
+    conflicts = find_overlaps(FORBIDDEN_NETS, [(cidr, "cidr")])
+    if conflicts:
+        raise ValueError(
+            f"The provided migration_cidr ({cidr}) overlaps with "
+            f"reserved network {conflicts[0]['forbidden']}."
+        )
+
+
+def _plan_cluster_network(cidr, prefix, node_count, node_headroom, existing_networks):
+    """Compute the per-node subnet capacity of *cidr*/*prefix*; return ``(plan, error)``."""
+    network = ipaddress.ip_network(cidr, strict=False)
+    plan = {"cidr": str(network), "host_prefix": prefix, "nodes": node_count, "node_headroom": node_headroom}
+    if not network.prefixlen <= prefix <= network.max_prefixlen - 2:
+        return plan, f"prefix {prefix} must be between the CIDR prefix length ({network.prefixlen}) and {network.max_prefixlen - 2} for {network}."
+    plan["subnets"] = 2 ** (prefix - network.prefixlen)
+    plan["addresses_per_node"] = 2 ** (network.max_prefixlen - prefix)
+    plan["free_subnets"] = plan["subnets"] - node_count
+    plan["overlaps"] = find_overlaps([network], existing_networks)
+    if plan["overlaps"]:
+        used = ", ".join(f"{o['source']} {o['used']}" for o in plan["overlaps"])
+        return plan, f"The provided migration_cidr ({cidr}) overlaps with the cluster's {used}."
+    if plan["subnets"] < node_count + node_headroom:
+        return plan, (
+            f"{network} with hostPrefix {prefix} provides {plan['subnets']} node subnets, but the cluster has {node_count} nodes "
+            f"and {node_headroom} more are required as headroom; use a larger CIDR or a longer prefix."
+        )
+    return plan, None
+
+
+def _get_cluster_state(module, client):
+    """Return the current node count and the service and machine networks as ``(cidr, source)`` pairs."""
+    nodes, error = call_with_retries(module, lambda: client.list("nodes"))
+    if error:
+        module.fail_json(msg=f"Failed to list nodes: {error}")
+    network_config, error = call_with_retries(module, lambda: client.get("network.config", "cluster"))
+    if error:
+        module.fail_json(msg=f"Failed to retrieve network config: {error}")
+    existing = [(cidr, "serviceNetwork") for cidr in network_config.get("spec", {}).get("serviceNetwork") or []]
+    for network in network_config.get("status", {}).get("networking", {}).get("machineNetwork") or []:
+        if network.get("cidr"):
+            existing.append((network["cidr"], "machineNetwork"))
+    return len(nodes.get("items", [])), existing
+
+
+def _build_patch(cidr, prefix, network_type):
+    """
+    Render the merge patch sent to the API server.
+
+    NOTE: *prefix* arrives from Ansible already as an int (see argument_spec),
+    so we no longer cast it with int().
+    """
+    if cidr and prefix is not None:
+        return {
+            "spec": {
+                "clusterNetwork": [{
+                    "cidr": cidr,
+                    "hostPrefix": prefix,   # already int
+                }],
+                "networkType": network_type,
+            }
+        }
+    return {"spec": {"networkType": network_type}}
+
+
+def _check_cluster_network(module, client, cidr, prefix, node_headroom):
+    """Validate *cidr* and plan its per-node subnets against the cluster; fail the module or return the plan."""
+    try:
+        ipaddress.ip_network(cidr, strict=False)  # syntax check
+    except ValueError as exc:
+        module.fail_json(msg=f"Invalid CIDR '{cidr}': {exc}")
+    try:
+        _ensure_no_overlap(cidr)
+    except ValueError as exc:
+        module.fail_json(msg=str(exc))
+    node_count, existing_networks = _get_cluster_state(module, client)
+    plan, error = _plan_cluster_network(cidr, prefix, node_count, node_headroom, existing_networks)
+    if error:
+        module.fail_json(msg=error, plan=plan)
+    return plan
+
+
+def run_plan_cluster_network(module):
+    """Check that the new cluster network fits the cluster before the migration patches anything."""
+    cidr = module.params["cidr"]
+    prefix = module.params["prefix"]
+    try:
+        plan = _check_cluster_network(module, get_client(module), cidr, prefix, module.params["node_headroom"])
+        module.exit_json(
+            changed=False,
+            msg=f"{plan['cidr']} with hostPrefix {prefix} provides {plan['subnets']} node subnets for {plan['nodes']} nodes.",
+            plan=plan,
+        )
+    except Exception as e:
+        module.fail_json(msg=str(e))
+
+
+def run_trigger_network_type(module):
+    network_type = module.params["network_type"]
+    cidr = module.params["cidr"]
+    prefix = module.params["prefix"]
+
+    try:
+        client = get_client(module)
+        result = {}
+        if cidr:
+            result["plan"] = _check_cluster_network(module, client, cidr, prefix, module.params["node_headroom"])
+        patch = _build_patch(cidr, prefix, network_type)
+        _unused, error = call_with_retries(module, lambda: client.patch("network.config", "cluster", patch))
+        if error:
+            module.fail_json(msg=f"Failed to patch network.config.openshift.io/cluster: {error}", **result)
+        module.exit_json(
+            changed=True, msg=f"Successfully triggered {network_type} deployment.", output="network.config.openshift.io/cluster patched", **result
+        )
+    except Exception as e:
+        module.fail_json(msg=str(e))
+
+
+# ─────────────────────────────────────────────────────────────
+# wait_for_network_co
+# ─────────────────────────────────────────────────────────────
+NETWORK_CO_CONDITIONS = ("Available", "Progressing", "Degraded")
+
+
+def wait_for_network_co(module, timeout, stall_timeout=0):
+    """Wait until the Network CO enters the PROGRESSING=True condition; return ``(done, stalled, message)``.
+
+    Gives up early once its conditions have not changed for *stall_timeout* seconds.
+    """
+    client = get_client(module)
+    stall = StallDetector(stall_timeout)
+    conditions = []
+    for _attempt in poll(timeout, max_interval=10):
+        cluster_operator, error = client.get("clusteroperators", "network")
+        if error:
+            continue
+        if condition_status(cluster_operator, "Progressing") == "True":
+            return True, False, "Network Cluster Operator is in PROGRESSING=True state."
+        conditions = [describe_condition(cluster_operator, condition_type) for condition_type in NETWORK_CO_CONDITIONS]
+        if stall.observe(conditions):
+            return False, True, f"Network Cluster Operator made no progress towards PROGRESSING=True in {stall_timeout}s: {', '.join(conditions)}."
+    details = f": {', '.join(conditions)}" if conditions else ""
+    return False, False, f"Timeout waiting for Network Cluster Operator to reach PROGRESSING=True{details}."
+
+
+def run_wait_for_network_co(module):
+    timeout = module.params["timeout"]
+    stall_timeout = module.params["stall_timeout"]
+
+    done, stalled, result_message = wait_for_network_co(module, timeout, stall_timeout)
+    if not done:
+        module.fail_json(msg=result_message, stalled=stalled)
+    else:
+        module.exit_json(changed=False, msg=result_message, stalled=False)
+
+
+# ─────────────────────────────────────────────────────────────
+# wait_multus_restart
+# ─────────────────────────────────────────────────────────────
+# Kind, namespace and name of the workloads that run the pod network besides Multus, per network type.
+DATAPLANE_WORKLOADS = {
+    "OVNKubernetes": (
+        ("daemonsets", "openshift-ovn-kubernetes", "ovnkube-node"),
+        ("deployments", "openshift-ovn-kubernetes", "ovnkube-control-plane"),
+    ),
+    "OpenShiftSDN": (
+        ("daemonsets", "openshift-sdn", "sdn"),
+        ("daemonsets", "openshift-sdn", "sdn-controller"),
+    ),
+}
+MULTUS_WORKLOAD = ("daemonsets", "openshift-multus", "multus")
+# Before OpenShift 4.14 the OVN-Kubernetes control plane ran as the ovnkube-master DaemonSet.
+LEGACY_OVN_CONTROL_PLANE = ("daemonsets", "openshift-ovn-kubernetes", "ovnkube-master")
+
+
+def tracked_workloads(module, client, network_type):
+    """Return the ``(kind, namespace, name)`` of the workloads to wait for: Multus plus the dataplane of *network_type*."""
+    workloads = [MULTUS_WORKLOAD]
+    if not network_type:
+        return workloads
+    workloads.extend(DATAPLANE_WORKLOADS[network_type])
+    if network_type == "OVNKubernetes":
+        version, error = client.cached_get("clusterversions", "version", 300)
+        history = (version or {}).get("status", {}).get("history") or [{}]
+        try:
+            minor = int(history[0].get("version", "").split(".")[1])
+        except (IndexError, ValueError):
+            module.warn(f"Could not read the OpenShift version ({error or 'no version in the history'}); assuming 4.14 or later.")
+            minor = 14
+        if minor < 14:
+            workloads[-1] = LEGACY_OVN_CONTROL_PLANE
+    return workloads
+
+
+def rollout_status(kind, obj):
+    """Summarise the rollout of a DaemonSet or Deployment; ``obj`` None means it does not exist (yet)."""
+    if obj is None:
+        return {"exists": False, "rolled_out": False}
+    metadata, status = obj.get("metadata", {}), obj.get("status", {})
+    generation, observed = metadata.get("generation"), status.get("observedGeneration")
+    if kind == "daemonsets":
+        desired = status.get("desiredNumberScheduled", 0)
+        updated, available = status.get("updatedNumberScheduled", 0), status.get("numberAvailable", 0)
+        stale = 0
+    else:
+        desired = obj.get("spec", {}).get("replicas", 1)
+        updated, available = status.get("updatedReplicas", 0), status.get("availableReplicas", 0)
+        stale = status.get("replicas", 0) - updated
+    rolled_out = (generation is None or (observed or 0) >= generation) and updated == desired and available == desired and stale <= 0
+    return {
+        "exists": True,
+        "generation": generation,
+        "observed_generation": observed,
+        "desired": desired,
+        "updated": updated,
+        "available": available,
+        "rolled_out": rolled_out,
+    }
+
+
+def wait_for_workloads(module, workloads, timeout, stall=None):
+    """Watch *workloads* until every one of them has rolled out.
+
+    Returns ``(status, objects, error)``: the rollout status by ``namespace/name``, the last seen object by
+    ``(namespace, name)`` (None while it does not exist) and the timeout error, if any.
+
+    All DaemonSets are tracked with one watch, and the Deployments, if any, with a second one once they are done.
+    After a timeout the workloads not reached yet are read once, so that the status reports all of them.
+    With a *stall* detector the wait also ends, with an error, once the rollout counts have not changed for its window.
+    """
+    client = get_client(module)
+    stall = stall or StallDetector(0)
+    deadline = time.time() + timeout
+    status = {f"{namespace}/{name}": {"kind": kind, "exists": False, "rolled_out": False} for kind, namespace, name in workloads}
+    objects = {}
+    timeout_error = None
+
+    def stalled(_items):
+        if stall.observe(status):
+            return f"No rollout progress in {stall.window}s."
+        return None
+
+    for kind in ("daemonsets", "deployments"):
+        wanted = {(namespace, name) for workload_kind, namespace, name in workloads if workload_kind == kind}
+        if not wanted:
+            continue
+        namespaces = {namespace for namespace, _name in wanted}
+        namespace = namespaces.pop() if len(namespaces) == 1 else None
+
+        def converged(items, kind=kind, wanted=wanted):
+            seen = {(item["metadata"].get("namespace"), item["metadata"]["name"]): item for item in items}
+            for key in wanted:
+                objects[key] = seen.get(key)
+                status["/".join(key)] = dict(rollout_status(kind, seen.get(key)), kind=kind)
+            return all(status["/".join(key)]["rolled_out"] for key in wanted)
+
+        if timeout_error:
+            listing, error = client.list(kind, namespace=namespace)
+            if not error:
+                converged(listing.get("items", []))
+            continue
+        _items, timeout_error = client.wait_for(
+            kind, converged, max(1, deadline - time.time()), namespace=namespace, resync_seconds=stall.resync_seconds(), stop=stalled
+        )
+    return status, objects, timeout_error
+
+
+def pod_ready(pod):
+    return condition_status(pod, "Ready") == "True"
+
+
+def lagging_nodes(module, objects, status):
+    """Return ``{"namespace/name": [node, ...]}`` with the nodes whose pod of an unfinished workload is not updated or not ready."""
+    client = get_client(module)
+    lagging = {}
+    for (namespace, name), obj in objects.items():
+        key = f"{namespace}/{name}"
+        if obj is None or status[key]["rolled_out"]:
+            continue
+        labels = obj.get("spec", {}).get("selector", {}).get("matchLabels") or {}
+        if not labels:
+            continue
+        pods, error = client.list("pods", namespace=namespace, label_selector=",".join(f"{k}={v}" for k, v in sorted(labels.items())))
+        if error:
+            module.warn(f"Could not list the pods of {key}: {error}")
+            continue
+        generation = str(obj.get("metadata", {}).get("generation"))
+        nodes = set()
+        for pod in pods.get("items", []):
+            template_generation = (pod["metadata"].get("labels") or {}).get("pod-template-generation")
+            outdated = status[key]["kind"] == "daemonsets" and template_generation not in (None, generation)
+            if outdated or not pod_ready(pod):
+                nodes.add(pod.get("spec", {}).get("nodeName") or pod["metadata"]["name"])
+        if nodes:
+            lagging[key] = sorted(nodes)
+    return lagging
+
+
+def run_wait_multus_restart(module):
+    timeout = module.params["timeout"]
+    network_type = module.params["network_type"]
+    stall = StallDetector(module.params["stall_timeout"])
+
+    try:
+        workloads = tracked_workloads(module, get_client(module), network_type)
+        status, objects, error = wait_for_workloads(module, workloads, timeout, stall)
+        if not error:
+            module.exit_json(changed=False, msg="Multus pods restarted successfully.", workloads=status, lagging_nodes={}, stalled=False)
+        pending = {key: value for key, value in status.items() if not value["rolled_out"]}
+        missing = sorted(key for key, value in pending.items() if not value["exists"])
+        lagging = lagging_nodes(module, objects, status)
+        details = [f"{key} does not exist" for key in missing]
+        for key, value in sorted(pending.items()):
+            if not value["exists"]:
+                continue
+            detail = f"{key}: {value['updated']}/{value['desired']} updated, {value['available']}/{value['desired']} available"
+            nodes = lagging.get(key, [])
+            if nodes:
+                detail += f", not ready or outdated on {', '.join(nodes[:10])}{f' and {len(nodes) - 10} more' if len(nodes) > 10 else ''}"
+            details.append(detail)
+        if stall.stalled():
+            reason = f"Multus pods stopped making progress: no rollout changed in {stall.window}s."
+        else:
+            reason = "Timeout reached while waiting for Multus pods to restart."
+        module.fail_json(
+            msg=f"{reason} {'; '.join(details)}".rstrip(),
+            workloads=status,
+            lagging_nodes=lagging,
+            stalled=stall.stalled(),
+        )
+    except Exception as ex:
+        module.fail_json(msg=str(ex))
+
+
+STEPS = {
+    "clean_migration_field": run_clean_migration_field,
+    "delete_primary_nncp": run_delete_primary_nncp,
+    "change_network_type": run_change_network_type,
+    "get_ocp_version": run_get_ocp_version,
+    "disable_automatic_migration": run_disable_automatic_migration,
+    "configure_network_settings": run_configure_network_settings,
+    "wait_for_mco": run_wait_for_mco,
+    "wait_for_mco_completion": run_wait_for_mco_completion,
+    "verify_machine_config": run_verify_machine_config,
+    "plan_cluster_network": run_plan_cluster_network,
+    "trigger_network_type": run_trigger_network_type,
+    "wait_for_network_co": run_wait_for_network_co,
+    "wait_multus_restart": run_wait_multus_restart,
+}
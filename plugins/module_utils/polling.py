@@ -0,0 +1,123 @@
+# Copyright (c) 2025, Red Hat
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""
+Shared schedule for the collection's polling loops.
+
+A loop polls again quickly at first, so short waits finish soon after the
+cluster gets there, and then backs off exponentially up to a cap, so long
+waits (MCO rollouts, master reboots, the OVN-Kubernetes rollout) do not keep
+hitting the API server while it is busiest.  Every delay is shortened by a
+random jitter so that concurrent pollers spread out, and no delay runs past
+the loop's deadline.
+
+A loop can also give up before its deadline when the state it polls stops
+moving: a StallDetector is fed the loop's progress signals (counts,
+condition reasons) and reports a stall once they have not changed for a
+configurable window.
+"""
+
+import json
+import random
+import time
+
+DEFAULT_INITIAL = 1.0
+DEFAULT_MAX_INTERVAL = 30.0
+
+
+class PollSchedule:
+    """Delays between the attempts of a polling loop that must finish within ``timeout`` seconds.
+
+    The first delay is ``initial`` seconds and every following one ``factor`` times longer, up to
+    ``max_interval``.  Each delay is reduced by up to ``jitter`` (a fraction) at random.
+    """
+
+    def __init__(self, timeout, initial=DEFAULT_INITIAL, max_interval=DEFAULT_MAX_INTERVAL, factor=2.0, jitter=0.2):
+        self.deadline = time.monotonic() + timeout
+        self.initial = min(initial, max_interval)
+        self.max_interval = max_interval
+        self.factor = factor
+        self.jitter = jitter
+        self.interval = self.initial
+        self.attempts = 0
+
+    def remaining(self):
+        """Return the seconds left until the deadline, never negative."""
+        return max(0.0, self.deadline - time.monotonic())
+
+    def expired(self):
+        return self.remaining() <= 0
+
+    def next_delay(self):
+        """Return the delay before the next attempt and grow the interval."""
+        delay = self.interval * random.uniform(1 - self.jitter, 1)
+        self.interval = min(self.interval * self.factor, self.max_interval)
+        return min(delay, self.remaining())
+
+    def reset(self):
+        """Go back to the initial cadence, for example after the polled state made progress."""
+        self.interval = self.initial
+
+    def wait(self):
+        """Sleep until the next attempt; return False without sleeping once the deadline has passed."""
+        if self.expired():
+            return False
+        time.sleep(self.next_delay())
+        return True
+
+
+def poll(timeout, initial=DEFAULT_INITIAL, max_interval=DEFAULT_MAX_INTERVAL, factor=2.0, jitter=0.2):
+    """Yield the attempt number (from 1) of a polling loop until ``timeout`` seconds have passed.
+
+    The first attempt is made at once and the last one at the deadline; the caller breaks out of (or exits the
+    module from) the loop once the polled state is reached, and falling off the end of the loop means it timed out.
+
+        for _attempt in poll(timeout):
+            obj, error = client.get(...)
+            if not error and ready(obj):
+                return obj
+        return None
+    """
+    schedule = PollSchedule(timeout, initial, max_interval, factor, jitter)
+    while True:
+        schedule.attempts += 1
+        yield schedule.attempts
+        if not schedule.wait():
+            return
+
+
+class StallDetector:
+    """Tell when the progress signals of a wait have not changed for ``window`` seconds.
+
+    A ``window`` of 0 (or None) disables the detection: ``stalled()`` is then always False.
+    """
+
+    def __init__(self, window):
+        self.window = window or 0
+        self.signals = None
+        self.changed_at = time.monotonic()
+
+    def observe(self, signals):
+        """Record the current progress signals (any JSON-serialisable value); return ``stalled()``."""
+        snapshot = json.dumps(signals, sort_keys=True, default=str)
+        if snapshot != self.signals:
+            self.signals = snapshot
+            self.changed_at = time.monotonic()
+        return self.stalled()
+
+    def reset(self):
+        """Count the current moment as progress, for example when the wait passed an intermediate check."""
+        self.changed_at = time.monotonic()
+
+    def idle(self):
+        """Return the seconds since the signals last changed."""
+        return time.monotonic() - self.changed_at
+
+    def stalled(self):
+        return bool(self.window) and self.idle() >= self.window
+
+    def resync_seconds(self, default=300):
+        """Return how often a watch must re-check a wait so that a stall is noticed within a fraction of the window."""
+        if not self.window:
+            return default
+        return max(1, min(default, int(self.window / 4)))
@@ -7,6 +7,8 @@ module: check_cidr_ranges
 short_description: Checks for conflicting range with the provided list of range.
 version_added: "1.0.0"
 author: Miheer Salunke (@miheer)
+extends_documentation_fragment:
+  - network.offline_migration_sdn_to_ovnk.snapshot_cache
 description:
   - Checks for conflicting range with the provided list of range.
 options:
@@ -16,7 +18,7 @@ options:
     type: list
     elements: str
   timeout:
-    description: Desired timeout
+    description: Maximum time in seconds to keep retrying a failed read of the network config.
     type: int
     required: false
     default: 120
@@ -32,65 +34,57 @@ changed:
   description: Whether the CR was modified.
   type: bool
   returned: always
+used_cidrs:
+  description: CIDRs in use by the cluster, machine and service networks.
+  type: list
+  elements: str
+  returned: always
+conflicting_cidrs:
+  description: Entries of O(conflicting_ranges) that overlap a range in use, each listed once.
+  type: list
+  elements: str
+  returned: on failure
+conflicts:
+  description: Every overlapping pair, with the network config field the used range comes from.
+  type: list
+  elements: dict
+  returned: always
+  sample: [{"forbidden": "100.64.0.0/16", "used": "100.64.0.0/14", "source": "clusterNetwork"}]
 """
 
 from ansible.module_utils.basic import AnsibleModule
-import ipaddress
-import json
-import time
-
-
-def run_command(module, command):
-    """Run a shell command safely using module.run_command and return output or raise an error."""
-    rc, stdout, stderr = module.run_command(command)
-
-    if rc == 0:
-        return stdout.strip(), None  # Success
-
-    return None, f"Command '{' '.join(command)}' failed: {stderr.strip()}"
+from ansible_collections.network.offline_migration_sdn_to_ovnk.plugins.module_utils.kube_client import get_client, read_with_backoff
+from ansible_collections.network.offline_migration_sdn_to_ovnk.plugins.module_utils.cidr import find_overlaps
 
 
 def get_used_cidrs(module, timeout):
-    """Retrieve all CIDR ranges currently in use on the cluster."""
-    command = "oc get network.config/cluster -o json"
-    start_time = time.time()
-    while time.time() - start_time < timeout:
-        try:
-            output, error = run_command(module, command)
-            if error:
-                module.warn(f"Retrying as got an error: {error}")
-            time.sleep(3)
-            if not error:
-                break
-        except Exception as ex:
-            module.fail_json(msg=str(ex))
+    """Retrieve all CIDR ranges currently in use on the cluster as ``(cidr, source field)`` pairs."""
+    client = get_client(module)
+    network_config, error = read_with_backoff(module, lambda: client.cached_get("network.config", "cluster", module.params["snapshot_ttl"]), timeout)
+    if error:
+        module.fail_json(msg=f"Failed to retrieve network config: {error}")
     networks = []
-    if output:
-        network_config = json.loads(output)
+    if network_config:
         # Check clusterNetwork
         cluster_networks = network_config.get("spec", {}).get("clusterNetwork", [])
         for network in cluster_networks:
-            networks.append(network.get("cidr"))
+            networks.append((network.get("cidr"), "clusterNetwork"))
         # Check serviceNetwork
         service_networks = network_config.get("spec", {}).get("serviceNetwork", [])
-        networks.extend(service_networks)
+        networks.extend((network, "serviceNetwork") for network in service_networks)
         # Check machineNetwork
         machine_networks = network_config.get("status", {}).get("networking", {}).get("machineNetwork", [])
         for network in machine_networks:
-            networks.append(network.get("cidr"))
-    return networks
+            networks.append((network.get("cidr"), "machineNetwork"))
+    return [(cidr, source) for cidr, source in networks if cidr]
 
 
 def check_cidr_ranges(conflicting_ranges, used_ranges):
-    """Check if any conflicting CIDRs are in use."""
-    conflicting_cidrs = []
-    for conflicting_range in conflicting_ranges:
-        conflict_network = ipaddress.ip_network(conflicting_range)
-        for used_range in used_ranges:
-            used_network = ipaddress.ip_network(used_range)
-            if conflict_network.overlaps(used_network):
-                conflicting_cidrs.append(conflicting_range)
-    return conflicting_cidrs
+    """Return the conflicting CIDRs in use, each once and in input order, and every overlapping pair."""
+    conflicts = find_overlaps(conflicting_ranges, used_ranges)
+    found = {conflict["forbidden"] for conflict in conflicts}
+    conflicting_cidrs = [cidr for cidr in dict.fromkeys(conflicting_ranges) if cidr in found]
+    return conflicting_cidrs, conflicts
 
 
 def main():
@@ -98,6 +92,7 @@ def main():
         argument_spec={
             "conflicting_ranges": {"type": "list", "elements": "str", "required": True},
             "timeout": {"type": "int", "default": 120},  # Timeout in seconds
+            "snapshot_ttl": {"type": "int", "default": 30},
         },
         supports_check_mode=True,
     )
@@ -106,18 +101,24 @@ def main():
     timeout = module.params["timeout"]
 
     try:
-        used_cidrs = get_used_cidrs(module, timeout)
-        conflicting_cidrs = check_cidr_ranges(conflicting_ranges, used_cidrs)
+        used_networks = get_used_cidrs(module, timeout)
+        used_cidrs = [cidr for cidr, _source in used_networks]
+        try:
+            conflicting_cidrs, conflicts = check_cidr_ranges(conflicting_ranges, used_networks)
+        except ValueError as exc:
+            module.fail_json(msg=f"Invalid CIDR range: {exc}", used_cidrs=used_cidrs)
         if conflicting_cidrs:
             module.fail_json(
                 msg=f"Conflicting CIDR ranges found: {', '.join(conflicting_cidrs)}",
                 conflicting_cidrs=conflicting_cidrs,
+                conflicts=conflicts,
                 used_cidrs=used_cidrs,
             )
         else:
             module.exit_json(
                 changed=False,
                 msg="No conflicting CIDR ranges found.",
+                conflicts=[],
                 used_cidrs=used_cidrs,
             )
     except Exception as e:
@@ -25,6 +25,15 @@ options:
     type: int
     required: false
     default: 3
+  snapshot_ttl:
+    description:
+      - Seconds for which the Network config fetched by an earlier module of the same run may be reused from the
+        on-disk snapshot cache instead of being read from the API again.
+      - The migration status is written by the network operator, which does not drop the snapshot, so by default
+        the Network config is always read from the API.
+    type: int
+    required: false
+    default: 0
 """
 EXAMPLES = r"""
 - name: Check network migration status
@@ -42,25 +51,7 @@ changed:
 """
 
 from ansible.module_utils.basic import AnsibleModule
-import json
-import time
-
-
-def run_command_with_retries(module, command, retries=3, delay=3):
-    """Execute a shell command with retries on failure."""
-    for attempt in range(retries):
-        rc, stdout, stderr = module.run_command(command)
-
-        if rc == 0:
-            return stdout.strip(), None  # Success
-
-        if attempt < retries - 1:
-            module.warn(f"Retrying in {delay} seconds due to error: {stderr.strip()}")
-            time.sleep(delay)  # Wait before retrying
-        else:
-            return None, f"Command failed after {retries} attempts: {stderr.strip()}"
-
-    return None, "Unknown error"
+from ansible_collections.network.offline_migration_sdn_to_ovnk.plugins.module_utils.kube_client import call_with_retries, get_client
 
 
 def main():
@@ -68,32 +59,31 @@ def main():
         expected_network_type=dict(type="str", required=True),  # Expected value (e.g., "OpenShiftSDN")
         max_retries=dict(type="int", default=3),  # Number of retries
         delay=dict(type="int", default=3),  # Delay between retries
+        snapshot_ttl=dict(type="int", default=0),
     )
 
     module = AnsibleModule(argument_spec=module_args, supports_check_mode=True)
 
-    command = ["oc", "get", "Network.config", "cluster", "-o", "json"]
+    client = get_client(module)
     max_retries = module.params["max_retries"]
     delay = module.params["delay"]
+    snapshot_ttl = module.params["snapshot_ttl"]
 
-    stdout, error = run_command_with_retries(module, command, retries=max_retries, delay=delay)
+    network_config, error = call_with_retries(
+        module, lambda: client.cached_get("network.config", "cluster", snapshot_ttl), retries=max_retries, delay=delay
+    )
 
     if error:
         module.fail_json(msg=f"Failed to retrieve network config: {error}")
 
-    try:
-        network_config = json.loads(stdout)
-        network_type = network_config.get("status", {}).get("migration", {}).get("networkType", "")
-
-        if network_type == module.params["expected_network_type"]:
-            module.exit_json(changed=False, msg=f"✅ Network migration type is correctly set to '{network_type}'.", network_type=network_type)
-        else:
-            module.fail_json(
-                msg=f"❌ Network migration type is '{network_type}', expected '{module.params['expected_network_type']}'.", network_type=network_type
-            )
+    network_type = (network_config.get("status", {}).get("migration") or {}).get("networkType", "")
 
-    except json.JSONDecodeError:
-        module.fail_json(msg="❌ Failed to parse network config JSON output.")
+    if network_type == module.params["expected_network_type"]:
+        module.exit_json(changed=False, msg=f"✅ Network migration type is correctly set to '{network_type}'.", network_type=network_type)
+    else:
+        module.fail_json(
+            msg=f"❌ Network migration type is '{network_type}', expected '{module.params['expected_network_type']}'.", network_type=network_type
+        )
 
 
 if __name__ == "__main__":
@@ -8,11 +8,13 @@ module: check_network_policy_mode
 short_description: Checks if NetworkPolicy isolation mode has been set.
 version_added: "1.0.0"
 author: Miheer Salunke (@miheer)
+extends_documentation_fragment:
+  - network.offline_migration_sdn_to_ovnk.snapshot_cache
 description:
   - Checks if NetworkPolicy isolation mode has been set
 options:
   timeout:
-    description: Desired timeout
+    description: Maximum time in seconds to keep retrying a failed read of the network operator config.
     type: int
     required: false
     default: 120
@@ -30,39 +32,18 @@ changed:
 """
 
 from ansible.module_utils.basic import AnsibleModule
-import json
-import time
-
-
-def run_command(module, command):
-    """Run a shell command safely using module.run_command and return output or raise an error."""
-    rc, stdout, stderr = module.run_command(command)
-
-    if rc == 0:
-        return stdout.strip(), None  # Success
-
-    return None, f"Command '{' '.join(command)}' failed: {stderr.strip()}"
+from ansible_collections.network.offline_migration_sdn_to_ovnk.plugins.module_utils.kube_client import get_client, read_with_backoff
 
 
 def check_network_policy_mode(module, timeout):
     """Check if the cluster is set to use NetworkPolicy isolation mode."""
-    command = "oc get network.operator.openshift.io cluster -o json"
-
-    start_time = time.time()
-    while time.time() - start_time < timeout:
-        try:
-            output, error = run_command(module, command)
-            if error:
-                module.warn(f"Retrying as got an error: {error}")
-                time.sleep(3)
-            if not error:
-                break
-        except Exception as ex:
-            module.fail_json(msg=str(ex))
+    client = get_client(module)
+    network_config, error = read_with_backoff(module, lambda: client.cached_get("network.operator", "cluster", module.params["snapshot_ttl"]), timeout)
+    if error:
+        module.fail_json(msg=f"Failed to retrieve network operator config: {error}")
 
-    if output:
-        network_config = json.loads(output)
-        sdn_config = network_config.get("spec", {}).get("defaultNetwork", {}).get("openshiftSDNConfig", {})
+    if network_config:
+        sdn_config = network_config.get("spec", {}).get("defaultNetwork", {}).get("openshiftSDNConfig") or {}
         mode = sdn_config.get("mode", "unknown")
         return mode == "NetworkPolicy", mode
     return False, "unknown"
@@ -72,6 +53,7 @@ def main():
     module = AnsibleModule(
         argument_spec={
             "timeout": {"type": "int", "default": 120},
+            "snapshot_ttl": {"type": "int", "default": 30},
         },
         supports_check_mode=True,
     )
@@ -8,6 +8,8 @@ module: check_network_provider
 short_description: Check if the CNI network provider is expected one.
 version_added: "1.0.0"
 author: Miheer Salunke (@miheer)
+extends_documentation_fragment:
+  - network.offline_migration_sdn_to_ovnk.snapshot_cache
 description:
   - Check if the CNI network provider is expected one.
 options:
@@ -16,7 +18,7 @@ options:
     type: str
     required: true
   timeout:
-    description: Sets desired timeout
+    description: Maximum time in seconds to keep retrying a failed read of the network config.
     type: int
     default: 120
 """
@@ -34,34 +36,15 @@ changed:
 """
 
 from ansible.module_utils.basic import AnsibleModule
-import json
-import time
-
-
-def run_command(module, command):
-    """Run a shell command safely using module.run_command and return output or raise an error."""
-    rc, stdout, stderr = module.run_command(command)
-
-    if rc == 0:
-        return stdout.strip(), None  # Success
-
-    return None, f"Command '{' '.join(command)}' failed: {stderr.strip()}"
+from ansible_collections.network.offline_migration_sdn_to_ovnk.plugins.module_utils.kube_client import get_client, read_with_backoff
 
 
 def get_network_type(module, timeout):
     """Retrieve the current network type."""
-    command = "oc get network.config/cluster -o json"
-    start_time = time.time()
-    while time.time() - start_time < timeout:
-        try:
-            output, error = run_command(module, command)
-            if not error:
-                network_config = json.loads(output)
-            elif error:
-                module.warn(f"Retrying as got an error: {error}")
-            time.sleep(3)
-        except Exception as ex:
-            module.fail_json(msg=str(ex))
+    client = get_client(module)
+    network_config, error = read_with_backoff(module, lambda: client.cached_get("network.config", "cluster", module.params["snapshot_ttl"]), timeout)
+    if error:
+        module.fail_json(msg=f"Failed to retrieve network config: {error}")
     return network_config.get("status", {}).get("networkType", None)
 
 
@@ -70,6 +53,7 @@ def main():
         argument_spec={
             "expected_network_type": {"type": "str", "required": True},
             "timeout": {"type": "int", "default": 120},  # Timeout in seconds
+            "snapshot_ttl": {"type": "int", "default": 30},
         },
         supports_check_mode=True,
     )
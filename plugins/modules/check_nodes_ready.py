@@ -10,11 +10,19 @@ version_added: "1.0.0"
 author: Miheer Salunke (@miheer)
 description:
   - Check if all cluster nodes are in Ready state.
+  - Nodes are watched rather than re-listed. The module returns as soon as all nodes are Ready, or as soon as
+    the set of NotReady nodes has stayed the same for O(settle_window) seconds.
 options:
   timeout:
-    description: Timeout in seconds.
+    description: Maximum time to wait in seconds.
     type: int
     default: 120
+  settle_window:
+    description:
+      - Seconds the set of NotReady nodes must stay unchanged before the module reports it.
+      - Set to C(0) to report the state seen by the first successful list.
+    type: int
+    default: 30
 """
 EXAMPLES = r"""
 - name: Check if all cluster nodes are in Ready state
@@ -34,55 +42,66 @@ changed:
   description: Whether the CR was modified.
   type: bool
   returned: always
+nodes:
+  description: Ready condition status and its lastTransitionTime for every node.
+  type: list
+  elements: dict
+  returned: success
+  sample: [{"name": "worker-0", "status": "True", "last_transition_time": "2025-06-02T10:15:03Z"}]
+not_ready_nodes:
+  description: The entries of RV(nodes) whose Ready condition is not C(True).
+  type: list
+  elements: dict
+  returned: success
 """
 
 from ansible.module_utils.basic import AnsibleModule
-import json
+from ansible_collections.network.offline_migration_sdn_to_ovnk.plugins.module_utils.kube_client import get_client
 import time
 
 
-def run_command(module, command):
-    """Run a shell command safely using module.run_command and return output or raise an error."""
-    rc, stdout, stderr = module.run_command(command)
+def node_readiness(node):
+    """Return the name, Ready status and Ready lastTransitionTime of a node."""
+    conditions = node.get("status", {}).get("conditions") or []
+    ready_condition = next((c for c in conditions if c.get("type") == "Ready"), {})
+    return {
+        "name": node.get("metadata", {}).get("name"),
+        "status": ready_condition.get("status", "Unknown"),
+        "last_transition_time": ready_condition.get("lastTransitionTime"),
+    }
 
-    if rc == 0:
-        return stdout.strip(), None  # Success
 
-    return None, f"Command '{' '.join(command)}' failed: {stderr.strip()}"
+def get_nodes(module, timeout, settle_window):
+    """Watch the nodes until all are Ready or the NotReady set has settled."""
+    client = get_client(module)
+    state = {"listed": False, "not_ready": None, "since": time.time()}
 
+    def settled(nodes):
+        state["listed"] = True
+        not_ready = frozenset(n["metadata"]["name"] for n in nodes if node_readiness(n)["status"] != "True")
+        now = time.time()
+        if not_ready != state["not_ready"]:
+            state["not_ready"], state["since"] = not_ready, now
+        return not not_ready or now - state["since"] >= settle_window
 
-def get_nodes(module, timeout):
-    """Fetch the nodes and their status."""
-    command = "oc get nodes -o json"
-    start_time = time.time()
-    while time.time() - start_time < timeout:
-        try:
-            output, error = run_command(module, command)
-            if not error:
-                nodes = json.loads(output).get("items", [])
-            elif error:
-                module.warn(f"Retrying as got an error: {error}")
-            time.sleep(3)
-        except Exception as ex:
-            module.fail_json(msg=str(ex))
-    node_status = []
-    for node in nodes:
-        name = node.get("metadata", {}).get("name")
-        conditions = node.get("status", {}).get("conditions", [])
-        ready_condition = next((c for c in conditions if c.get("type") == "Ready"), {})
-        status = ready_condition.get("status", "Unknown")
-        node_status.append({"name": name, "status": status})
-    return node_status
+    nodes, error = client.wait_for("nodes", settled, timeout, resync_seconds=max(1, min(5, settle_window)))
+    if not state["listed"]:
+        module.fail_json(msg=f"Failed to list nodes: {error}")
+    if error:
+        module.warn(f"NotReady nodes were still changing when the timeout was reached: {error}")
+    return sorted((node_readiness(n) for n in nodes), key=lambda n: n["name"])
 
 
 def main():
     module_args = dict(
         timeout=dict(type="int", default=120),  # Timeout in seconds
+        settle_window=dict(type="int", default=30),
     )
     module = AnsibleModule(argument_spec=module_args, supports_check_mode=True)
     timeout = module.params["timeout"]
+    settle_window = module.params["settle_window"]
     try:
-        nodes = get_nodes(module, timeout)
+        nodes = get_nodes(module, timeout, settle_window)
         not_ready_nodes = [n for n in nodes if n["status"] != "True"]
         if not_ready_nodes:
             module.exit_json(
@@ -94,8 +113,9 @@ def main():
                     "and resolve any errors."
                 ),
                 not_ready_nodes=not_ready_nodes,
+                nodes=nodes,
             )
-        module.exit_json(changed=False, msg="All nodes are in the Ready state.", not_ready_nodes=not_ready_nodes)
+        module.exit_json(changed=False, msg="All nodes are in the Ready state.", not_ready_nodes=not_ready_nodes, nodes=nodes)
     except Exception as e:
         module.fail_json(msg=str(e))
 
@@ -35,6 +35,7 @@ changed:
 """
 
 from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.network.offline_migration_sdn_to_ovnk.plugins.module_utils.metrics import record, timed_run_command
 import shutil
 import time
 
@@ -42,13 +43,14 @@ import time
 def run_command_with_retries(module, command, retries=3, delay=3):
     """Execute a shell command with retries on failure."""
     for attempt in range(retries):
-        rc, stdout, stderr = module.run_command(command)
+        rc, stdout, stderr = timed_run_command(module, command)
 
         if rc == 0:
             return stdout.strip(), None  # Success
 
         if attempt < retries - 1:
             module.warn(f"Retrying in {delay} seconds due to error: {stderr.strip()}")
+            record("retry", "run_command_with_retries")
             time.sleep(delay)  # Wait before retrying
         else:
             return None, f"Command failed after {retries} attempts: {stderr.strip()}"
@@ -0,0 +1,300 @@
+# Copyright (c) 2025, Red Hat
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+
+DOCUMENTATION = r"""
+---
+module: check_pod_health
+short_description: Summarize the health of the pods of the cluster.
+version_added: "1.1.0"
+author: Miheer Salunke (@miheer)
+description:
+  - Lists the pods page by page (C(limit) and C(continue)) and folds every page into counts by phase and by status
+    reason, per node and per namespace, so the memory used stays the same however many pods the cluster runs.
+  - The status reason of a pod is what the C(STATUS) column of C(oc get pods) shows, for example C(Running),
+    C(Completed), C(CrashLoopBackOff), C(Init:Error) or C(Evicted).
+  - Each node and namespace entry counts its pods by phase and by status reason too. An entry keeps at most
+    O(max_reasons) distinct status reasons; pods with any further reason are counted under C(Other), so the result
+    stays bounded.
+  - Only the unhealthy pods are returned, up to O(max_unhealthy) of them. A pod is unhealthy when its phase is
+    C(Failed) or C(Unknown), or when its status reason is not one of C(Running), C(Completed), C(Pending),
+    C(ContainerCreating), C(PodInitializing) and C(Terminating).
+  - If the API server expires the continue token while the pods are listed, the list restarts from the first page.
+options:
+  namespace:
+    description: Only summarize the pods of this namespace. All namespaces by default.
+    type: str
+  page_size:
+    description: Number of pods requested per page.
+    type: int
+    default: 500
+  max_unhealthy:
+    description: Maximum number of unhealthy pods returned in RV(unhealthy_pods). RV(unhealthy_count) counts all of them.
+    type: int
+    default: 100
+  max_reasons:
+    description: Maximum number of distinct status reasons counted per node and per namespace before the rest go to C(Other).
+    type: int
+    default: 10
+  retries:
+    description: Number of attempts for each page request.
+    type: int
+    default: 3
+  retry_delay:
+    description: Delay in seconds between the attempts.
+    type: int
+    default: 3
+"""
+EXAMPLES = r"""
+- name: Summarize the health of the pods
+  network.offline_migration_sdn_to_ovnk.check_pod_health:
+  register: pod_health
+
+- name: Notify user about the unhealthy pods
+  ansible.builtin.debug:
+    msg: "{{ pod_health.unhealthy_pods | map(attribute='name') | join(', ') }}"
+  when: pod_health.unhealthy_count > 0
+"""
+RETURN = r"""
+changed:
+  description: Always C(false); the module only lists pods and does not change the cluster.
+  type: bool
+  returned: always
+total:
+  description: Number of pods listed.
+  type: int
+  returned: success
+pages:
+  description: Number of pages requested, restarts included.
+  type: int
+  returned: success
+phases:
+  description: Number of pods per phase.
+  type: dict
+  returned: success
+  sample: {"Running": 1840, "Succeeded": 112, "Pending": 3}
+reasons:
+  description: Number of pods per status reason.
+  type: dict
+  returned: success
+  sample: {"Running": 1840, "Completed": 112, "ContainerCreating": 3, "CrashLoopBackOff": 1}
+nodes:
+  description:
+    - Per node, the number of pods scheduled on it, how many of them are unhealthy, and their counts by phase and by status reason.
+    - Pods not scheduled yet are counted under C("").
+  type: dict
+  returned: success
+  sample: {"worker-0": {"pods": 42, "unhealthy": 1, "phases": {"Running": 41, "Failed": 1}, "reasons": {"Running": 41, "Evicted": 1}}}
+namespaces:
+  description: Per namespace, the number of pods, how many of them are unhealthy, and their counts by phase and by status reason.
+  type: dict
+  returned: success
+  sample: {"openshift-multus": {"pods": 12, "unhealthy": 0, "phases": {"Running": 12}, "reasons": {"Running": 12}}}
+unhealthy_count:
+  description: Number of unhealthy pods.
+  type: int
+  returned: success
+unhealthy_pods:
+  description: The first O(max_unhealthy) unhealthy pods, with their node, phase, status reason and container restarts.
+  type: list
+  elements: dict
+  returned: success
+  sample: [{"namespace": "shop", "name": "cart-7d9f-x2k4l", "node": "worker-0", "phase": "Running", "reason": "CrashLoopBackOff", "restarts": 14}]
+"""
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.network.offline_migration_sdn_to_ovnk.plugins.module_utils.kube_client import get_client
+from ansible_collections.network.offline_migration_sdn_to_ovnk.plugins.module_utils.metrics import record
+import time
+
+# Status reasons of pods that are running, finished or on their way to run
+HEALTHY_REASONS = ("Running", "Completed", "Pending", "ContainerCreating", "PodInitializing", "Terminating")
+UNHEALTHY_PHASES = ("Failed", "Unknown")
+# Bucket for the status reasons of an entry past its max_reasons distinct ones
+OTHER_REASON = "Other"
+
+
+def container_reason(status):
+    """Return the waiting or terminated reason of a container status, or None while it runs."""
+    state = status.get("state") or {}
+    if state.get("waiting"):
+        return state["waiting"].get("reason") or "Waiting"
+    terminated = state.get("terminated")
+    if terminated:
+        if terminated.get("reason"):
+            return terminated["reason"]
+        if terminated.get("signal"):
+            return f"Signal:{terminated['signal']}"
+        return f"ExitCode:{terminated.get('exitCode')}"
+    return None
+
+
+def pod_reason(pod):
+    """Return the status reason ``oc get pods`` shows for *pod*."""
+    status = pod.get("status") or {}
+    if pod.get("metadata", {}).get("deletionTimestamp"):
+        return "Terminating"
+    if status.get("reason"):
+        return status["reason"]
+    init_statuses = status.get("initContainerStatuses") or []
+    for index, init_status in enumerate(init_statuses):
+        reason = container_reason(init_status)
+        if reason == "Completed":
+            continue
+        if reason and reason != "PodInitializing":
+            return f"Init:{reason}"
+        if reason or not init_status.get("ready"):
+            return f"Init:{index}/{len(init_statuses)}"
+    reasons = [container_reason(container_status) for container_status in status.get("containerStatuses") or []]
+    # A container in trouble wins over the ones that run or completed
+    for reason in reasons:
+        if reason and reason != "Completed":
+            return reason
+    if reasons and all(reasons):
+        return "Completed"
+    return "Completed" if status.get("phase") == "Succeeded" else status.get("phase") or "Unknown"
+
+
+def is_unhealthy(phase, reason):
+    """Return True for a failed pod or one whose status reason tells it is stuck (Init:1/3 is still progressing)."""
+    if phase in UNHEALTHY_PHASES:
+        return True
+    if reason.startswith("Init:"):
+        return not reason[len("Init:"):].split("/")[0].isdigit()
+    return reason not in HEALTHY_REASONS
+
+
+def count_reason(reasons, reason, max_reasons):
+    """Count *reason* in *reasons*, under ``Other`` once *max_reasons* distinct reasons are counted."""
+    if reason not in reasons and len(reasons) >= max_reasons:
+        reason = OTHER_REASON
+    reasons[reason] = reasons.get(reason, 0) + 1
+
+
+class PodHealthSummary:
+    """Counts folded from the pods one page at a time; only the first *max_unhealthy* unhealthy pods are kept.
+
+    Every node and namespace entry counts at most *max_reasons* distinct status reasons (plus ``Other``).
+    """
+
+    def __init__(self, max_unhealthy, max_reasons=10):
+        self.max_unhealthy = max_unhealthy
+        self.max_reasons = max_reasons
+        self.reset()
+
+    def reset(self):
+        self.total = 0
+        self.phases = {}
+        self.reasons = {}
+        self.nodes = {}
+        self.namespaces = {}
+        self.unhealthy_count = 0
+        self.unhealthy_pods = []
+
+    def add(self, pod):
+        metadata, spec, status = pod.get("metadata", {}), pod.get("spec") or {}, pod.get("status") or {}
+        phase = status.get("phase") or "Unknown"
+        reason = pod_reason(pod)
+        unhealthy = is_unhealthy(phase, reason)
+        self.total += 1
+        self.phases[phase] = self.phases.get(phase, 0) + 1
+        self.reasons[reason] = self.reasons.get(reason, 0) + 1
+        for counts, key in ((self.nodes, spec.get("nodeName") or ""), (self.namespaces, metadata.get("namespace") or "")):
+            entry = counts.setdefault(key, {"pods": 0, "unhealthy": 0, "phases": {}, "reasons": {}})
+            entry["pods"] += 1
+            entry["unhealthy"] += unhealthy
+            entry["phases"][phase] = entry["phases"].get(phase, 0) + 1
+            count_reason(entry["reasons"], reason, self.max_reasons)
+        if unhealthy:
+            self.unhealthy_count += 1
+            if len(self.unhealthy_pods) < self.max_unhealthy:
+                self.unhealthy_pods.append({
+                    "namespace": metadata.get("namespace"),
+                    "name": metadata.get("name"),
+                    "node": spec.get("nodeName"),
+                    "phase": phase,
+                    "reason": reason,
+                    "restarts": sum(container.get("restartCount", 0) for container in status.get("containerStatuses") or []),
+                })
+
+    def result(self):
+        return dict(
+            total=self.total,
+            phases=self.phases,
+            reasons=self.reasons,
+            nodes=self.nodes,
+            namespaces=self.namespaces,
+            unhealthy_count=self.unhealthy_count,
+            unhealthy_pods=self.unhealthy_pods,
+        )
+
+
+def list_page(module, namespace, page_size, token, retries, delay):
+    """Request one page of pods, retrying errors like ``call_with_retries`` except an expired continue token."""
+    client = get_client(module)
+    for attempt in range(retries):
+        page, error = client.list("pods", namespace=namespace, limit=page_size, continue_token=token)
+        if not error or error.status == 410 or attempt == retries - 1:
+            return page, error
+        module.warn(f"Retrying in {delay} seconds due to error: {error}")
+        record("retry", "list_page")
+        time.sleep(delay)
+    return None, "Unknown error"
+
+
+def summarize_pods(module, summary, namespace, page_size, retries, delay):
+    """List the pods page by page into *summary*; return ``(pages, error)``.
+
+    An expired continue token (410 Expired) restarts the list, up to *retries* times.
+    """
+    pages, restarts, token = 0, 0, None
+    while True:
+        page, error = list_page(module, namespace, page_size, token, max(1, retries), delay)
+        if error and token and error.status == 410 and restarts < retries:
+            module.warn(f"The pod list expired after {pages} pages, listing again from the start: {error}")
+            restarts += 1
+            summary.reset()
+            token = None
+            continue
+        if error:
+            return pages, error
+        pages += 1
+        for pod in page.get("items", []):
+            summary.add(pod)
+        token = page.get("metadata", {}).get("continue")
+        if not token:
+            return pages, None
+
+
+def main():
+    module_args = dict(
+        namespace=dict(type="str"),
+        page_size=dict(type="int", default=500),
+        max_unhealthy=dict(type="int", default=100),
+        max_reasons=dict(type="int", default=10),
+        retries=dict(type="int", default=3),
+        retry_delay=dict(type="int", default=3),
+    )
+    module = AnsibleModule(argument_spec=module_args, supports_check_mode=True)
+    if module.params["page_size"] < 1:
+        module.fail_json(msg="page_size must be at least 1.")
+
+    summary = PodHealthSummary(max(0, module.params["max_unhealthy"]), max(0, module.params["max_reasons"]))
+    pages, error = summarize_pods(
+        module, summary, module.params["namespace"], module.params["page_size"], module.params["retries"], module.params["retry_delay"]
+    )
+    if error:
+        module.fail_json(msg=f"❌ Failed to list pods: {error}", pages=pages)
+
+    result = summary.result()
+    if result["unhealthy_count"]:
+        worst = sorted(result["reasons"].items(), key=lambda item: -item[1])
+        reasons = ", ".join(f"{reason}: {count}" for reason, count in worst if is_unhealthy("", reason))
+        msg = f"⚠️ {result['unhealthy_count']} of {result['total']} pods are unhealthy ({reasons})."
+    else:
+        msg = f"✅ All {result['total']} pods are healthy."
+    module.exit_json(changed=False, msg=msg, pages=pages, **result)
+
+
+if __name__ == "__main__":
+    main()
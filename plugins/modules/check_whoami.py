@@ -34,44 +34,33 @@ changed:
 """
 
 from ansible.module_utils.basic import AnsibleModule
-import time
-
-
-def run_command_with_retries(module, command, retries=3, delay=3):
-    """Execute a shell command with retries on failure."""
-    for attempt in range(retries):
-        rc, stdout, stderr = module.run_command(command)
-
-        if rc == 0:
-            return stdout.strip(), None  # Success
-
-        if attempt < retries - 1:
-            module.warn(f"Retrying in {delay} seconds due to error: {stderr.strip()}")
-            time.sleep(delay)  # Wait before retrying
-        else:
-            return None, f"Command failed after {retries} attempts: {stderr.strip()}"
-
-    return None, "Unknown error"
+from ansible_collections.network.offline_migration_sdn_to_ovnk.plugins.module_utils.kube_client import call_with_retries, get_client
 
 
 def check_cluster_admin(module):
     """Check if the current user has cluster-admin rights."""
-    # Get current user
-    user_command = "oc whoami"
-    user, error = run_command_with_retries(module, user_command)
+    client = get_client(module)
+
+    # Get current user (equivalent of `oc whoami`)
+    user_info, error = call_with_retries(module, lambda: client.get("users", "~"))
 
     if error:
-        return None, f"Failed to execute `{user_command}`. Ensure `oc` client is configured correctly."
+        return None, f"Failed to look up the current user: {error}. Ensure the kubeconfig is configured correctly."
+    user = user_info.get("metadata", {}).get("name")
 
-    # Check if the user can perform all actions (indicating cluster-admin rights)
-    check_admin_command = "oc auth can-i '*' '*' --all-namespaces"
-    admin_rights, error = run_command_with_retries(module, check_admin_command)
+    # Check if the user can perform all actions (equivalent of `oc auth can-i '*' '*' --all-namespaces`)
+    review = {
+        "apiVersion": "authorization.k8s.io/v1",
+        "kind": "SelfSubjectAccessReview",
+        "spec": {"resourceAttributes": {"verb": "*", "group": "*", "resource": "*"}},
+    }
+    admin_rights, error = call_with_retries(module, lambda: client.create("selfsubjectaccessreviews", review))
 
     if error:
         return None, f"Failed to verify cluster-admin rights. Error: {error}"
 
     # If the user is system:admin OR has full privileges
-    if "yes" in admin_rights or user == "system:admin":
+    if admin_rights.get("status", {}).get("allowed") or user == "system:admin":
         return user, None
     return user, "User does not have `cluster-admin` rights."
 
@@ -0,0 +1,178 @@
+# Copyright (c) 2025, Red Hat
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+
+DOCUMENTATION = r"""
+---
+module: checkpoint
+short_description: Query or record completed phases in the local checkpoint journal.
+version_added: "1.1.0"
+author: Miheer Salunke (@miheer)
+description:
+  - Keeps an append-only journal of the phases of a migration or rollback run that completed, keyed by the cluster ID
+    from the ClusterVersion object, so that a rerun after a late failure can skip them.
+  - Each record holds the resourceVersion and generation of network.config.openshift.io/cluster when the phase
+    completed. A query revalidates the newest record of the run with one GET per recorded object. If a recorded spec
+    changed since then (its generation differs), or the newest record is older than O(max_age), the history is reset
+    and nothing counts as complete.
+  - A query that finds O(phase) complete warns that the phase is skipped and how to run it again, so a rerun never
+    skips work silently.
+  - Recording a phase does not revalidate the history, since the phase itself made the changes.
+  - The M(network.offline_migration_sdn_to_ovnk.migrate) action records its individual steps in the same journal.
+options:
+  run:
+    description: Name of the run the phases belong to, for example C(migration) or C(rollback).
+    type: str
+    required: true
+  phase:
+    description: Phase to query or record, for example C(prechecks). Required with O(state=record).
+    type: str
+  state:
+    description:
+      - C(query) reports whether O(phase) completed in an earlier run.
+      - C(record) appends a checkpoint for the completed O(phase).
+      - C(reset) discards the recorded history of O(run) for this cluster.
+    type: str
+    choices: [query, record, reset]
+    default: query
+  journal_file:
+    description:
+      - Path of the journal on the host running the module.
+      - Defaults to C(~/.ansible/network.offline_migration_sdn_to_ovnk/checkpoints.jsonl) of the user running the module.
+    type: path
+  max_age:
+    description:
+      - Seconds after the newest record of O(run) before its history is no longer trusted and is reset, so that a
+        rerun long after a run finished starts over. C(0) keeps the history however old it is.
+    type: int
+    default: 86400
+"""
+EXAMPLES = r"""
+- name: Look up the migration phase in the checkpoint journal
+  network.offline_migration_sdn_to_ovnk.checkpoint:
+    run: migration
+    phase: migration
+  register: checkpoint
+
+- name: Skip the phase completed by an earlier run (the module warns about it)
+  ansible.builtin.meta: end_play
+  when: checkpoint.completed
+
+- name: Record the completed phase
+  network.offline_migration_sdn_to_ovnk.checkpoint:
+    run: migration
+    phase: migration
+    state: record
+"""
+RETURN = r"""
+changed:
+  description: Whether a record was appended to the journal.
+  type: bool
+  returned: always
+cluster_uid:
+  description: Cluster ID the journal records are keyed by.
+  type: str
+  returned: success
+completed:
+  description: Whether O(phase) completed in an earlier run and the checkpoint is still valid.
+  type: bool
+  returned: success
+completed_phases:
+  description: Phases of O(run) recorded as complete, oldest first, if the newest checkpoint is still valid.
+  type: list
+  elements: str
+  returned: success
+invalidated:
+  description: Objects whose spec changed since the newest checkpoint. When not empty the history was reset.
+  type: list
+  elements: str
+  returned: success
+expired:
+  description: Whether the newest checkpoint was older than O(max_age), in which case the history was reset.
+  type: bool
+  returned: success
+journal_file:
+  description: Path of the journal.
+  type: str
+  returned: always
+"""
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.network.offline_migration_sdn_to_ovnk.plugins.module_utils.journal import (
+    CheckpointJournal,
+    default_journal_path,
+    format_age,
+    invalid_reason,
+    load_checkpoints,
+    record_checkpoint,
+    reset_checkpoints,
+)
+from ansible_collections.network.offline_migration_sdn_to_ovnk.plugins.module_utils.kube_client import get_client
+
+
+def main():
+    module = AnsibleModule(
+        argument_spec=dict(
+            run=dict(type="str", required=True),
+            phase=dict(type="str"),
+            state=dict(type="str", choices=["query", "record", "reset"], default="query"),
+            journal_file=dict(type="path"),
+            max_age=dict(type="int", default=86400),
+        ),
+        required_if=[("state", "record", ["phase"])],
+        supports_check_mode=True,
+    )
+    run = module.params["run"]
+    phase = module.params["phase"]
+    state = module.params["state"]
+    journal_file = module.params["journal_file"] or default_journal_path()
+    journal = CheckpointJournal(journal_file)
+    client = get_client(module)
+
+    checkpoints, error = load_checkpoints(client, journal, run, module.params["max_age"])
+    if error:
+        module.fail_json(msg=error, journal_file=journal_file)
+    cluster_uid = checkpoints["cluster_uid"]
+    result = dict(
+        changed=False, cluster_uid=cluster_uid, journal_file=journal_file, invalidated=checkpoints["invalidated"], expired=checkpoints["expired"]
+    )
+
+    # A phase that is being recorded made the changes itself; only a query or reset revalidates the history.
+    invalid = invalid_reason(checkpoints)
+    if state != "record" and (invalid or state == "reset"):
+        reason = invalid or "requested"
+        if not module.check_mode:
+            error = reset_checkpoints(journal, cluster_uid, run, reason)
+            if error:
+                module.fail_json(msg=error, **result)
+        result["changed"] = True
+        checkpoints["phases"] = []
+        if invalid:
+            module.warn(f"Checkpoints of the {run} run are no longer valid ({reason}); starting over.")
+
+    if state == "record":
+        if not module.check_mode:
+            error = record_checkpoint(client, journal, cluster_uid, run, phase)
+            if error:
+                module.fail_json(msg=error, **result)
+        result["changed"] = True
+        if phase not in checkpoints["phases"]:
+            checkpoints["phases"].append(phase)
+        msg = f"Recorded phase {phase} of the {run} run."
+    elif state == "reset":
+        msg = f"Reset the checkpoints of the {run} run."
+    elif phase in checkpoints["phases"]:
+        msg = f"Phase {phase} of the {run} run already completed."
+        module.warn(
+            f"Skipping phase {phase} of the {run} run: {journal_file} records it as completed "
+            f"(newest checkpoint {format_age(checkpoints['recorded_at'])} ago). "
+            "Rerun with checkpoint_reset=true (state=reset for this module) to run every phase again."
+        )
+    else:
+        msg = f"Phase {phase} of the {run} run has not completed yet."
+
+    module.exit_json(msg=msg, completed=phase in checkpoints["phases"], completed_phases=checkpoints["phases"], **result)
+
+
+if __name__ == "__main__":
+    main()
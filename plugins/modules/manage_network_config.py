@@ -39,35 +39,22 @@ changed:
 """
 
 from ansible.module_utils.basic import AnsibleModule
-import time
-import json
-
-
-def run_command(module, command):
-    """Run a shell command safely using module.run_command and return output or raise an error."""
-    rc, stdout, stderr = module.run_command(command)
-
-    if rc == 0:
-        return stdout.strip(), None  # Success
-
-    return None, f"Command '{' '.join(command)}' failed: {stderr.strip()}"
+from ansible_collections.network.offline_migration_sdn_to_ovnk.plugins.module_utils.kube_client import get_client
+from ansible_collections.network.offline_migration_sdn_to_ovnk.plugins.module_utils.polling import poll
 
 
 def patch_network_operator(module, timeout, network_provider_config):
     """Patch the Network operator configuration."""
-    """Patch the Network operator configuration safely using json.dumps."""
 
     patch_data = {"spec": {"defaultNetwork": {network_provider_config: None}}}  # Setting config to `null`
 
-    command = ["oc", "patch", "Network.operator.openshift.io", "cluster", "--type=merge", "--patch", json.dumps(patch_data)]
+    client = get_client(module)
 
-    start_time = time.time()
-    while time.time() - start_time < timeout:
+    for _attempt in poll(timeout, max_interval=10):
         try:
-            output, error = run_command(module, command)
+            output, error = client.patch("network.operator", "cluster", patch_data)
             if error:
                 module.warn(f"Retrying as got an error: {error}")
-                time.sleep(3)
             if not error:
                 return output
         except Exception as ex:
@@ -76,14 +63,14 @@ def patch_network_operator(module, timeout, network_provider_config):
 
 def delete_namespace(module, timeout, namespace):
     """Delete a specified namespace."""
-    command = f"oc delete namespace {namespace}"
-    start_time = time.time()
-    while time.time() - start_time < timeout:
+    client = get_client(module)
+    for _attempt in poll(timeout, max_interval=10):
         try:
-            output, error = run_command(module, command)
+            output, error = client.delete("namespaces", namespace)
+            if error and error.status == 404:
+                return None
             if error:
                 module.warn(f"Retrying as got an error: {error}")
-                time.sleep(3)
             if not error:
                 return output
         except Exception as ex:
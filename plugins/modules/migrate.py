@@ -0,0 +1,179 @@
+# Copyright (c) 2025, Red Hat
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+
+DOCUMENTATION = r"""
+---
+module: migrate
+short_description: Run the OpenShiftSDN to OVNKubernetes migration steps in one task.
+version_added: "1.1.0"
+author: Miheer Salunke (@miheer)
+description:
+  - Runs the migration steps as a state machine in the Ansible controller process, in this order
+    C(plan_cluster_network), C(clean_migration_field), C(delete_primary_nncp), C(change_network_type), C(get_ocp_version),
+    C(disable_automatic_migration), C(configure_network_settings), C(wait_for_mco), C(wait_for_mco_completion),
+    C(verify_machine_config), C(trigger_network_type), C(wait_for_network_co) and C(wait_multus_restart).
+  - Each step runs the same code as the module of the same name, but all steps share one Python process and one
+    connection pool to the API server instead of paying for a separate module invocation each.
+  - The run stops at the first failing step. Every step, including skipped ones, is reported in RV(steps).
+  - The steps read C(KUBECONFIG) from the environment of the controller.
+  - This is an action plugin; it always runs on the controller.
+options:
+  network_type:
+    description: Target network type.
+    type: str
+    required: true
+    choices: [OVNKubernetes, OpenShiftSDN]
+  clean_migration_timeout:
+    description: Timeout in seconds for clearing the migration field (C(clean_migration_field)).
+    type: int
+    default: 120
+  change_migration_timeout:
+    description: Timeout in seconds for the migration field to be set (C(change_network_type)).
+    type: int
+    default: 120
+  interface_name:
+    description: Primary interface whose NodeNetworkConfigurationPolicy is deleted. C(delete_primary_nncp) is skipped when unset.
+    type: str
+  disable_auto_migration:
+    description:
+      - When C(false), C(change_network_type) sets the migration field.
+      - When C(true) and the cluster runs OpenShift 4.12 or later, C(disable_automatic_migration) sets it together with
+        O(egress_ip), O(egress_firewall) and O(multicast) instead.
+    type: bool
+    default: false
+  egress_ip:
+    description: Whether egress IPs are migrated automatically. See the C(disable_automatic_migration) module.
+    type: raw
+  egress_firewall:
+    description: Whether egress firewalls are migrated automatically. See the C(disable_automatic_migration) module.
+    type: raw
+  multicast:
+    description: Whether multicast is migrated automatically. See the C(disable_automatic_migration) module.
+    type: raw
+  configure_network_type:
+    description: Network provider configuration to customise. C(configure_network_settings) is skipped when unset.
+    type: str
+    choices: [ovnKubernetes, openshiftSDN]
+  mtu:
+    description: MTU passed to C(configure_network_settings).
+    type: int
+  geneve_port:
+    description: Geneve port passed to C(configure_network_settings).
+    type: int
+  ipv4_subnet:
+    description: Internal IPv4 subnet passed to C(configure_network_settings).
+    type: str
+  routing_via_host:
+    description: Gateway routingViaHost setting passed to C(configure_network_settings).
+    type: bool
+  ip_forwarding:
+    description: Gateway ipForwarding setting passed to C(configure_network_settings).
+    type: str
+    choices: [Global, Restricted]
+  mco_timeout:
+    description: Timeout in seconds for the MCO to start updating nodes (C(wait_for_mco)).
+    type: int
+    default: 300
+  mcp_completion_timeout:
+    description: Timeout in seconds for the MCO to finish (C(wait_for_mco_completion)).
+    type: int
+    default: 2700
+  mco_status_file:
+    description:
+      - File C(wait_for_mco_completion) writes the per-pool rollout progress and ETA to while the MCO rolls out.
+      - Defaults to C(mco-progress.json) in the collection's temporary directory on the controller.
+    type: path
+  verify_machine_config_timeout:
+    description: Timeout in seconds for C(verify_machine_config).
+    type: int
+    default: 300
+  cidr:
+    description:
+      - New cluster network CIDR passed to C(trigger_network_type). Requires O(prefix).
+      - When set, the first step C(plan_cluster_network) runs the checks of C(trigger_network_type) up front. It fails the
+        run before anything is patched if the CIDR overlaps the reserved, service or machine networks, or if O(prefix)
+        does not leave a node subnet for every node plus O(node_headroom). The step is skipped when unset.
+    type: str
+  prefix:
+    description: Host prefix that accompanies O(cidr).
+    type: int
+  node_headroom:
+    description: Extra nodes the new O(cidr) must have a per-node subnet for. See the C(trigger_network_type) module.
+    type: int
+    default: 0
+  ovn_co_timeout:
+    description: Timeout in seconds for C(trigger_network_type) and C(wait_for_network_co).
+    type: int
+    default: 60
+  multus_timeout:
+    description: Timeout in seconds for the Multus and O(network_type) dataplane pods to roll out (C(wait_multus_restart)).
+    type: int
+    default: 300
+  stall_timeout:
+    description:
+      - Seconds without progress after which C(wait_for_mco_completion), C(wait_for_network_co) and
+        C(wait_multus_restart) give up before their timeout, with a diagnosis of what is stuck. C(0) disables the detection.
+      - When unset, each step uses its own default (1800, 300 and 600 seconds respectively).
+    type: int
+  checkpoint_run:
+    description:
+      - Name of the run to journal the steps under, for example C(migration). When unset the steps are not journaled.
+      - Every step is recorded in the checkpoint journal when it finishes. A rerun revalidates the newest record and
+        skips the steps that completed, with a warning that names them, see M(network.offline_migration_sdn_to_ovnk.checkpoint).
+        C(get_ocp_version) always runs again.
+    type: str
+  checkpoint_phase:
+    description: Phase of O(checkpoint_run) the steps are recorded under.
+    type: str
+    default: migration
+  journal_file:
+    description: Path of the checkpoint journal on the controller. Defaults to the journal used by M(network.offline_migration_sdn_to_ovnk.checkpoint).
+    type: path
+  checkpoint_max_age:
+    description: Seconds after the newest record of O(checkpoint_run) before its history is reset and every step runs again. C(0) never expires it.
+    type: int
+    default: 86400
+"""
+
+EXAMPLES = r"""
+- name: Migrate the cluster to OVN-Kubernetes
+  network.offline_migration_sdn_to_ovnk.migrate:
+    network_type: OVNKubernetes
+    configure_network_type: ovnKubernetes
+    mtu: 1400
+    mcp_completion_timeout: 18000
+  register: migration_result
+
+- name: Show how long each step took
+  ansible.builtin.debug:
+    msg: "{{ migration_result.steps | map(attribute='step') | zip(migration_result.steps | map(attribute='duration', default=0)) }}"
+"""
+
+RETURN = r"""
+changed:
+  description: Whether any step changed the cluster.
+  type: bool
+  returned: always
+msg:
+  description: Human-readable status message.
+  type: str
+  returned: always
+failed_step:
+  description: Name of the step that failed.
+  type: str
+  returned: on failure
+steps:
+  description:
+    - Result of every step that was reached, in order, as returned by the module of the same name.
+    - Each result also has C(step), the step name, and C(duration), its run time in seconds. Steps whose condition
+      was not met have C(skipped=true); steps that completed in an earlier run also have C(checkpoint=true).
+  type: list
+  elements: dict
+  returned: always
+  sample:
+    - step: clean_migration_field
+      changed: true
+      msg: Migration field cleared.
+      duration: 2.1
+"""
@@ -12,7 +12,9 @@ description:
   - Patch the machine config pool to pause or unpause.
 options:
   pool_name:
-    description: Name of the machine config pool to pause.
+    description:
+      - Name of the machine config pool to pause.
+      - C(all) patches every machine config pool, custom pools such as C(infra) included.
     required: true
     type: str
   paused:
@@ -30,34 +32,26 @@ EXAMPLES = r"""
   network.offline_migration_sdn_to_ovnk.patch_mcp_paused:
     pool_name: "worker"
     paused: true
+
+- name: Pause updates for every MachineConfigPool
+  network.offline_migration_sdn_to_ovnk.patch_mcp_paused:
+    pool_name: "all"
+    paused: true
 """
 RETURN = r"""
 changed:
   description: Whether the CR was modified.
   type: bool
   returned: always
+pools:
+  description: Names of the machine config pools that were patched.
+  type: list
+  elements: str
+  returned: success
 """
 
 from ansible.module_utils.basic import AnsibleModule
-import time
-import json
-
-
-def run_command_with_retries(module, command, retries=3, delay=3):
-    """Execute a shell command with retries on failure."""
-    for attempt in range(retries):
-        rc, stdout, stderr = module.run_command(command)
-
-        if rc == 0:
-            return stdout.strip(), None  # Success
-
-        if attempt < retries - 1:
-            module.warn(f"Retrying in {delay} seconds due to error: {stderr.strip()}")
-            time.sleep(delay)  # Wait before retrying
-        else:
-            return None, f"Command failed after {retries} attempts: {stderr.strip()}"
-
-    return None, "Unknown error"
+from ansible_collections.network.offline_migration_sdn_to_ovnk.plugins.module_utils.kube_client import call_with_retries, get_client
 
 
 def main():
@@ -77,17 +71,24 @@ def main():
     # Build the patch command
     patch = {"spec": {"paused": paused_value}}
 
-    patch_command = ["oc", "patch", "MachineConfigPool", pool_name, "--type=merge", "--patch", json.dumps(patch)]
+    client = get_client(module)
+    pool_names = [pool_name]
+    if pool_name == "all":
+        pools_json, error = call_with_retries(module, lambda: client.list("machineconfigpools"))
+        if error:
+            module.fail_json(msg=f"Failed to list the machine config pools: {error}")
+        pool_names = sorted(pool["metadata"]["name"] for pool in pools_json.get("items", []))
 
-    # Execute the command
+    # Execute the patch
     if module.check_mode:
-        module.exit_json(changed=True, msg=f"Check mode: would patch {pool_name} with paused={paused_value}.")
+        module.exit_json(changed=True, msg=f"Check mode: would patch {', '.join(pool_names)} with paused={paused_value}.", pools=pool_names)
 
-    _unused, error = run_command_with_retries(module, patch_command)
-    if error:
-        module.fail_json(msg=f"Failed to patch {pool_name}: {error}")
+    for name in pool_names:
+        _unused, error = call_with_retries(module, lambda name=name: client.patch("machineconfigpools", name, patch))
+        if error:
+            module.fail_json(msg=f"Failed to patch {name}: {error}")
 
-    module.exit_json(changed=True, msg=f"Successfully patched {pool_name} with paused={paused_value}.")
+    module.exit_json(changed=True, msg=f"Successfully patched {', '.join(pool_names)} with paused={paused_value}.", pools=pool_names)
 
 
 if __name__ == "__main__":
@@ -10,12 +10,34 @@ version_added: "1.0.0"
 author: Miheer Salunke (@miheer)
 description:
   - Reboot nodes.
+  - The boot ID of every node is recorded before the reboot and each node is tracked until it reports a new
+    boot ID and Ready=True, so the module returns as soon as the last node is back.
+  - With O(pools), the nodes are grouped by the MachineConfigPool whose C(nodeSelector) selects them, the same way
+    the machine config operator does (a node selected by the C(worker) pool and by a custom pool belongs to the
+    custom pool). All pools are rebooted at the same time, and within each pool at most C(maxUnavailable) nodes
+    (a count, or a percentage of the pool rounded down, and at least one) are rebooting at any moment; the next node
+    of a pool is sent as soon as one of its rebooting nodes is back with a new boot ID and Ready=True.
+  - With O(drain), each node is cordoned and its pods are evicted through the eviction API before the reboot
+    command is sent, so PodDisruptionBudgets are respected; the nodes of a wave (or the rebooting nodes of the pools)
+    are drained in parallel and the node is uncordoned once it is back. With O(role), the module waits for every
+    node of a drained wave to be back and uncordons them before it drains the next wave, so no more than one wave
+    of nodes is unschedulable at a time.
+  - In check mode, the module returns the RV(waves) or RV(pools) it would reboot, with empty RV(results), without
+    cordoning, draining or rebooting any node.
 options:
   role:
-    description: Selects a node with a role.
+    description:
+      - Selects a node with a role. C(master) selects the nodes with the C(node-role.kubernetes.io/master) label
+        and C(worker) all the others.
+      - Mutually exclusive with O(pools); one of them is required.
     choices: [master, worker]
-    required: true
     type: str
+  pools:
+    description:
+      - Names of the MachineConfigPools whose nodes to reboot, or C(all) for every pool.
+      - Mutually exclusive with O(role). O(wave_size) is not used; each pool's C(maxUnavailable) bounds its reboots.
+    type: list
+    elements: str
   namespace:
     description: Provides namespace for the machine config operator
     type: str
@@ -24,8 +46,15 @@ options:
     description: Label for machine config daemon
     type: str
     required: true
+  daemonset_label_key:
+    description:
+      - Key of the machine config daemon pod label whose value is O(daemonset_label).
+      - Used as a server-side label selector when indexing the daemon pods by node.
+    type: str
+    default: k8s-app
   delay:
-    description: Delay to add sleep.
+    description:
+      - Delay in minutes before a master reboots. Each further master is scheduled 3 minutes after the previous one.
     type: int
     default: 1
   retries:
@@ -37,9 +66,39 @@ options:
     type: int
     default: 3
   timeout:
-    description: Desired timeout
+    description:
+      - Seconds to wait for the rebooted nodes to come back with a new boot ID and Ready=True,
+        on top of the scheduled master reboot delay.
+      - With O(pools), the time each node has to come back after its reboot command was sent.
     type: int
     default: 1800
+  wave_size:
+    description:
+      - Number of worker nodes whose reboot commands are sent in parallel, as an absolute count (C(10))
+        or as a percentage of the selected nodes (C(25%)).
+      - Each wave finishes before the next one starts and the module stops after a wave with failures.
+        Without O(drain), a wave is finished once its reboot commands are sent; with O(drain), once its nodes are back
+        with a new boot ID and Ready=True and are uncordoned.
+      - Ignored for masters, which are always rebooted one at a time with a staggered delay, and with O(pools).
+    type: str
+    default: "1"
+    aliases: [concurrency]
+  drain:
+    description:
+      - Cordon each node and evict its pods before rebooting it, like C(oc adm drain --ignore-daemonsets --delete-emptydir-data).
+      - Pods managed by a DaemonSet and mirror pods are not evicted. An eviction refused because of a PodDisruptionBudget
+        (HTTP 429) is retried with backoff until O(drain_timeout).
+      - A node whose drain fails is uncordoned and not rebooted, and the module fails like for a failed reboot command.
+    type: bool
+    default: false
+  drain_timeout:
+    description: Seconds to cordon a node, get all its evictions accepted and wait for the evicted pods to be gone.
+    type: int
+    default: 600
+  drain_workers:
+    description: Number of evictions in flight at once across all the nodes being drained.
+    type: int
+    default: 20
 """
 EXAMPLES = r"""
 - name: Reboot master nodes
@@ -51,29 +110,92 @@ EXAMPLES = r"""
     retries: 5
     retry_delay: 3
     timeout: 1800
+
+- name: Reboot worker nodes a quarter at a time
+  network.offline_migration_sdn_to_ovnk.reboot_nodes:
+    role: "worker"
+    namespace: "openshift-machine-config-operator"
+    daemonset_label: "machine-config-daemon"
+    wave_size: "25%"
+
+- name: Reboot every MachineConfigPool at once, each within its maxUnavailable
+  network.offline_migration_sdn_to_ovnk.reboot_nodes:
+    pools: [all]
+    namespace: "openshift-machine-config-operator"
+    daemonset_label: "machine-config-daemon"
+
+- name: Drain the workers before rebooting them, a quarter at a time
+  network.offline_migration_sdn_to_ovnk.reboot_nodes:
+    role: "worker"
+    namespace: "openshift-machine-config-operator"
+    daemonset_label: "machine-config-daemon"
+    wave_size: "25%"
+    drain: true
+    drain_timeout: 900
 """
 RETURN = r"""
 changed:
   description: Whether the CR was modified.
   type: bool
   returned: always
+results:
+  description:
+    - Per-node result of the reboot command, including the wave (with O(role)) or the pool (with O(pools)) it was sent in.
+    - Once the node is back, C(boot_id) holds its new boot ID and C(reboot_seconds) the time from sending
+      the reboot command until the node was Ready with that boot ID.
+    - With O(drain), C(drain_seconds) is the time the node took to drain, C(evicted_pods) the number of pods evicted from
+      it and C(slowest_evictions) the pods whose eviction took longest to be accepted, to find the workloads whose
+      PodDisruptionBudgets slow the drain down.
+  type: list
+  elements: dict
+  returned: always
+  sample: [{"node": "worker-0", "wave": 1, "status": "success", "output": "", "boot_id": "8d1c...", "reboot_seconds": 94.2,
+            "drain_seconds": 31.5, "evicted_pods": 12, "slowest_evictions": [{"pod": "shop/cart-7d9f-x2k4l", "seconds": 24.1}]}]
+waves:
+  description: Nodes sent in each wave and the ones whose reboot command failed.
+  type: list
+  elements: dict
+  returned: when O(role) is used
+  sample: [{"wave": 1, "nodes": ["worker-0", "worker-1"], "failed": []}]
+pools:
+  description:
+    - Per MachineConfigPool, its nodes in the order they were sent, its C(max_unavailable) and the nodes that failed
+      to reboot or did not come back in time.
+  type: list
+  elements: dict
+  returned: when O(pools) is used
+  sample: [{"pool": "infra", "nodes": ["infra-0", "infra-1"], "max_unavailable": 1, "failed": []}]
 """
 
 from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.network.offline_migration_sdn_to_ovnk.plugins.module_utils.kube_client import call_with_retries, condition_status, get_client
+from ansible_collections.network.offline_migration_sdn_to_ovnk.plugins.module_utils.metrics import record, timed_run_command
+from ansible_collections.network.offline_migration_sdn_to_ovnk.plugins.module_utils.polling import PollSchedule, poll
+from collections import deque
+from concurrent.futures import CancelledError, ThreadPoolExecutor
+import math
+import threading
 import time
-import json
+
+# Upper bound on the reboot commands (oc rsh) in flight at once across all pools
+MAX_PARALLEL_COMMANDS = 50
+# Longest pause between two attempts of an eviction refused by a PodDisruptionBudget
+MAX_EVICTION_INTERVAL = 10
+# Evictions reported per node in slowest_evictions
+SLOWEST_EVICTIONS = 3
 
 
 def run_command_with_retries(module, command, retries=3, delay=3):
     """Execute a shell command safely using module.run_command with retries."""
     for attempt in range(retries):
-        rc, stdout, stderr = module.run_command(command)
+        rc, stdout, stderr = timed_run_command(module, command)
 
         if rc == 0:
             return stdout.strip(), None  # ✅ Success
 
         if attempt < retries - 1:
             module.warn(f"Retrying in {delay} seconds due to error: {stderr.strip()}")
+            record("retry", "run_command_with_retries")
             time.sleep(delay)  # Wait before retrying
         else:
             return None, f"❌ Command failed after {retries} attempts: {stderr.strip()}"
@@ -82,55 +204,166 @@ def run_command_with_retries(module, command, retries=3, delay=3):
 
 
 def get_nodes(module, role, retries, delay):
-    """Retrieve a list of nodes by role."""
-    command = ["oc", "get", "nodes", "-o", "json"]
-    stdout, error = run_command_with_retries(module, command, retries, delay)
+    """Retrieve a list of nodes by role, or all of them for any other *role*."""
+    client = get_client(module)
+    nodes_json, error = call_with_retries(module, lambda: client.list("nodes"), retries, delay)
     if error:
         return None, error
 
-    try:
-        nodes_json = json.loads(stdout)
-        nodes = []
-        for item in nodes_json.get("items", []):
-            labels = item.get("metadata", {}).get("labels", {})
-            node_name = item.get("metadata", {}).get("name")
-
-            if role == "master":
-                if "node-role.kubernetes.io/master" in labels:
-                    nodes.append((node_name, labels))
-            else:
-                if "node-role.kubernetes.io/master" not in labels:
-                    nodes.append((node_name, labels))
+    nodes = []
+    for item in nodes_json.get("items", []):
+        labels = item.get("metadata", {}).get("labels", {})
+        node_name = item.get("metadata", {}).get("name")
 
-        if not nodes:
-            return None, "❌ No nodes found for the specified role."
-        return nodes, None
+        boot_id = item.get("status", {}).get("nodeInfo", {}).get("bootID")
 
-    except json.JSONDecodeError:
-        return None, "❌ Failed to parse JSON output from `oc get nodes`."
+        if role == "master":
+            if "node-role.kubernetes.io/master" in labels:
+                nodes.append((node_name, labels, boot_id))
+        elif role == "worker":
+            if "node-role.kubernetes.io/master" not in labels:
+                nodes.append((node_name, labels, boot_id))
+        else:
+            nodes.append((node_name, labels, boot_id))
+
+    if not nodes:
+        return None, "❌ No nodes found for the specified role."
+    return nodes, None
+
+
+def selector_matches(selector, labels):
+    """Return True when a label selector (``matchLabels`` and ``matchExpressions``) selects *labels*; None selects nothing."""
+    if selector is None:
+        return False
+    for key, value in (selector.get("matchLabels") or {}).items():
+        if labels.get(key) != value:
+            return False
+    for expression in selector.get("matchExpressions") or []:
+        key, operator, values = expression.get("key"), expression.get("operator"), expression.get("values") or []
+        if operator == "In" and labels.get(key) not in values:
+            return False
+        if operator == "NotIn" and key in labels and labels[key] in values:
+            return False
+        if operator == "Exists" and key not in labels:
+            return False
+        if operator == "DoesNotExist" and key in labels:
+            return False
+    return True
+
+
+def assign_pools(pools, nodes):
+    """Map the nodes to the MachineConfigPool that manages them.
+
+    Like the machine config operator, a node selected by the worker pool and by another pool belongs to the other
+    pool.  Returns ``(members, unassigned, conflicts)``: the node tuples of every pool, the names of the nodes no
+    pool selects and, by node name, the pools of the nodes that more than one custom pool selects.
+    """
+    members = {pool["metadata"]["name"]: [] for pool in pools}
+    unassigned, conflicts = [], {}
+    for node in nodes:
+        name, labels, _boot_id = node
+        matches = [pool["metadata"]["name"] for pool in pools if selector_matches(pool.get("spec", {}).get("nodeSelector"), labels)]
+        if len(matches) > 1 and "worker" in matches:
+            matches.remove("worker")
+        if not matches:
+            unassigned.append(name)
+        elif len(matches) > 1:
+            conflicts[name] = matches
+        else:
+            members[matches[0]].append(node)
+    return members, unassigned, conflicts
 
 
-def get_pod_on_node(module, node, namespace, daemonset_label, retries, delay):
-    """Retrieve the pod running on a specific node."""
-    command = ["oc", "get", "pods", "-n", namespace, "-o", "json"]
-    stdout, error = run_command_with_retries(module, command, retries, delay)
+def resolve_max_unavailable(pool, count):
+    """Return how many of the *count* nodes of *pool* may be unavailable at once, like the MCO: at least one."""
+    value = pool.get("spec", {}).get("maxUnavailable")
+    if value is None:
+        return 1
+    try:
+        if isinstance(value, str) and value.strip().endswith("%"):
+            size = int(count * int(value.strip()[:-1]) / 100)
+        else:
+            size = int(value)
+    except ValueError:
+        return 1
+    return max(1, size)
+
+
+def plan_pool_reboots(module, wanted, nodes, retries, delay):
+    """Group *nodes* by MachineConfigPool; return ``({pool: {"nodes": [...], "max_unavailable": n}}, error)`` for the *wanted* pools."""
+    client = get_client(module)
+    pools_json, error = call_with_retries(module, lambda: client.list("machineconfigpools"), retries, delay)
+    if error:
+        return None, f"❌ Failed to list the MachineConfigPools: {error}"
+    pools = sorted(pools_json.get("items", []), key=lambda pool: pool["metadata"]["name"])
+    names = [pool["metadata"]["name"] for pool in pools]
+    if "all" not in wanted:
+        unknown = sorted(set(wanted) - set(names))
+        if unknown:
+            return None, f"❌ MachineConfigPool(s) not found: {', '.join(unknown)}. Existing pools: {', '.join(names)}."
+    members, unassigned, conflicts = assign_pools(pools, nodes)
+    if conflicts:
+        details = "; ".join(f"{node}: {', '.join(matches)}" for node, matches in sorted(conflicts.items()))
+        return None, f"❌ Nodes selected by more than one custom MachineConfigPool: {details}."
+    if unassigned:
+        module.warn(f"Nodes not selected by any MachineConfigPool are not rebooted: {', '.join(sorted(unassigned))}.")
+    plan = {}
+    for pool in pools:
+        name = pool["metadata"]["name"]
+        if ("all" in wanted or name in wanted) and members[name]:
+            plan[name] = {"nodes": members[name], "max_unavailable": resolve_max_unavailable(pool, len(members[name]))}
+    if not plan:
+        return None, "❌ No nodes found in the selected MachineConfigPools."
+    return plan, None
+
+
+def is_pod_usable(pod):
+    """Return True when the pod is running and not being deleted."""
+    return pod.get("status", {}).get("phase") == "Running" and not pod.get("metadata", {}).get("deletionTimestamp")
+
+
+def build_pod_index(module, namespace, label_selector, retries, delay):
+    """List the daemon pods once and map each node name to the pod running on it."""
+    client = get_client(module)
+    pods_json, error = call_with_retries(module, lambda: client.list("pods", namespace=namespace, label_selector=label_selector), retries, delay)
     if error:
         return None, error
 
-    try:
-        pods_json = json.loads(stdout)
-        for pod in pods_json.get("items", []):
-            pod_name = pod.get("metadata", {}).get("name")
-            pod_node = pod.get("spec", {}).get("nodeName")
-            labels = pod.get("metadata", {}).get("labels", {})
+    index = {}
+    for pod in pods_json.get("items", []):
+        pod_node = pod.get("spec", {}).get("nodeName")
+        if pod_node and (pod_node not in index or is_pod_usable(pod)):
+            index[pod_node] = pod
+    return index, None
 
-            if pod_node == node and daemonset_label in labels.values():
-                return pod_name, None
 
-        return None, f"❌ No matching pod found on node {node} for label {daemonset_label}."
+def refresh_pod_on_node(module, pod_index, node, namespace, label_selector, retries, delay):
+    """Re-read only the daemon pod of *node* and update its index entry."""
+    client = get_client(module)
+    pods_json, error = call_with_retries(
+        module, lambda: client.list("pods", namespace=namespace, label_selector=label_selector, field_selector=f"spec.nodeName={node}"), retries, delay
+    )
+    if error:
+        return None, error
+
+    pods = sorted(pods_json.get("items", []), key=is_pod_usable, reverse=True)
+    if not pods:
+        pod_index.pop(node, None)
+        return None, None
+    pod_index[node] = pods[0]
+    return pods[0], None
 
-    except json.JSONDecodeError:
-        return None, "❌ Failed to parse JSON output from `oc get pods`."
+
+def get_pod_on_node(module, pod_index, node, namespace, label_selector, retries, delay):
+    """Return the daemon pod on *node* from the index, refreshing the entry if it went stale."""
+    pod = pod_index.get(node)
+    if not pod or not is_pod_usable(pod):
+        pod, error = refresh_pod_on_node(module, pod_index, node, namespace, label_selector, retries, delay)
+        if error:
+            return None, error
+    if not pod:
+        return None, f"❌ No matching pod found on node {node} for label {label_selector}."
+    return pod["metadata"]["name"], None
 
 
 def reboot_node(module, pod, namespace, delay, retries, labels):
@@ -146,74 +379,435 @@ def reboot_node(module, pod, namespace, delay, retries, labels):
     return stdout, error
 
 
-def wait_for_nodes_unreachable(delay):
-    """Wait for nodes to reboot by sleeping for the specified delay in minutes."""
-    time.sleep(delay * 60)  # ⏳ Wait for reboot to take effect
+def resolve_wave_size(value, total):
+    """Turn a count ("10") or percentage ("25%") into a wave size between 1 and *total*."""
+    value = str(value).strip()
+    try:
+        if value.endswith("%"):
+            size = math.ceil(total * int(value[:-1]) / 100)
+        else:
+            size = int(value)
+    except ValueError:
+        return None, f"❌ Invalid wave_size '{value}': expected a count such as 10 or a percentage such as 25%."
+    if size < 1:
+        return None, f"❌ Invalid wave_size '{value}': it must select at least one node."
+    return min(size, total), None
+
+
+class NodeDrainer:
+    """Cordon nodes and evict their pods through the eviction API, so that PodDisruptionBudgets are respected.
+
+    The evictions of all the nodes being drained share one pool of *workers* threads.  An eviction the API server
+    refuses with 429 (the PodDisruptionBudget allows no disruption right now) is retried with backoff until the
+    node's drain deadline.
+    """
+
+    def __init__(self, module, timeout, workers, retries=3, delay=3):
+        self.module = module
+        self.client = get_client(module)
+        self.timeout = timeout
+        self.retries = retries
+        self.delay = delay
+        self.executor = ThreadPoolExecutor(max_workers=max(1, workers))
+        self.cancelled = threading.Event()
+
+    def set_unschedulable(self, node, unschedulable):
+        _unused, error = call_with_retries(
+            self.module, lambda: self.client.patch("nodes", node, {"spec": {"unschedulable": unschedulable or None}}), self.retries, self.delay
+        )
+        return error
+
+    def uncordon(self, node):
+        """Make *node* schedulable again; return an error message or None."""
+        error = self.set_unschedulable(node, False)
+        return f"❌ Failed to uncordon node {node}: {error}" if error else None
+
+    def pods_on(self, node):
+        return call_with_retries(self.module, lambda: self.client.list("pods", field_selector=f"spec.nodeName={node}"), self.retries, self.delay)
+
+    @staticmethod
+    def evictable(pod):
+        """Return True for the pods a drain evicts: not managed by a DaemonSet, not a mirror pod and not already terminating."""
+        metadata = pod.get("metadata", {})
+        if metadata.get("deletionTimestamp") or "kubernetes.io/config.mirror" in (metadata.get("annotations") or {}):
+            return False
+        return not any(owner.get("kind") == "DaemonSet" for owner in metadata.get("ownerReferences") or [])
+
+    def evict(self, pod, deadline):
+        """Evict one pod; return ``(seconds until the eviction was accepted, error)``.
+
+        The error is None with no seconds when the pod's PodDisruptionBudget still refused the eviction at *deadline*.
+        """
+        namespace, name = pod["metadata"].get("namespace"), pod["metadata"]["name"]
+        body = {"apiVersion": "policy/v1", "kind": "Eviction", "metadata": {"name": name, "namespace": namespace}}
+        start = time.monotonic()
+        schedule = PollSchedule(max(0.0, deadline - start), max_interval=MAX_EVICTION_INTERVAL)
+        while True:
+            _unused, error = self.client.create("pods", body, namespace=namespace, name=name, subresource="eviction")
+            if not error or error.status == 404:
+                return round(time.monotonic() - start, 1), None
+            if error.status != 429:
+                return None, f"Failed to evict pod {namespace}/{name}: {error}"
+            if schedule.expired() or self.cancelled.is_set():
+                return None, None
+            record("retry", "evict_pod")
+            time.sleep(schedule.next_delay())
+
+    def drain(self, node):
+        """Cordon *node*, evict its pods and wait for them to be gone; return ``(report, error)``.
+
+        On error the node is uncordoned again, since it will not be rebooted.
+        """
+        start = time.monotonic()
+        deadline = start + self.timeout
+        error = self.set_unschedulable(node, True)
+        if error:
+            return None, f"❌ Failed to cordon node {node}: {error}"
+        report, error = self._evict_all(node, deadline)
+        if error:
+            uncordon_error = self.uncordon(node)
+            if uncordon_error:
+                error = f"{error}; {uncordon_error}"
+            return None, f"❌ Failed to drain node {node}: {error}"
+        report["drain_seconds"] = round(time.monotonic() - start, 1)
+        return report, None
+
+    def _evict_all(self, node, deadline):
+        pods_json, error = self.pods_on(node)
+        if error:
+            return None, error
+        pods = [pod for pod in pods_json.get("items", []) if self.evictable(pod)]
+        if self.cancelled.is_set():
+            return None, "Drain cancelled"
+        futures = [(pod, self.executor.submit(self.evict, pod, deadline)) for pod in pods]
+        evictions, blocked, errors = [], [], []
+        for pod, future in futures:
+            key = f"{pod['metadata'].get('namespace')}/{pod['metadata']['name']}"
+            try:
+                seconds, error = future.result()
+            except CancelledError:
+                seconds, error = None, f"Eviction of pod {key} cancelled"
+            if error:
+                errors.append(error)
+            elif seconds is None:
+                blocked.append(key)
+            else:
+                evictions.append({"pod": key, "seconds": seconds})
+        if blocked:
+            errors.append(f"PodDisruptionBudgets did not allow evicting {', '.join(blocked)} within {self.timeout}s")
+        if errors:
+            return None, "; ".join(errors)
+
+        # The evicted pods terminate gracefully; the node is drained once none of them is left on it.
+        evicted = {pod["metadata"].get("uid") or (pod["metadata"].get("namespace"), pod["metadata"]["name"]) for pod in pods}
+        remaining = []
+        for _attempt in poll(max(0.0, deadline - time.monotonic()), max_interval=MAX_EVICTION_INTERVAL):
+            pods_json, error = self.pods_on(node)
+            if error:
+                return None, error
+            remaining = [
+                f"{pod['metadata'].get('namespace')}/{pod['metadata']['name']}" for pod in pods_json.get("items", [])
+                if (pod["metadata"].get("uid") or (pod["metadata"].get("namespace"), pod["metadata"]["name"])) in evicted
+            ]
+            if not remaining or self.cancelled.is_set():
+                break
+        if remaining:
+            return None, f"Evicted pods still on the node after {self.timeout}s: {', '.join(sorted(remaining))}"
+        evictions.sort(key=lambda eviction: eviction["seconds"], reverse=True)
+        return {"evicted_pods": len(evictions), "slowest_evictions": evictions[:SLOWEST_EVICTIONS]}, None
+
+    def cancel(self):
+        """Make the drains in progress give up at their next retry and drop the queued evictions."""
+        self.cancelled.set()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def close(self):
+        self.executor.shutdown(wait=True)
+
+
+def reboot_one(module, node, labels, delay, pod_index, namespace, label_selector, retries, retry_delay, drainer=None):
+    """Drain *node* when a *drainer* is given, then find its MCD pod and send it the reboot command."""
+    drained = {}
+    if drainer:
+        drained, error = drainer.drain(node)
+        if error:
+            return {"node": node, "status": "failed", "error": error}
 
+    pod, error = get_pod_on_node(module, pod_index, node, namespace, label_selector, retries, retry_delay)
+    if not error:
+        sent_at = time.time()
+        stdout, error = reboot_node(module, pod, namespace, delay, retries, labels)
+        if error:
+            # The indexed pod may have been replaced since the index was built
+            fresh, refresh_error = refresh_pod_on_node(module, pod_index, node, namespace, label_selector, retries, retry_delay)
+            if not refresh_error and fresh and fresh["metadata"]["name"] != pod:
+                stdout, error = reboot_node(module, fresh["metadata"]["name"], namespace, delay, retries, labels)
+    else:
+        error = f"Failed to get pod for node {node}: {error}"
+    if error:
+        if drainer:
+            uncordon_error = drainer.uncordon(node)
+            if uncordon_error:
+                error = f"{error}; {uncordon_error}"
+        return dict(drained, node=node, status="failed", error=error)
+    return dict(drained, node=node, status="success", output=stdout, sent_at=sent_at)
+
+
+def wait_for_nodes_rebooted(module, boot_ids, sent_at, timeout):
+    """Track each node until it reports a boot ID other than the recorded one and Ready=True.
+
+    Returns ``(rebooted, error)`` where *rebooted* maps node name to its new boot ID and
+    the seconds it took from sending the reboot command.
+    """
+    client = get_client(module)
+    rebooted = {}
+
+    def all_rebooted(nodes):
+        for node in nodes:
+            name = node.get("metadata", {}).get("name")
+            if name not in boot_ids or name in rebooted:
+                continue
+            boot_id = node.get("status", {}).get("nodeInfo", {}).get("bootID")
+            if boot_id and boot_id != boot_ids[name] and condition_status(node, "Ready") == "True":
+                rebooted[name] = {"boot_id": boot_id, "reboot_seconds": round(time.time() - sent_at[name], 1)}
+        return len(rebooted) == len(boot_ids)
+
+    _unused, error = client.wait_for("nodes", all_rebooted, timeout)
+    return rebooted, error
+
+
+def finish_reboots(module, boot_ids, sent_at, timeout, results, drainer=None):
+    """Wait for the nodes of *boot_ids* to come back, record it in *results* and, with a *drainer*, uncordon them.
+
+    Returns the sorted names of the nodes that were not back within *timeout* seconds.
+    """
+    rebooted, error = wait_for_nodes_rebooted(module, boot_ids, sent_at, timeout)
+    for result in results:
+        result.update(rebooted.get(result["node"], {}))
+    if drainer:
+        for node in rebooted:
+            uncordon_error = drainer.uncordon(node)
+            if uncordon_error:
+                module.warn(uncordon_error)
+    return sorted(set(boot_ids) - set(rebooted)) if error else []
+
+
+def reboot_pools(module, plan, pod_index, namespace, label_selector, delay, retries, retry_delay, timeout, drainer=None):
+    """Reboot the pools of *plan* concurrently, each with at most ``max_unavailable`` of its nodes rebooting at a time.
+
+    One watch on the nodes drives the whole run: whenever a rebooting node is back with a new boot ID and Ready=True
+    its slot goes to the next node of its pool (and, with a *drainer*, the node is uncordoned).  Returns
+    ``(results, pools, error)``; the run stops at the first drain or reboot command that fails or node that is not
+    back within *timeout* seconds (plus the delay of a master and the drain timeout).
+    """
+    client = get_client(module)
+    pending = {pool: deque(entry["nodes"]) for pool, entry in plan.items()}
+    rebooting = {pool: {} for pool in plan}  # pool -> {node: (future, boot_id, deadline)}
+    results = {}
+    order = {pool: [] for pool in plan}
+    failed = {pool: [] for pool in plan}
+    errors = []
+    workers = max(1, min(sum(entry["max_unavailable"] for entry in plan.values()), MAX_PARALLEL_COMMANDS))
+
+    def advance(nodes):
+        by_name = {node["metadata"]["name"]: node for node in nodes}
+        now = time.time()
+        for pool, slots in rebooting.items():
+            for name, (future, boot_id, deadline) in list(slots.items()):
+                if future.done():
+                    result = future.result()
+                    if result["status"] == "failed":
+                        del slots[name]
+                        results[name] = result
+                        failed[pool].append(name)
+                        errors.append(result["error"])
+                        continue
+                    node = by_name.get(name, {})
+                    new_boot_id = node.get("status", {}).get("nodeInfo", {}).get("bootID")
+                    if new_boot_id and new_boot_id != boot_id and condition_status(node, "Ready") == "True":
+                        del slots[name]
+                        result.update(boot_id=new_boot_id, reboot_seconds=round(now - result.pop("sent_at"), 1))
+                        results[name] = result
+                        if drainer:
+                            uncordon_error = drainer.uncordon(name)
+                            if uncordon_error:
+                                module.warn(uncordon_error)
+                        continue
+                if now > deadline:
+                    del slots[name]
+                    error = f"Node {name} did not come back with a new boot ID and Ready=True within the {timeout}s timeout."
+                    results[name] = {"node": name, "status": "failed", "error": error}
+                    failed[pool].append(name)
+                    errors.append(error)
+        if errors:
+            return False
+        for pool, slots in rebooting.items():
+            while pending[pool] and len(slots) < plan[pool]["max_unavailable"]:
+                name, labels, boot_id = pending[pool].popleft()
+                master = "node-role.kubernetes.io/master" in labels
+                future = executor.submit(reboot_one, module, name, labels, delay, pod_index, namespace, label_selector, retries, retry_delay, drainer)
+                slots[name] = (future, boot_id, time.time() + timeout + (delay * 60 if master else 0) + (drainer.timeout if drainer else 0))
+                order[pool].append(name)
+        return not any(pending.values()) and not any(rebooting.values())
+
+    # Backstop for the whole run; every node is held to its own deadline above.
+    rounds = max(math.ceil(len(entry["nodes"]) / entry["max_unavailable"]) for entry in plan.values())
+    per_node = timeout + delay * 60 + (drainer.timeout if drainer else 0)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        _unused, error = client.wait_for(
+            "nodes", advance, rounds * per_node + 60, resync_seconds=15, stop=lambda _nodes: "; ".join(errors) if errors else None
+        )
+        if error:
+            if drainer:
+                drainer.cancel()
+            executor.shutdown(wait=False, cancel_futures=True)
 
-def wait_for_nodes_ready(module, timeout, retries, delay):
-    """Wait for all nodes to become ready within a timeout."""
-    start_time = time.time()
-    while time.time() - start_time < timeout:
-        command = ["oc", "wait", "node", "--all", "--for", "condition=ready", "--timeout=60s"]
-        stdout, error = run_command_with_retries(module, command, retries, delay)
-        if not error:
-            return True
-        time.sleep(10)
-    return False
+    reboot_results = []
+    for pool in plan:
+        for name in order[pool]:
+            result = results.get(name, {"node": name, "status": "rebooting"})
+            reboot_results.append(dict(result, pool=pool))
+    pools = [
+        {"pool": pool, "nodes": order[pool], "max_unavailable": plan[pool]["max_unavailable"], "failed": failed[pool]} for pool in plan
+    ]
+    return reboot_results, pools, error
 
 
 def main():
     module_args = dict(
-        role=dict(type="str", required=True, choices=["master", "worker"]),
+        role=dict(type="str", choices=["master", "worker"]),
+        pools=dict(type="list", elements="str"),
         namespace=dict(type="str", required=True),
         daemonset_label=dict(type="str", required=True),
+        daemonset_label_key=dict(type="str", default="k8s-app", no_log=False),
         delay=dict(type="int", default=1),
         retries=dict(type="int", default=3),
         retry_delay=dict(type="int", default=3),
         timeout=dict(type="int", default=1800),  # Default timeout for nodes to come back
+        wave_size=dict(type="str", default="1", aliases=["concurrency"]),
+        drain=dict(type="bool", default=False),
+        drain_timeout=dict(type="int", default=600),
+        drain_workers=dict(type="int", default=20),
     )
 
-    module = AnsibleModule(argument_spec=module_args, supports_check_mode=True)
+    module = AnsibleModule(
+        argument_spec=module_args, mutually_exclusive=[("role", "pools")], required_one_of=[("role", "pools")], supports_check_mode=True
+    )
 
     role = module.params["role"]
     namespace = module.params["namespace"]
-    daemonset_label = module.params["daemonset_label"]
+    label_selector = f"{module.params['daemonset_label_key']}={module.params['daemonset_label']}"
     delay = module.params["delay"]
     retries = module.params["retries"]
     retry_delay = module.params["retry_delay"]
     timeout = module.params["timeout"]
+    action = "drain and reboot" if module.params["drain"] else "reboot"
+    drainer = None
+    if module.params["drain"] and not module.check_mode:
+        drainer = NodeDrainer(module, module.params["drain_timeout"], module.params["drain_workers"], retries, retry_delay)
 
-    # Step 1: Get nodes of the specified role
-    nodes, error = get_nodes(module, role, retries, retry_delay)
+    # Step 1: Get nodes of the specified role, or every node for the pools
+    nodes, error = get_nodes(module, role or "all", retries, retry_delay)
     if error:
-        module.fail_json(msg=f"❌ Failed to get {role} nodes: {error}")
+        module.fail_json(msg=f"❌ Failed to get {role or 'the'} nodes: {error}")
 
-    # Step 2: Reboot nodes sequentially
-    reboot_results = []
-    for node, labels in nodes:
-        pod, error = get_pod_on_node(module, node, namespace, daemonset_label, retries, retry_delay)
-        if error:
-            module.fail_json(msg=f"❌ Failed to get pod for node {node}: {error}")
+    # Index the daemon pods by node once for the whole run
+    pod_index, error = build_pod_index(module, namespace, label_selector, retries, retry_delay)
+    if error:
+        module.fail_json(msg=f"❌ Failed to list pods with label {label_selector}: {error}")
 
-        stdout, error = reboot_node(module, pod, namespace, delay, retries, labels)
+    if module.params["pools"]:
+        plan, error = plan_pool_reboots(module, module.params["pools"], nodes, retries, retry_delay)
         if error:
-            reboot_results.append({"node": node, "status": "failed", "error": error})
-            module.fail_json(msg=f"❌ Failed to reboot node {node} due to error: {error}")
-        else:
-            reboot_results.append({"node": node, "status": "success", "output": stdout})
-
-        if "node-role.kubernetes.io/master" in labels:
-            delay += 3  # 🔄 Increment delay only for master nodes
+            module.fail_json(msg=error)
+        if module.check_mode:
+            pools = [
+                {"pool": pool, "nodes": [node for node, _labels, _boot_id in entry["nodes"]], "max_unavailable": entry["max_unavailable"], "failed": []}
+                for pool, entry in plan.items()
+            ]
+            module.exit_json(changed=True, results=[], pools=pools, msg=f"Would {action} the nodes of {len(pools)} MachineConfigPool(s).")
+        reboot_results, pools, error = reboot_pools(module, plan, pod_index, namespace, label_selector, delay, retries, retry_delay, timeout, drainer)
+        if drainer:
+            drainer.close()
+        if error:
+            module.fail_json(msg=f"❌ Rolling reboot of the MachineConfigPools failed: {error}", results=reboot_results, pools=pools)
+        module.exit_json(changed=True, results=reboot_results, pools=pools, msg="✅ All nodes rebooted and ready.")
 
-    # Step 3: Wait for API server to become reachable
-    wait_for_nodes_unreachable(delay)
+    # Masters stay staggered one at a time; other nodes go out in waves
+    if role == "master":
+        wave_size = 1
+    else:
+        wave_size, error = resolve_wave_size(module.params["wave_size"], len(nodes))
+        if error:
+            module.fail_json(msg=error)
 
-    # Step 4: Wait for all nodes to become ready
-    if not wait_for_nodes_ready(module, timeout, retries, retry_delay):
-        module.fail_json(msg="❌ Nodes did not become ready within the timeout period.")
+    if module.check_mode:
+        waves = [
+            {"wave": index + 1, "nodes": [node for node, _labels, _boot_id in nodes[start:start + wave_size]], "failed": []}
+            for index, start in enumerate(range(0, len(nodes), wave_size))
+        ]
+        module.exit_json(changed=True, results=[], waves=waves, msg=f"Would {action} {len(nodes)} node(s) in {len(waves)} wave(s).")
 
-    module.exit_json(changed=True, results=reboot_results, msg="✅ All nodes rebooted and ready.")
+    # Step 2: Reboot nodes (after draining them, if asked) wave by wave over a bounded worker pool
+    boot_ids = {node: boot_id for node, _labels, boot_id in nodes}
+    reboot_results = []
+    waves = []
+    sent_at = {}
+    with ThreadPoolExecutor(max_workers=wave_size) as executor:
+        for start in range(0, len(nodes), wave_size):
+            wave = []
+            for node, labels, _boot_id in nodes[start:start + wave_size]:
+                wave.append((node, labels, delay))
+                # A drained wave is back before the next one is drained, so drained masters need no extra stagger
+                if "node-role.kubernetes.io/master" in labels and not drainer:
+                    delay += 3  # 🔄 Increment delay only for master nodes
+
+            results = list(
+                executor.map(lambda args: reboot_one(module, *args, pod_index, namespace, label_selector, retries, retry_delay, drainer), wave)
+            )
+            for result in results:
+                result["wave"] = len(waves) + 1
+                if "sent_at" in result:
+                    sent_at[result["node"]] = result.pop("sent_at")
+            reboot_results.extend(results)
+
+            failed = [r["node"] for r in results if r["status"] == "failed"]
+            waves.append({"wave": len(waves) + 1, "nodes": [r["node"] for r in results], "failed": failed})
+            if failed:
+                errors = "; ".join(r["error"] for r in results if r["status"] == "failed")
+                module.fail_json(
+                    msg=f"❌ Failed to reboot node(s) {', '.join(failed)} in wave {len(waves)} due to error: {errors}",
+                    results=reboot_results,
+                    waves=waves,
+                )
+
+            # Drained nodes must be back and uncordoned before the next wave is drained
+            if drainer:
+                wave_boot_ids = {r["node"]: boot_ids[r["node"]] for r in results}
+                pending = finish_reboots(module, wave_boot_ids, sent_at, timeout + delay * 60, results, drainer)
+                if pending:
+                    drainer.close()
+                    module.fail_json(
+                        msg=f"❌ Nodes of wave {len(waves)} did not reboot and become ready within the timeout period: {', '.join(pending)}.",
+                        results=reboot_results,
+                        waves=waves,
+                    )
+
+    if drainer:
+        drainer.close()
+        module.exit_json(changed=True, results=reboot_results, waves=waves, msg="✅ All nodes rebooted and ready.")
+
+    # Step 3: Wait until every node is back with a new boot ID and Ready=True.
+    # Masters reboot on a schedule, so allow for the last scheduled delay as well.
+    pending = finish_reboots(module, boot_ids, sent_at, timeout + delay * 60, reboot_results)
+    if pending:
+        module.fail_json(
+            msg=f"❌ Nodes did not reboot and become ready within the timeout period: {', '.join(pending)}.",
+            results=reboot_results,
+            waves=waves,
+        )
+
+    module.exit_json(changed=True, results=reboot_results, waves=waves, msg="✅ All nodes rebooted and ready.")
 
 
 if __name__ == "__main__":
@@ -10,13 +10,17 @@ version_added: "1.0.0"
 author: Miheer Salunke (@miheer)
 description:
   - Unpauses the mcp after reboot.
+  - Every paused machine config pool is resumed, custom pools such as C(infra) included, since the rollback pauses
+    them all.
 options:
   timeout:
     description: timeout in seconds.
     type: int
     default: 1800
   sleep_interval:
-    description: Sleep in seconds between oc command retries.
+    description:
+      - Longest sleep in seconds between retries. The first retry follows within a second, then the sleep doubles
+        up to this value, with jitter.
     type: int
     default: 10
 """
@@ -31,21 +35,16 @@ changed:
   description: Whether the CR was modified.
   type: bool
   returned: always
+pools:
+  description: Names of the machine config pools that were resumed.
+  type: list
+  elements: str
+  returned: success
 """
 
 from ansible.module_utils.basic import AnsibleModule
-import time
-import json
-
-
-def run_command(module, command):
-    """Run a shell command safely using module.run_command and return output or raise an error."""
-    rc, stdout, stderr = module.run_command(command)
-
-    if rc == 0:
-        return stdout.strip(), None  # Success
-
-    return None, f"Command '{' '.join(command)}' failed: {stderr.strip()}"
+from ansible_collections.network.offline_migration_sdn_to_ovnk.plugins.module_utils.kube_client import get_client
+from ansible_collections.network.offline_migration_sdn_to_ovnk.plugins.module_utils.polling import poll
 
 
 def main():
@@ -59,23 +58,28 @@ def main():
     timeout = module.params["timeout"]
     sleep_interval = module.params["sleep_interval"]
 
-    # Patch commands for MCPs
-    patch = {"spec": {"paused": False}}
-    patch_master_cmd = ["oc", "patch", "MachineConfigPool", "master", "--type=merge", "--patch", json.dumps(patch)]
-    patch_worker_cmd = ["oc", "patch", "MachineConfigPool", "worker", "--type=merge", "--patch", json.dumps(patch)]
+    client = get_client(module)
 
-    end_time = time.time() + timeout
-
-    while time.time() < end_time:
-        master_output, master_error = run_command(module, patch_master_cmd)
-        worker_output, worker_error = run_command(module, patch_worker_cmd)
-
-        if not master_error and not worker_error:
-            module.exit_json(changed=True, msg="Successfully resumed master and worker MCPs.")
-
-        time.sleep(sleep_interval)
+    # Patch for MCPs
+    patch = {"spec": {"paused": False}}
 
-    module.fail_json(msg="Failed to resume MCPs within the timeout period.")
+    resumed = []
+    error = None
+    for _attempt in poll(timeout, max_interval=sleep_interval):
+        pools_json, error = client.list("machineconfigpools")
+        if error:
+            continue
+        paused = sorted(pool["metadata"]["name"] for pool in pools_json.get("items", []) if pool.get("spec", {}).get("paused"))
+        for name in paused:
+            _unused, error = client.patch("machineconfigpools", name, patch)
+            if error:
+                break
+            resumed.append(name)
+        if not error:
+            names = ", ".join(sorted(set(resumed))) or "none were paused"
+            module.exit_json(changed=bool(resumed), msg=f"Successfully resumed MCPs: {names}.", pools=sorted(set(resumed)))
+
+    module.fail_json(msg=f"Failed to resume MCPs within the timeout period: {error}")
 
 
 if __name__ == "__main__":
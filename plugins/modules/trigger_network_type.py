@@ -17,6 +17,11 @@ description:
     that OVN-Kubernetes reserves internally
     (``100.64.0.0/16``, ``169.254.169.0/29``, ``100.88.0.0/16``,
     ``fd98::/64``, ``fd69::/125`` and ``fd97::/64``).
+  - Before patching, a new C(cidr) and C(prefix) are checked against the
+    live cluster. The number of per-node subnets must cover the current node
+    count plus C(node_headroom). The CIDR must not overlap the service or
+    machine networks. The module fails before any change with the computed
+    numbers otherwise.
   - Uses the ``oc patch`` CLI and retries transient failures automatically.
 options:
   network_type:
@@ -36,6 +41,13 @@ options:
       - Host prefix length that accompanies C(cidr).
       - Required only when C(cidr) is supplied.
     type: int
+  node_headroom:
+    description:
+      - Number of nodes beyond the current node count that C(cidr) with
+        C(prefix) must still have a per-node subnet for.
+      - Only used when C(cidr) is supplied.
+    type: int
+    default: 0
   timeout:
     description:
       - Maximum time (in seconds) to wait for the ``oc patch`` command to
@@ -69,112 +81,31 @@ msg:
   type: str
   returned: always
 output:
-  description: Raw stdout returned by the underlying ``oc patch`` command.
+  description: Summary of the patch applied to ``network.config.openshift.io/cluster``.
   type: str
   returned: when successful
+plan:
+  description: Capacity plan computed for a new cluster network.
+  type: dict
+  returned: when cidr is supplied
+  sample:
+    cidr: 10.128.0.0/14
+    host_prefix: 23
+    subnets: 512
+    addresses_per_node: 512
+    nodes: 120
+    node_headroom: 0
+    free_subnets: 392
+    overlaps: []
 """
 
 from ansible.module_utils.basic import AnsibleModule
-import time
-import json
-import ipaddress
-
-
-def run_command_with_retries(module, command, retries=3, delay=3):
-    """Execute a shell command with retries on failure."""
-    for attempt in range(retries):
-        rc, stdout, stderr = module.run_command(command)
-
-        if rc == 0:
-            return stdout.strip(), None  # Success
-
-        if attempt < retries - 1:
-            module.warn(f"Retrying in {delay} seconds due to error: {stderr.strip()}")
-            time.sleep(delay)  # Wait before retrying
-        else:
-            return None, f"Command failed after {retries} attempts: {stderr.strip()}"
-
-    return None, "Unknown error"
-
-
-# ─────────────────────────────────────────────────────────────
-# ADD a reusable deny-list of networks that must not overlap
-# ─────────────────────────────────────────────────────────────
-FORBIDDEN_NETS = [
-    ipaddress.ip_network("100.64.0.0/16"),
-    ipaddress.ip_network("169.254.169.0/29"),
-    ipaddress.ip_network("100.88.0.0/16"),
-    ipaddress.ip_network("fd98::/64"),
-    ipaddress.ip_network("fd69::/125"),
-    ipaddress.ip_network("fd97::/64"),
-]
-
-
-# ─────────────────────────────────────────────────────────────
-def _ensure_no_overlap(cidr):
-    """Validate that *cidr* does not overlap any forbidden network."""
-    new_net = ipaddress.ip_network(cidr, strict=False)
-    for bad in FORBIDDEN_NETS:
-        if new_net.overlaps(bad):
-            raise ValueError(
-                f"The provided migration_cidr ({cidr}) overlaps with "
-                f"reserved network {bad}."
-            )
-# ─────────────────────────────────────────────────────────────
-
-
-def _build_patch(cidr, prefix, network_type):
-    """
-    Render the JSON patch that oc will consume.
-
-    NOTE: *prefix* arrives from Ansible already as an int (see argument_spec),
-    so we no longer cast it with int().
-    """
-    if cidr and prefix is not None:
-        return {
-            "spec": {
-                "clusterNetwork": [{
-                    "cidr": cidr,
-                    "hostPrefix": prefix,   # already int
-                }],
-                "networkType": network_type,
-            }
-        }
-    return {"spec": {"networkType": network_type}}
+from ansible_collections.network.offline_migration_sdn_to_ovnk.plugins.module_utils.migration_steps import STEP_SPECS, run_trigger_network_type
 
 
 def main():
-    module_args = dict(
-        cidr=dict(type="str", required=False),
-        prefix=dict(type="int", required=False),
-        network_type=dict(type="str", choices=["OVNKubernetes", "OpenShiftSDN"], required=True),  # Target network type
-        timeout=dict(type="int", required=False, default=60),  # Timeout in seconds
-    )
-
-    module = AnsibleModule(argument_spec=module_args)
-
-    network_type = module.params["network_type"]
-    cidr = module.params["cidr"]
-    prefix = module.params["prefix"]
-
-    try:
-        # Validate (if provided)
-        if cidr:
-            try:
-                ipaddress.ip_network(cidr, strict=False)  # syntax check
-            except ValueError as exc:
-                module.fail_json(msg=f"Invalid CIDR '{cidr}': {exc}")
-            try:
-                _ensure_no_overlap(cidr)
-            except ValueError as exc:
-                module.fail_json(msg=str(exc))
-        patch = _build_patch(cidr, prefix, network_type)
-        patch_command = ["oc", "patch", "Network.config.openshift.io", "cluster", "--type=merge", "--patch", json.dumps(patch)]
-        result, error = run_command_with_retries(module, patch_command)
-        if not error:
-            module.exit_json(changed=True, msg=f"Successfully triggered {network_type} deployment.", output=result)
-    except Exception as e:
-        module.fail_json(msg=str(e))
+    module = AnsibleModule(**STEP_SPECS["trigger_network_type"])
+    run_trigger_network_type(module)
 
 
 if __name__ == "__main__":
@@ -10,6 +10,14 @@ version_added: "1.0.0"
 author: Miheer Salunke (@miheer)
 description:
   - Verify if all cluster operators are healthy.
+  - By default every iteration takes one snapshot of the cluster operators and machine config pools and evaluates
+    all O(conditions) in-process, reporting each object and condition that does not match.
+  - When O(checks) is given, the listed shell commands are run instead, one after another.
+  - After a failed check the next one follows within a second, then the delay doubles up to 30 seconds, with jitter,
+    until a check passes.
+  - Fails early when the failed checks stop changing for O(stall_timeout) seconds, for example when a pool is stuck
+    on a degraded node or an operator is wedged, and reports the failing conditions with their reasons and messages
+    and the machine counts of the affected pools.
 options:
   max_timeout:
     description: Max timeout for retrying the status of cluster operators.
@@ -27,10 +35,40 @@ options:
     required: false
     default: 3
   checks:
-    description: List of oc commands to check the cluster operator availability.
-    required: true
+    description:
+      - List of oc commands to check the cluster operator availability.
+      - Kept for compatibility. Mutually exclusive with O(conditions).
+    required: false
     type: list
     elements: str
+  stable_for:
+    description:
+      - Number of seconds every checked condition must have held, judged from its C(lastTransitionTime).
+      - When set, a snapshot in which all conditions match passes as soon as the youngest matching transition is
+        older than O(stable_for); otherwise the module sleeps only until it is, then takes a new snapshot.
+        O(required_success_count) and O(pause_between_checks) are not used in this mode.
+      - Conditions without a C(lastTransitionTime) are timed from when the module first saw them.
+      - Only applies to O(conditions); ignored when O(checks) is used.
+    required: false
+    type: int
+  conditions:
+    description:
+      - Expected condition statuses, keyed by resource kind and then by condition type.
+      - Supported kinds are C(clusteroperators) and C(machineconfigpools).
+      - Defaults to C(Available=True), C(Progressing=False) and C(Degraded=False) for cluster operators and
+        C(Updated=True), C(Updating=False) and C(Degraded=False) for machine config pools.
+    required: false
+    type: dict
+  stall_timeout:
+    description:
+      - Seconds after which to give up when no progress is seen, instead of waiting for O(max_timeout).
+      - Progress means a change in the statuses, reasons or messages of the failing conditions or in the machine counts
+        of the failing machine config pools (with O(checks), in the output of the failing check), or a passing check.
+      - Defaults to C(1800) with O(conditions). With O(checks) the only progress signal is the output of C(oc wait),
+        which does not change during a slow but healthy rollout, so the detection is off unless O(stall_timeout) is set.
+      - C(0) disables the detection.
+    required: false
+    type: int
 """
 EXAMPLES = r"""
 - name: Check all cluster operators back to normal
@@ -40,21 +78,63 @@ EXAMPLES = r"""
     required_success_count: 3
     checks: "{{ post_rollback_checks }}"
   register: result
+
+- name: Check cluster operators and machine config pools from one snapshot per iteration
+  network.offline_migration_sdn_to_ovnk.verify_cluster_operators_health:
+    conditions:
+      clusteroperators:
+        Available: "True"
+        Progressing: "False"
+        Degraded: "False"
+      machineconfigpools:
+        Updating: "False"
+        Degraded: "False"
+
+- name: Pass immediately if every condition has held for at least 60 seconds
+  network.offline_migration_sdn_to_ovnk.verify_cluster_operators_health:
+    stable_for: 60
 """
 RETURN = r"""
 changed:
   description: Whether the CR was modified.
   type: bool
   returned: always
+failures:
+  description: Objects whose conditions did not match in the last snapshot.
+  type: list
+  elements: str
+  returned: on failure in structured mode
+  sample: ["clusteroperator/dns: Degraded is True, expected False"]
+stalled:
+  description: Whether the module gave up because nothing progressed for O(stall_timeout) seconds.
+  type: bool
+  returned: on failure
 """
 
 from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.network.offline_migration_sdn_to_ovnk.plugins.module_utils.kube_client import (
+    describe_condition,
+    get_client,
+    get_condition,
+    parse_timestamp,
+)
+from ansible_collections.network.offline_migration_sdn_to_ovnk.plugins.module_utils.metrics import timed_run_command
+from ansible_collections.network.offline_migration_sdn_to_ovnk.plugins.module_utils.migration_steps import MACHINE_COUNTS
+from ansible_collections.network.offline_migration_sdn_to_ovnk.plugins.module_utils.polling import PollSchedule, StallDetector
 import time
 
+DEFAULT_CONDITIONS = {
+    "clusteroperators": {"Available": "True", "Progressing": "False", "Degraded": "False"},
+    "machineconfigpools": {"Updated": "True", "Updating": "False", "Degraded": "False"},
+}
+KIND_LABELS = {"clusteroperators": "clusteroperator", "machineconfigpools": "machineconfigpool"}
+# Seconds without progress before giving up, with O(conditions)
+DEFAULT_STALL_TIMEOUT = 1800
+
 
 def run_command(module, command):
     """Run a shell command safely using module.run_command and return output or error."""
-    rc, stdout, stderr = module.run_command(command)
+    rc, stdout, stderr = timed_run_command(module, command)
 
     if rc == 0:
         return stdout.strip(), None  # ✅ Success
@@ -72,28 +152,163 @@ def check_cluster_operators(module, checks):
     return True, "✅ Cluster operators meet required conditions."
 
 
+def normalize_conditions(module, conditions):
+    """Validate the conditions option and turn every expected status into the API's "True"/"False" string."""
+    normalized = {}
+    for kind, expected in conditions.items():
+        if kind not in KIND_LABELS:
+            module.fail_json(msg=f"Unsupported kind '{kind}' in conditions, expected one of: {', '.join(KIND_LABELS)}.")
+        if not isinstance(expected, dict):
+            module.fail_json(msg=f"conditions.{kind} must map condition types to their expected status.")
+        normalized[kind] = {str(ctype): str(status) for ctype, status in expected.items()}
+    return normalized
+
+
+def take_snapshot(module, kinds):
+    """List every kind once; return ``({kind: items}, error)``."""
+    client = get_client(module)
+    snapshot = {}
+    for kind in kinds:
+        output, error = client.list(kind)
+        if error:
+            return None, error
+        snapshot[kind] = output.get("items", [])
+    return snapshot, None
+
+
+def evaluate_snapshot(snapshot, conditions, first_seen=None):
+    """Return the unmatched conditions in the snapshot and the epoch time of the youngest matched transition."""
+    failures = []
+    youngest = None
+    now = time.time()
+    for kind, expected in conditions.items():
+        for obj in snapshot.get(kind, []):
+            name = obj.get("metadata", {}).get("name")
+            for condition_type, status in expected.items():
+                condition = get_condition(obj, condition_type)
+                actual = condition.get("status", "Unknown")
+                if actual != status:
+                    failures.append(f"{KIND_LABELS[kind]}/{name}: {condition_type} is {actual}, expected {status}")
+                    continue
+                transition = parse_timestamp(condition.get("lastTransitionTime"))
+                if transition is None and first_seen is not None:
+                    transition = first_seen.setdefault((kind, name, condition_type, actual), now)
+                if transition is not None and (youngest is None or transition > youngest):
+                    youngest = transition
+    return failures, youngest
+
+
+def failing_details(snapshot, conditions):
+    """Describe every object with an unmatched condition: its failing conditions with reason and message, and for pools the machine counts.
+
+    These are also the progress signals of the wait: as long as they change, the cluster is still moving.
+    """
+    details = {}
+    for kind, expected in conditions.items():
+        for obj in snapshot.get(kind, []):
+            failing = [
+                describe_condition(obj, condition_type)
+                for condition_type, status in expected.items()
+                if get_condition(obj, condition_type).get("status", "Unknown") != status
+            ]
+            if not failing:
+                continue
+            if kind == "machineconfigpools":
+                status = obj.get("status", {})
+                failing.append(", ".join(f"{count}={status.get(count, 0)}" for count in MACHINE_COUNTS))
+            details[f"{KIND_LABELS[kind]}/{obj.get('metadata', {}).get('name')}"] = failing
+    return details
+
+
+def check_conditions(module, conditions, stable_for=None, first_seen=None, stall=None):
+    """Evaluate all conditions against one snapshot; return ``(success, message, failures, wait)``.
+
+    ``wait`` is the number of seconds until the youngest matching transition is ``stable_for`` seconds old.
+    When a *stall* detector is given, it observes the failing details and a stall turns the message into a diagnosis.
+    """
+    snapshot, error = take_snapshot(module, conditions)
+    if error:
+        return False, f"❌ Failed to read cluster state: {error}", [], 0
+    failures, youngest = evaluate_snapshot(snapshot, conditions, first_seen)
+    if failures:
+        details = failing_details(snapshot, conditions)
+        if stall is not None and stall.observe(details):
+            return False, "; ".join(f"{name}: {', '.join(failing)}" for name, failing in sorted(details.items())), failures, 0
+        return False, "; ".join(failures), failures, 0
+    if stable_for is not None and youngest is not None:
+        wait = youngest + stable_for - time.time()
+        if wait > 0:
+            return False, f"⏳ Conditions met, but the latest transition is only {stable_for - wait:.0f}s old.", [], wait
+    return True, "✅ Cluster operators meet required conditions.", [], 0
+
+
+def fail_if_stalled(module, stall, message, failures):
+    """Give up when the failed checks have not changed for the stall window."""
+    if stall.stalled():
+        module.fail_json(msg=f"❌ No progress towards the required conditions in {stall.window}s: {message}", failures=failures, stalled=True)
+
+
 def main():
     module = AnsibleModule(
         argument_spec=dict(
             max_timeout=dict(type="int", required=False, default=2700),  # ⏳ Default timeout
             pause_between_checks=dict(type="int", required=False, default=30),
             required_success_count=dict(type="int", required=False, default=3),
-            checks=dict(type="list", elements="str", required=True),
-        )
+            checks=dict(type="list", elements="str", required=False),
+            conditions=dict(type="dict", required=False),
+            stable_for=dict(type="int", required=False),
+            stall_timeout=dict(type="int", required=False),
+        ),
+        mutually_exclusive=[("checks", "conditions")],
     )
 
     max_timeout = module.params["max_timeout"]
     pause_between_checks = module.params["pause_between_checks"]
     required_success_count = module.params["required_success_count"]
     checks = module.params["checks"]
+    stable_for = module.params["stable_for"]
+    stall_timeout = module.params["stall_timeout"]
+    if stall_timeout is None:
+        stall_timeout = 0 if checks else DEFAULT_STALL_TIMEOUT
+    stall = StallDetector(stall_timeout)
+    conditions = None
+    if not checks:
+        conditions = normalize_conditions(module, module.params["conditions"] or DEFAULT_CONDITIONS)
 
     start_time = time.time()
     success_count = 0
+    failures = []
+    first_seen = {}
+    # Retries after a failed check start fast and back off; a passing check resets the cadence.
+    retry = PollSchedule(max_timeout)
 
     while time.time() - start_time < max_timeout:
-        success, message = check_cluster_operators(module, checks)
+        if conditions and stable_for is not None:
+            success, message, failures, wait = check_conditions(module, conditions, stable_for, first_seen, stall)
+            if success:
+                module.exit_json(changed=True, msg=f"✅ All conditions have been stable for at least {stable_for} seconds.")
+            if wait:
+                # 💤 Sleep only until the youngest transition ages past the stability window
+                module.warn(f"{message} Waiting {wait:.0f}s for it to reach {stable_for}s.")
+                retry.reset()
+                stall.reset()
+                time.sleep(min(wait, max(0, max_timeout - (time.time() - start_time))))
+            else:
+                fail_if_stalled(module, stall, message, failures)
+                module.warn(f"❌ Cluster check failed: {message}")
+                retry.wait()  # Retry after failure
+            continue
+
+        if conditions:
+            success, message, failures, wait = check_conditions(module, conditions, stall=stall)
+        else:
+            success, message = check_cluster_operators(module, checks)
+            if not success:
+                stall.observe(message)
 
         if success:
+            retry.reset()
+            stall.reset()
             success_count += 1
             module.warn(f"✅ Check passed {success_count}/{required_success_count} times.")
 
@@ -103,11 +318,12 @@ def main():
             time.sleep(pause_between_checks)  # 💤 Only wait if more checks are needed
 
         else:
+            fail_if_stalled(module, stall, message, failures)
             module.warn(f"❌ Cluster check failed: {message}")
             success_count = 0  # Reset success count on failure
-            time.sleep(10)  # Retry after failure
+            retry.wait()  # Retry after failure
 
-    module.fail_json(msg="❌ Timeout reached before cluster operators met the required conditions.")
+    module.fail_json(msg="❌ Timeout reached before cluster operators met the required conditions.", failures=failures, stalled=False)
 
 
 if __name__ == "__main__":
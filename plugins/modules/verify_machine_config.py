@@ -10,15 +10,29 @@ version_added: "1.0.0"
 author: Miheer Salunke (@miheer)
 description:
   - Verifies the machine configuration status after we trigger mco update using module change_network_type.
+  - Each distinct rendered config is fetched and checked once, however many nodes use it.
+  - Node state is read from the C(machineconfiguration.openshift.io) currentConfig, desiredConfig and state annotations
+    of a watched node list, so the module moves on as soon as every node reports its desired config as Done.
 options:
   network_type:
     description: Desired network type.
     required: true
     type: str
   timeout:
-    description: Timeout in seconds.
+    description: Maximum time in seconds to wait for the nodes to settle and for the rendered configs to be read.
     type: int
     default: 300
+  cache:
+    description:
+      - Cache the verdict for each rendered MachineConfig, keyed by config name and O(network_type).
+      - Rendered configs are immutable by name, so reruns only fetch configs that were not verified before.
+    type: bool
+    default: true
+  cache_file:
+    description:
+      - Path of the verdict cache.
+      - Defaults to C(machineconfig_verdicts.json) in a C(network.offline_migration_sdn_to_ovnk) directory under the system temporary directory.
+    type: path
 """
 EXAMPLES = r"""
 - name: Verify machine configuration status on nodes
@@ -31,88 +45,26 @@ changed:
   description: Whether the CR was modified.
   type: bool
   returned: always
+issues:
+  description: Problems found with the node states or their rendered configs.
+  type: list
+  elements: str
+  returned: always
+machine_configs:
+  description: Verdict for each distinct rendered config in use, and whether it came from the cache.
+  type: list
+  elements: dict
+  returned: when the nodes were listed
+  sample: [{"name": "rendered-worker-5f3a", "verified": true, "cached": false}]
 """
 
 from ansible.module_utils.basic import AnsibleModule
-import re
-import time
-
-
-def run_command(module, command):
-    """Run a shell command safely using module.run_command and return output or raise an error."""
-    rc, stdout, stderr = module.run_command(command)
-
-    if rc == 0:
-        return stdout.strip(), None  # Success
-
-    return None, f"Command '{' '.join(command)}' failed: {stderr.strip()}"
-
-
-def get_machine_config_status(module, timeout):
-    nodes = []
-    start_time = time.time()
-    while time.time() - start_time < timeout:
-        output, error = run_command(module, "oc describe node | grep -E 'hostname|machineconfig'")
-        if not error:
-            pattern = (
-                r"kubernetes\.io/hostname=(?P<hostname>.+)\n"
-                r".*currentConfig: (?P<currentConfig>.+)\n"
-                r".*desiredConfig: (?P<desiredConfig>.+)\n"
-                r".*state: (?P<state>.+)"
-            )
-
-            nodes = re.findall(pattern, output, re.MULTILINE)
-
-        time.sleep(10)  # Check every 10 seconds
-    return nodes
-
-
-def verify_machine_config(module, config_name, network_type):
-    start_time = time.time()
-    while time.time() - start_time < module.params["timeout"]:
-        try:
-            output, error = run_command(module, f"oc get machineconfig {config_name} -o yaml | grep ExecStart")
-            if not error:
-                if network_type == "OVNKubernetes":
-                    if "ExecStart=/usr/local/bin/configure-ovs.sh OVNKubernetes" in output:
-                        return True
-                if network_type == "OpenShiftSDN":
-                    if "ExecStart=/usr/local/bin/configure-ovs.sh OpenShiftSDN" in output:
-                        return True
-            if error:
-                module.warn(f"Retrying as got an error: {error}")
-            time.sleep(3)
-        except Exception as ex:
-            module.fail_json(msg=str(ex))
-
-    return False
+from ansible_collections.network.offline_migration_sdn_to_ovnk.plugins.module_utils.migration_steps import STEP_SPECS, run_verify_machine_config
 
 
 def main():
-    module = AnsibleModule(
-        argument_spec=dict(
-            timeout=dict(type="int", default=300),
-            network_type=dict(type="str", required=True),
-        )
-    )
-    timeout = module.params["timeout"]
-    network_type = module.params["network_type"]
-    try:
-        nodes = get_machine_config_status(module, timeout)
-        issues = []
-        for node in nodes:
-            if node["state"] != "Done":
-                issues.append(f"Node {node['hostname']} state is {node['state']}, not Done.")
-            if node["currentConfig"] != node["desiredConfig"]:
-                issues.append(f"Node {node['hostname']} currentConfig ({node['currentConfig']}) does not match desiredConfig ({node['desiredConfig']}).")
-            if not verify_machine_config(module, node["currentConfig"], network_type):
-                issues.append(f"Node {node['hostname']} configuration {node['currentConfig']} does not contain expected ExecStart.")
-        if issues:
-            module.fail_json(msg="Issues detected with machine configuration.", issues=issues)
-
-        module.exit_json(changed=False, msg="All machine configurations are correct.", issues=[])
-    except Exception as e:
-        module.fail_json(msg=str(e))
+    module = AnsibleModule(**STEP_SPECS["verify_machine_config"])
+    run_verify_machine_config(module)
 
 
 if __name__ == "__main__":
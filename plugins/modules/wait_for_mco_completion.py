@@ -10,86 +10,94 @@ version_added: "1.0.0"
 author: Miheer Salunke (@miheer)
 description:
   - Wait for MCO to finish its work after change_network_type triggers mco update.
+  - Watches the MachineConfigPools and checks UPDATED, UPDATING and DEGRADED together on every change,
+    returning as soon as all pools have converged.
+  - Fails early when no pool's machine counts (C(machineCount), C(updatedMachineCount), C(readyMachineCount),
+    C(unavailableMachineCount), C(degradedMachineCount)), rendered configuration or conditions change for
+    O(stall_timeout) seconds, for example when a pool is stuck on one degraded node.
+  - On failure, reports per pool the updated, ready and degraded machine counts, the mismatching and degraded
+    conditions, and the nodes the machine config daemon marked C(Degraded) or C(Unreconcilable) with their reason.
+  - While waiting, tracks per pool the updated, ready and unavailable machine counts and estimates the time per node
+    from the last ten increases of C(updatedMachineCount), and from that the ETA of each pool and of the whole rollout.
+    The progress is written to O(status_file) whenever a count changes and reported as a warning every
+    O(progress_interval) seconds.
 options:
   timeout:
     description: Timeout ins seconds.
     required: false
     default: 2700
     type: int
+  stall_timeout:
+    description: Seconds without progress after which to give up before O(timeout). C(0) disables the detection.
+    required: false
+    default: 1800
+    type: int
+  status_file:
+    description:
+      - JSON file the rollout progress (the RV(progress) return value) is written to, replaced atomically on every update.
+      - Defaults to C(mco-progress.json) in the C(network.offline_migration_sdn_to_ovnk) directory under the temporary
+        directory of the host running the module.
+    required: false
+    type: path
+  progress_interval:
+    description: Seconds between the progress warnings.
+    required: false
+    default: 60
+    type: int
 """
 EXAMPLES = r"""
 - name: Wait for MCO to finish its work
   network.offline_migration_sdn_to_ovnk.wait_for_mco_completion:
     timeout: "{{ migration_mcp_completion_timeout }}"
+    stall_timeout: 1800
+    status_file: /var/tmp/mco-progress.json
 """
 RETURN = r"""
 changed:
   description: Whether the CR was modified.
   type: bool
   returned: always
+stalled:
+  description: Whether the module gave up because nothing progressed for O(stall_timeout) seconds.
+  type: bool
+  returned: always
+progress:
+  description:
+    - Last rollout progress, with per pool its machine counts, rendered C(configuration), whether it is C(paused) and
+      C(converged), the estimated C(seconds_per_node) and C(eta_seconds), and the overall C(eta_seconds) and C(eta).
+    - Estimates are null until the pool has updated a machine while the module watched it.
+  type: dict
+  returned: when the pools were watched
+  sample:
+    updated_at: "2025-06-01T10:42:00Z"
+    elapsed_seconds: 1260
+    eta_seconds: 2400
+    eta: "2025-06-01T11:22:00Z"
+    pools:
+      worker:
+        machineCount: 12
+        updatedMachineCount: 4
+        readyMachineCount: 11
+        unavailableMachineCount: 1
+        degradedMachineCount: 0
+        configuration: rendered-worker-5d2f
+        paused: false
+        converged: false
+        seconds_per_node: 300.0
+        eta_seconds: 2400
+status_file:
+  description: Path of the progress file.
+  type: str
+  returned: when the pools were watched
 """
 
 from ansible.module_utils.basic import AnsibleModule
-import time
-
-
-def run_command(module, command):
-    """Run a shell command safely using module.run_command and return output or error."""
-    rc, stdout, stderr = module.run_command(command)
-
-    if rc == 0:
-        return stdout.strip(), None  # ✅ Success
-
-    return None, f"❌ Command '{' '.join(command)}' failed: {stderr.strip()}"
-
-
-def wait_for_mco(module, timeout):
-    """Wait until MCO conditions are satisfied or timeout."""
-    start_time = time.time()
-    interval = 10
-
-    while time.time() - start_time < timeout:
-        module.warn("Checking MCO status...")
-
-        # ✅ Run commands separately instead of chaining with `&&`
-        commands = [
-            ["oc", "wait", "mcp", "--all", "--for=condition=UPDATED=True", "--timeout=60s"],
-            ["oc", "wait", "mcp", "--all", "--for=condition=UPDATING=False", "--timeout=60s"],
-            ["oc", "wait", "mcp", "--all", "--for=condition=DEGRADED=False", "--timeout=60s"],
-        ]
-
-        errors = []
-        for command in commands:
-            output, error = run_command(module, command)
-            if error:
-                errors.append(error)
-
-        if not errors:
-            module.warn("✅ MCO is in the desired state.")
-            return True
-
-        module.warn(f"Retrying in {interval} seconds... Errors: {errors}")
-        time.sleep(interval)
-
-    return False  # Timeout reached
+from ansible_collections.network.offline_migration_sdn_to_ovnk.plugins.module_utils.migration_steps import STEP_SPECS, run_wait_for_mco_completion
 
 
 def main():
-    module_args = dict(
-        timeout=dict(type="int", required=False, default=2700),  # Timeout in seconds
-    )
-
-    module = AnsibleModule(argument_spec=module_args)
-
-    timeout = module.params["timeout"]
-
-    try:
-        if wait_for_mco(module, timeout):
-            module.exit_json(changed=False, msg="✅ MCO finished successfully.")
-        else:
-            module.fail_json(msg="❌ Timeout reached while waiting for MCO to finish.")
-    except Exception as ex:
-        module.fail_json(msg=f"Unexpected error: {str(ex)}")
+    module = AnsibleModule(**STEP_SPECS["wait_for_mco_completion"])
+    run_wait_for_mco_completion(module)
 
 
 if __name__ == "__main__":
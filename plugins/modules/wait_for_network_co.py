@@ -10,11 +10,19 @@ version_added: "1.0.0"
 author: Miheer Salunke (@miheer)
 description:
   - Wait until the Network Cluster Operator is in PROGRESSING=True state
+  - Polls again within a second, then backs off exponentially (with jitter) to one poll every 10 seconds.
+  - Fails early when the operator's C(Available), C(Progressing) and C(Degraded) conditions (status, reason and
+    message) do not change for O(stall_timeout) seconds, and reports them.
 options:
   timeout:
     description: Timeout in seconds.
     required: true
     type: int
+  stall_timeout:
+    description: Seconds without progress after which to give up before O(timeout). C(0) disables the detection.
+    required: false
+    default: 300
+    type: int
 """
 EXAMPLES = r"""
 - name: Wait until the Network Cluster Operator is in PROGRESSING=True state
@@ -27,48 +35,19 @@ changed:
   description: Whether the CR was modified.
   type: bool
   returned: always
+stalled:
+  description: Whether the module gave up because nothing progressed for O(stall_timeout) seconds.
+  type: bool
+  returned: always
 """
 
 from ansible.module_utils.basic import AnsibleModule
-import time
-
-
-def run_command(module, command):
-    """Run a shell command safely using module.run_command and return output or raise an error."""
-    rc, stdout, stderr = module.run_command(command)
-
-    if rc == 0:
-        return stdout.strip(), None  # Success
-
-    return None, f"Command '{' '.join(command)}' failed: {stderr.strip()}"
-
-
-def wait_for_network_co(module, timeout):
-    """Wait until the Network CO enters the PROGRESSING=True condition."""
-    start_time = time.time()
-    while time.time() - start_time < timeout:
-        command = "oc wait co network --for='condition=PROGRESSING=True' --timeout=60s"
-        _unused, error = run_command(module, command)
-        if not error:
-            return "Network Cluster Operator is in PROGRESSING=True state."
-        time.sleep(10)  # Retry every 10 seconds
-    return "Timeout waiting for Network Cluster Operator to reach PROGRESSING=True."
+from ansible_collections.network.offline_migration_sdn_to_ovnk.plugins.module_utils.migration_steps import STEP_SPECS, run_wait_for_network_co
 
 
 def main():
-    module = AnsibleModule(
-        argument_spec=dict(
-            timeout=dict(type="int", required=True),
-        )
-    )
-
-    timeout = module.params["timeout"]
-
-    result_message = wait_for_network_co(module, timeout)
-    if "Timeout" in result_message:
-        module.fail_json(msg=result_message)
-    else:
-        module.exit_json(changed=False, msg=result_message)
+    module = AnsibleModule(**STEP_SPECS["wait_for_network_co"])
+    run_wait_for_network_co(module)
 
 
 if __name__ == "__main__":
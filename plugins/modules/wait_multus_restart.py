@@ -10,75 +10,77 @@ version_added: "1.0.0"
 author: Miheer Salunke (@miheer)
 description:
   - Checks if the multus pods are restarted successfully.
+  - Watches the C(multus) DaemonSet in C(openshift-multus) and returns as soon as its C(observedGeneration) caught up
+    with its generation and C(updatedNumberScheduled) and C(numberAvailable) equal C(desiredNumberScheduled).
+  - With O(network_type), the same watch also tracks the DaemonSets of that network type, so that one wait covers the
+    whole pod network coming up. For C(OVNKubernetes) these are C(ovnkube-node) and the C(ovnkube-control-plane)
+    Deployment (tracked once the DaemonSets are done), or the C(ovnkube-master) DaemonSet before OpenShift 4.14. For
+    C(OpenShiftSDN) they are C(sdn) and C(sdn-controller).
+  - On timeout, reports the nodes whose pods of an unfinished DaemonSet are not ready or not updated.
+  - Fails early, with the same report, when the rollout counts of the tracked workloads do not change for
+    O(stall_timeout) seconds.
 options:
   timeout:
     description: Desired timeout in seconds.
     required: false
     default: 300
     type: int
+  network_type:
+    description: Network type whose dataplane workloads are tracked together with Multus. Only Multus is tracked when unset.
+    type: str
+    choices: [OVNKubernetes, OpenShiftSDN]
+  stall_timeout:
+    description: Seconds without rollout progress after which to give up before O(timeout). C(0) disables the detection.
+    required: false
+    default: 600
+    type: int
 """
 EXAMPLES = r"""
 - name: Wait for Multus pods to restart
   network.offline_migration_sdn_to_ovnk.wait_multus_restart:
     timeout: "{{ migration_ovn_multus_timeout }}"
+    network_type: OVNKubernetes
 """
 RETURN = r"""
 changed:
   description: Whether the CR was modified.
   type: bool
   returned: always
+workloads:
+  description:
+    - Rollout status of every tracked workload by C(namespace/name), with its C(kind), whether it C(exists), its
+      C(generation) and C(observed_generation), and its C(desired), C(updated) and C(available) pod counts.
+  type: dict
+  returned: when the workloads were read
+  sample:
+    openshift-multus/multus:
+      kind: daemonsets
+      exists: true
+      generation: 3
+      observed_generation: 3
+      desired: 6
+      updated: 6
+      available: 6
+      rolled_out: true
+lagging_nodes:
+  description: Nodes whose pods are not ready or not updated, by C(namespace/name) of the unfinished workload. Empty on success.
+  type: dict
+  returned: when the workloads were read
+  sample:
+    openshift-ovn-kubernetes/ovnkube-node: [worker-3]
+stalled:
+  description: Whether the module gave up because nothing progressed for O(stall_timeout) seconds.
+  type: bool
+  returned: when the workloads were read
 """
 
 from ansible.module_utils.basic import AnsibleModule
-import time
-
-
-def run_command(module, command):
-    """Run a shell command safely using module.run_command and return output or raise an error."""
-    rc, stdout, stderr = module.run_command(command)
-
-    if rc == 0:
-        return stdout.strip(), None  # Success
-
-    return None, f"Command '{' '.join(command)}' failed: {stderr.strip()}"
-
-
-def wait_for_multus_pods(module, timeout):
-    """Wait for the Multus pods to restart."""
-    start_time = time.time()
-    interval = 10
-
-    while time.time() - start_time < timeout:
-        try:
-            command = "oc rollout status ds/multus -n openshift-multus"
-            output, error = run_command(module, command)
-            if not error:
-                if "successfully rolled out" in output:
-                    return True
-        except Exception as e:
-            module.log(f"Retrying due to error: {str(e)}")
-        time.sleep(interval)
-
-    # Timeout reached
-    return False
+from ansible_collections.network.offline_migration_sdn_to_ovnk.plugins.module_utils.migration_steps import STEP_SPECS, run_wait_multus_restart
 
 
 def main():
-    module_args = dict(
-        timeout=dict(type="int", required=False, default=300),  # Timeout in seconds
-    )
-
-    module = AnsibleModule(argument_spec=module_args)
-
-    timeout = module.params["timeout"]
-
-    try:
-        if wait_for_multus_pods(module, timeout):
-            module.exit_json(changed=False, msg="Multus pods restarted successfully.")
-        else:
-            module.fail_json(msg="Timeout reached while waiting for Multus pods to restart.")
-    except Exception as ex:
-        module.fail_json(msg=str(ex))
+    module = AnsibleModule(**STEP_SPECS["wait_multus_restart"])
+    run_wait_multus_restart(module)
 
 
 if __name__ == "__main__":